@@ -26,9 +26,11 @@ function DashboardLayout({ isSidebarCollapsed, onSidebarToggle, onTripTitleChang
             .then((data) => setTrips(data))
             .catch((error) => console.error("Error fetching trips:", error));
 
-        const roomName = `user_${driver.email}`;
-        socket.emit("join_room", { room: roomName });
-        console.log(`🔒 Joined private room: ${roomName}`);
+        // The server puts authenticated connections in the driver's private room;
+        // reconnect now that the login cookie is set.
+        if (!socket.connected) {
+            socket.connect();
+        }
     }
 
     const handleTripCreated = (newTrip: GetTrips) => {
@@ -25,6 +25,7 @@ interface LogSheetData {
   drivingHours: number;      
   onDutyHours: number;       
   dutyChanges: DutyChange[];
+  dutyGrid?: number[] | null; // [status, slots, ...] over 96 15-minute slots, from the server
 }
 
 interface ELDLogProps {
@@ -93,6 +94,27 @@ const ELDLog: React.FC<ELDLogProps> = ({ logSheets, tripTitle }) => {
         };
 
         ctx.beginPath();
+
+        if (log.dutyGrid && log.dutyGrid.length > 0) {
+          // Server-computed timeline: status rows are numbered 1-4 from the top
+          const slotWidth = graphWidth / 96;
+          let slot = 0;
+          for (let i = 0; i < log.dutyGrid.length; i += 2) {
+            const y = graphStartY + rowHeight * (log.dutyGrid[i] - 1);
+            if (slot === 0) {
+              ctx.moveTo(graphStartX, y);
+            } else {
+              ctx.lineTo(graphStartX + slot * slotWidth, y);
+            }
+            slot += log.dutyGrid[i + 1];
+            ctx.lineTo(graphStartX + slot * slotWidth, y);
+          }
+
+          ctx.strokeStyle = 'blue';
+          ctx.stroke();
+          return;
+        }
+
         ctx.moveTo(graphStartX, statusYPositions['Off Duty']); // Start at 00:00 Off Duty
         ctx.lineTo(lastX, statusYPositions['Off Duty']); // Off Duty until 6:30 AM
 
@@ -18,6 +18,7 @@ export interface ValidLogSheet {
     drivingHours: number;
     onDutyHours: number;
     dutyChanges: { time: number; status: number }[];
+    dutyGrid?: number[] | null;
 }
 
 export function computeValidLogSheets(
@@ -59,5 +60,6 @@ export function computeValidLogSheets(
                 { time: Math.max(2, logSheetDistances[index]?.cycleHours || 0) + 2, status: 4 },
                 { time: Math.max(2, logSheetDistances[index]?.cycleHours || 0) + 3, status: 1 },
             ],
+            dutyGrid: log.dutyGrid,
         }));
 }
\ No newline at end of file
@@ -1,6 +1,6 @@
 import polyline from '@mapbox/polyline';
 import { LatLngTuple } from 'leaflet';
-import { GetTripData, getTripById, geocodeLocation } from './tripServices';
+import { GetTripData, getTripById, resolveLocation } from './tripServices';
 
 export interface Coordinates {
   lat: number;
@@ -59,6 +59,21 @@ export async function fetchRoadRoute(
   }
 }
 
+// Use the leg the server already routed when it matches the stops we are drawing.
+function precomputedRoute(
+  log: GetTripData['logSheets'][number],
+  legIndex: number,
+  legCount: number
+): { distance: number; path: LatLngTuple[]; duration: number } | null {
+  if (!log.routePolylines || log.routePolylines.length !== legCount) return null;
+  const encodedPolyline = log.routePolylines[legIndex];
+  const distance = log.segmentDistances?.[legIndex];
+  const duration = log.segmentDurations?.[legIndex];
+  if (encodedPolyline == null || distance == null || duration == null) return null;
+  const path: LatLngTuple[] = polyline.decode(encodedPolyline).map(([lat, lon]) => [lat, lon] as LatLngTuple);
+  return { distance, path, duration };
+}
+
 export async function fetchTripData(tripId: string): Promise<{
   trip: GetTripData | null;
   pickupCoords: Coordinates | null;
@@ -82,14 +97,14 @@ export async function fetchTripData(tripId: string): Promise<{
       };
     }
 
-    const tripPickupCoords = await geocodeLocation(data.pickup);
-    const tripDropoffCoords = await geocodeLocation(data.dropoff ?? null);
+    const tripPickupCoords = await resolveLocation(data.coordinates, 'pickup', data.pickup);
+    const tripDropoffCoords = await resolveLocation(data.coordinates, 'dropoff', data.dropoff ?? null);
 
     let cumulativeDistance = 0;
     const logCoordsPromises = data.logSheets.map(async (log) => {
-      const pickupCoords = await geocodeLocation(log.pickup);
-      const currentLocationCoords = await geocodeLocation(log.currentLocation);
-      const dropoffCoords = await geocodeLocation(log.dropoff ?? null);
+      const pickupCoords = await resolveLocation(log.coordinates, 'pickup', log.pickup);
+      const currentLocationCoords = await resolveLocation(log.coordinates, 'currentLocation', log.currentLocation);
+      const dropoffCoords = await resolveLocation(log.coordinates, 'dropoff', log.dropoff ?? null);
 
       const routePaths: LatLngTuple[][] = [];
       const stopInstructions: string[] = [];
@@ -107,7 +122,9 @@ export async function fetchTripData(tripId: string): Promise<{
       stopInstructions.push(`Start at ${log.currentLocation}`);
 
       for (let i = 0; i < filteredCoords.length - 1; i++) {
-        const route = await fetchRoadRoute(filteredCoords[i], filteredCoords[i + 1]);
+        const route =
+          precomputedRoute(log, i, filteredCoords.length - 1) ??
+          (await fetchRoadRoute(filteredCoords[i], filteredCoords[i + 1]));
         const fromLocation = i === 0 ? log.currentLocation : log.pickup;
         const toLocation = i === 0 ? log.pickup : log.dropoff;
 
@@ -175,7 +192,7 @@ export async function fetchTripData(tripId: string): Promise<{
       const pickupStopHours = 0.5;
       const dropoffStopHours = log.dropoff ? 0.5 : 0;
       const fuelingStopHours = fuelingStops.length * 0.5;
-      const restBreakHours = segmentDurations.some(d => d > 10) ? 0.5 : 0;
+      const restBreakHours = restBreakStops.length > 0 ? 0.5 : 0;
       const onDutyHours = pickupStopHours + dropoffStopHours + fuelingStopHours + restBreakHours;
       const cycleHours = drivingHours + onDutyHours;
       const totalDailyHours = 24;
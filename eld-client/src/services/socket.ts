@@ -6,7 +6,19 @@ interface RoomMessage {
   timestamp?: string;
 }
 
+// Stable per-browser id so the server can restore room membership after a reconnect.
+const clientId =
+  localStorage.getItem("socketClientId") ||
+  (() => {
+    const id = `${Date.now().toString(36)}-${Math.random().toString(36).slice(2)}`;
+    localStorage.setItem("socketClientId", id);
+    return id;
+  })();
+
 const socket = io("http://localhost:8000", {
+  auth: { clientId },
+  // The server authenticates the connection with the login cookie.
+  withCredentials: true,
   transports: ["websocket", "polling"],
   reconnection: true,
   reconnectionAttempts: 5,
@@ -15,13 +27,23 @@ const socket = io("http://localhost:8000", {
 
 socket.on("connect", () => {
   console.log("Socket.IO Connected to Django Backend");
-  socket.emit("join_room", { room: "room123" });
 });
 
 socket.on("connect_error", (err: Error) => {
   console.error("Socket.IO Connection Error:", err.message);
 });
 
+// The server coalesces bursts for a room into one message; replay them as individual events.
+socket.on("event_batch", (events: { event: string; data: unknown }[]) => {
+  events.forEach(({ event, data }) => {
+    socket.listeners(event).forEach((listener) => listener(data));
+  });
+});
+
+socket.on("message_rejected", (data: { error: string }) => {
+  console.warn("Socket.IO message rejected:", data.error);
+});
+
 socket.on("room_message", (data: RoomMessage) => {
   console.log(`Message in Room:`, data.message);
 });
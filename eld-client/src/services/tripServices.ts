@@ -31,6 +31,10 @@ export interface GetTrips {
     tripNumber: number;
 }
 
+export interface LocationCoordinates {
+    [location: string]: { lat: number; lon: number } | null;
+}
+
 export interface GetTripData {
     uniqueId: string;
     tripTitle: string;
@@ -38,6 +42,7 @@ export interface GetTripData {
     dropoff?: string;
     cycleUsed: string;
     instructions?: string;
+    coordinates?: LocationCoordinates | null;
     createdDate: string;
     tripNumber: number;
     logSheets: {
@@ -46,11 +51,26 @@ export interface GetTripData {
         pickup: string;
         dropoff?: string;
         currentCycleUsed: string;
+        coordinates?: LocationCoordinates | null;
         createdDate: string;
         logNumber: number;
+        dutyGrid?: number[] | null;
+        segmentDistances?: (number | null)[];
+        segmentDurations?: (number | null)[];
+        routePolylines?: (string | null)[];
     }[];
 }
 
+// Prefer coordinates resolved by the server; fall back to geocoding in the browser.
+export const resolveLocation = async (
+    coordinates: LocationCoordinates | null | undefined,
+    field: string,
+    location: string | null
+): Promise<{ lat: number; lon: number } | null> => {
+    if (coordinates && coordinates[field] !== undefined) return coordinates[field];
+    return geocodeLocation(location);
+};
+
 export const geocodeLocation = async (location: string | null): Promise<{ lat: number; lon: number } | null> => {
     if (!location) return null;
     try {
@@ -88,7 +108,7 @@ export const createTrip = async (tripData: TripData) => {
 export const getDriverTrips = async (email: string): Promise<GetTrips[]> => {
     try {
         const response = await axios.get(`${API_BASE_URL}/get-driver-trips/`, {
-            params: { email },
+            params: { email, all: true },
         });
         return response.data.trips;
     } catch (error: any) {
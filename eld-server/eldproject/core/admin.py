@@ -1,5 +1,5 @@
 from django.contrib import admin
-from core.models import Driver, Trip, LogSheet
+from core.models import Driver, Trip, LogSheet, Sequence, DriverDailyHours, HosViolationReport
 
 
 @admin.register(Driver)
@@ -12,6 +12,7 @@ class Driver(admin.ModelAdmin):
         'phone',
         'isActive',
         'isDeleted',
+        'isStaff',
         'createdDate',
         'accountNumber',
     )
@@ -29,8 +30,15 @@ class Trip(admin.ModelAdmin):
         'instructions',
         'createdDate',
         'tripNumber',
+        'isDeleted',
+        'deletedDate',
     )
-    readonly_fields = ('createdDate',)
+    readonly_fields = ('createdDate', 'isDeleted', 'deletedDate')
+    list_filter = ('isDeleted',)
+
+    def get_queryset(self, request):
+        # Soft-deleted trips stay visible here until they are archived.
+        return self.model.allObjects.all()
 
 
 
@@ -46,4 +54,18 @@ class LogSheet(admin.ModelAdmin):
         'createdDate',
         'logNumber',
     )
-    readonly_fields = ('createdDate',)
\ No newline at end of file
+    readonly_fields = ('createdDate',)
+
+@admin.register(Sequence)
+class Sequence(admin.ModelAdmin):
+    list_display = ('name', 'lastValue')
+
+
+@admin.register(DriverDailyHours)
+class DriverDailyHours(admin.ModelAdmin):
+    list_display = ('driverId', 'date', 'cycleHours', 'drivingHours')
+
+
+@admin.register(HosViolationReport)
+class HosViolationReport(admin.ModelAdmin):
+    list_display = ('driverId', 'violationCount', 'maxCycleHours', 'scannedThrough', 'scannedAt')
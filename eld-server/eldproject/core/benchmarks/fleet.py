@@ -0,0 +1,183 @@
+# core/benchmarks/fleet.py
+#
+# Synthetic fleets for the benchmarks: N drivers x M trips x K log sheets,
+# written through the real models with the same derived fields the API
+# stores (coordinates, dutyTotals, dutyGrid, daily hours, sequence numbers),
+# so the read paths see rows shaped like production ones.
+
+import random
+import uuid
+from collections import defaultdict
+from datetime import timedelta
+from django.db import transaction
+from django.utils import timezone
+from core.models import Driver, Trip, LogSheet, Sequence, GeocodeCache, RouteCache, DriverDailyHours
+from core.services.geocoding import normalize_location
+from core.services.hos import compute_duty_totals, compute_duty_grid
+from core.services.passwords import password_hasher
+from core.services.routing import LocalRoutingProvider, route_key
+
+PASSWORD = 'benchmark'
+
+CITIES = {
+    'Chicago, IL': (41.8781, -87.6298),
+    'Denver, CO': (39.7392, -104.9903),
+    'Omaha, NE': (41.2565, -95.9345),
+    'Kansas City, MO': (39.0997, -94.5786),
+    'St. Louis, MO': (38.6270, -90.1994),
+    'Indianapolis, IN': (39.7684, -86.1581),
+    'Columbus, OH': (39.9612, -82.9988),
+    'Memphis, TN': (35.1495, -90.0490),
+    'Dallas, TX': (32.7767, -96.7970),
+    'Oklahoma City, OK': (35.4676, -97.5164),
+    'Salt Lake City, UT': (40.7608, -111.8910),
+    'Minneapolis, MN': (44.9778, -93.2650),
+}
+
+
+def city_coordinates(name):
+    lat, lon = CITIES[name]
+    return {'lat': lat, 'lon': lon}
+
+
+def warm_location_caches():
+    """
+    Fill the geocode and route caches for every CITIES name and pair, so
+    requests using them never leave the process. Entries already cached
+    are kept as they are.
+    """
+
+    GeocodeCache.objects.bulk_create(
+        [GeocodeCache(query=normalize_location(name), lat=lat, lon=lon) for name, (lat, lon) in CITIES.items()],
+        ignore_conflicts=True,
+    )
+    provider = LocalRoutingProvider()
+    routes = []
+    for origin in CITIES:
+        for destination in CITIES:
+            if origin != destination:
+                leg = city_coordinates(origin), city_coordinates(destination)
+                routes.append(RouteCache(key=route_key(*leg), **provider.route(*leg)))
+    RouteCache.objects.bulk_create(routes, ignore_conflicts=True)
+
+
+def log_sheet_fields(rng, distance_before):
+    """Field values of one synthetic log sheet, with its derived totals."""
+
+    current, pickup, dropoff = rng.sample(sorted(CITIES), 3)
+    coordinates = {field: city_coordinates(name) for field, name in
+                   (('currentLocation', current), ('pickup', pickup), ('dropoff', dropoff))}
+    provider = LocalRoutingProvider()
+    legs = [provider.route(coordinates['currentLocation'], coordinates['pickup']),
+            provider.route(coordinates['pickup'], coordinates['dropoff'])]
+    return {
+        'currentLocation': current,
+        'pickup': pickup,
+        'dropoff': dropoff,
+        'currentCycleUsed': round(rng.uniform(0, 60), 2),
+        'coordinates': coordinates,
+        'dutyTotals': compute_duty_totals(legs, True, distance_before),
+        'dutyGrid': compute_duty_grid(legs, True, distance_before),
+    }
+
+
+class Fleet:
+    """
+    The drivers, trips and log sheets seed_fleet created. `trips` maps a
+    driver's email to its trip ids and `logSheets` a trip id to its sheet
+    ids; the traffic replay adds to both as it creates rows.
+    """
+
+    def __init__(self, prefix):
+        self.prefix = prefix
+        self.drivers = []
+        self.trips = defaultdict(list)
+        self.logSheets = defaultdict(list)
+
+    def stats(self):
+        return {
+            'drivers': len(self.drivers),
+            'trips': sum(len(trip_ids) for trip_ids in self.trips.values()),
+            'logSheets': sum(len(sheet_ids) for sheet_ids in self.logSheets.values()),
+        }
+
+
+def seed_fleet(drivers, trips, log_sheets, seed=0, batch_size=1000):
+    """
+    Create `drivers` drivers with `trips` trips each, and `log_sheets`
+    sheets per trip, one day apart and ending today. All drivers share the
+    password PASSWORD. Returns the Fleet.
+    """
+
+    rng = random.Random(seed)
+    prefix = f"fleet-{uuid.uuid4().hex[:8]}"
+    fleet = Fleet(prefix)
+    # bcrypt is slow on purpose; Driver.save keeps an already hashed password.
+    password = password_hasher.hash(PASSWORD)
+    now = timezone.now()
+
+    first_account = Sequence.objects.reserve('accountNumber', drivers)
+    first_trip = Sequence.objects.reserve('tripNumber', drivers * trips)
+    first_sheet = Sequence.objects.reserve('logNumber', drivers * trips * log_sheets)
+
+    with transaction.atomic():
+        driver_rows = Driver.objects.bulk_create([
+            Driver(fullName=f"Benchmark Driver {index}", username=f"{prefix}-{index}",
+                   email=f"{prefix}-{index}@example.com", password=password,
+                   accountNumber=first_account + index)
+            for index in range(drivers)
+        ], batch_size=batch_size)
+
+        trip_rows, sheet_rows, daily_rows = [], [], defaultdict(lambda: [0, 0])
+        for driver_index, driver in enumerate(driver_rows):
+            fleet.drivers.append(driver.email)
+            for trip_index in range(trips):
+                days_ago = (trips - trip_index) * log_sheets - 1
+                trip_number = first_trip + driver_index * trips + trip_index
+                pickup, dropoff = rng.sample(sorted(CITIES), 2)
+                trip = Trip(
+                    driverId=driver, tripTitle=f"Trip {trip_number}", pickup=pickup, dropoff=dropoff,
+                    cycleUsed=round(rng.uniform(0, 60), 2), tripNumber=trip_number,
+                    coordinates={'pickup': city_coordinates(pickup), 'dropoff': city_coordinates(dropoff)},
+                    createdDate=now - timedelta(days=days_ago, hours=1),
+                )
+                trip_rows.append(trip)
+                fleet.trips[driver.email].append(str(trip.uniqueId))
+
+                distance_before = 0
+                for sheet_index in range(log_sheets):
+                    fields = log_sheet_fields(rng, distance_before)
+                    distance_before += fields['dutyTotals']['totalDistance']
+                    log_number = first_sheet + (driver_index * trips + trip_index) * log_sheets + sheet_index
+                    sheet = LogSheet(
+                        tripId=trip, logNumber=log_number,
+                        createdDate=trip.createdDate + timedelta(days=sheet_index), **fields,
+                    )
+                    sheet_rows.append(sheet)
+                    fleet.logSheets[str(trip.uniqueId)].append(str(sheet.uniqueId))
+
+                    totals = daily_rows[(driver.uniqueId, timezone.localdate(sheet.createdDate))]
+                    totals[0] += fields['dutyTotals']['cycleHours']
+                    totals[1] += fields['dutyTotals']['drivingHours']
+
+        Trip.objects.bulk_create(trip_rows, batch_size=batch_size)
+        LogSheet.objects.bulk_create(sheet_rows, batch_size=batch_size)
+        DriverDailyHours.objects.bulk_create([
+            DriverDailyHours(driverId_id=driver_id, date=day, cycleHours=cycle_hours, drivingHours=driving_hours)
+            for (driver_id, day), (cycle_hours, driving_hours) in daily_rows.items()
+        ], batch_size=batch_size)
+
+    return fleet
+
+
+def delete_fleet(prefix):
+    """
+    Delete the drivers named `prefix`-* and everything of theirs, deleted
+    trips and sheets included.
+    """
+
+    drivers = Driver.objects.filter(username__startswith=f"{prefix}-")
+    with transaction.atomic():
+        LogSheet.allObjects.filter(tripId__driverId__in=drivers).delete()
+        Trip.allObjects.filter(driverId__in=drivers).delete()
+        return drivers.delete()[0]
@@ -0,0 +1,199 @@
+# core/benchmarks/sockets.py
+#
+# Socket.IO load without a server or a client library: each SocketClient
+# opens a websocket straight into the ASGI application (eldproject.asgi)
+# and speaks Engine.IO 4 / Socket.IO 5 text packets over the ASGI receive
+# and send channels, so the real connect handler, rooms, rate limiter and
+# event outbox are exercised on the current event loop.
+
+import asyncio
+import json
+import time
+from collections import defaultdict
+from core.benchmarks.stats import distribution
+
+
+class SocketClient:
+    def __init__(self, application, cookie):
+        self.application = application
+        self.cookie = cookie
+        self.sid = None
+        self.events = defaultdict(int)
+        self._inbound = asyncio.Queue()
+        self._connected = None
+        self._waiters = []
+        self._task = None
+
+    async def connect(self, timeout=10):
+        """
+        Open the websocket and join the default namespace. Raises
+        ConnectionRefusedError when the server turns the connection down.
+        """
+
+        self._connected = asyncio.get_running_loop().create_future()
+        scope = {
+            'type': 'websocket',
+            'asgi': {'version': '3.0'},
+            'scheme': 'ws',
+            'path': '/socket.io/',
+            'raw_path': b'/socket.io/',
+            'query_string': b'EIO=4&transport=websocket',
+            'headers': [
+                (b'host', b'testserver'), (b'connection', b'Upgrade'), (b'upgrade', b'websocket'),
+                (b'cookie', self.cookie.encode()),
+            ],
+            'server': ('testserver', 80),
+            'client': ('127.0.0.1', 0),
+            'subprotocols': [],
+        }
+        self._task = asyncio.create_task(self.application(scope, self._inbound.get, self._receive))
+        await self._inbound.put({'type': 'websocket.connect'})
+        await asyncio.wait_for(self._connected, timeout)
+
+    async def close(self, timeout=5):
+        if self._task is None:
+            return
+        await self._inbound.put({'type': 'websocket.disconnect', 'code': 1000})
+        try:
+            await asyncio.wait_for(self._task, timeout)
+        except (asyncio.TimeoutError, OSError):
+            self._task.cancel()
+        self._task = None
+
+    async def emit(self, event, data):
+        await self._write('42' + json.dumps([event, data]))
+
+    def expect(self, event, predicate=None):
+        """
+        A future for the next `event` matching `predicate`. Register it
+        before sending whatever triggers the event.
+        """
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append((event, predicate, future))
+        return future
+
+    async def _write(self, packet):
+        await self._inbound.put({'type': 'websocket.receive', 'text': packet})
+
+    async def _receive(self, message):
+        # What the application sends back to the client.
+        if message['type'] == 'websocket.close':
+            if not self._connected.done():
+                self._connected.set_exception(ConnectionRefusedError("Connection closed by the server"))
+            return
+        packet = message.get('text') if message['type'] == 'websocket.send' else None
+        if not packet:
+            return
+
+        if packet == '2':
+            await self._write('3')
+        elif packet.startswith('0'):
+            # Engine.IO handshake done; join the default namespace.
+            await self._write('40')
+        elif packet.startswith('40'):
+            self.sid = json.loads(packet[2:]).get('sid')
+            if not self._connected.done():
+                self._connected.set_result(self.sid)
+        elif packet.startswith('44'):
+            if not self._connected.done():
+                self._connected.set_exception(ConnectionRefusedError(json.loads(packet[2:]).get('message')))
+        elif packet.startswith('42'):
+            event, *args = json.loads(packet[2:])
+            self._dispatch(event, args[0] if args else None)
+
+    def _dispatch(self, event, data):
+        if event == 'event_batch':
+            # The outbox coalesces bursts for one room into a single emit.
+            for item in data or []:
+                self._dispatch(item['event'], item['data'])
+            return
+
+        self.events[event] += 1
+        waiting = []
+        for waiter in self._waiters:
+            name, predicate, future = waiter
+            if future.done():
+                continue
+            if name == event and (predicate is None or predicate(data)):
+                future.set_result(data)
+            else:
+                waiting.append(waiter)
+        self._waiters = waiting
+
+
+class SocketLoad:
+    """
+    A set of SocketClient connections, one per (room, cookie) pair, each
+    timing its connect and then messages sent to its own room.
+    """
+
+    def __init__(self, application, timeout=10):
+        self.application = application
+        self.timeout = timeout
+        self.clients = []
+        self.connectTimes = []
+        self.roundTrips = []
+        self.refused = 0
+        self.rejected = 0
+        self.timedOut = 0
+
+    async def open(self, connections):
+        async def open_one(room, cookie):
+            client = SocketClient(self.application, cookie)
+            started = time.perf_counter()
+            try:
+                await client.connect(self.timeout)
+            except (ConnectionRefusedError, asyncio.TimeoutError):
+                self.refused += 1
+                await client.close()
+                return
+            self.connectTimes.append(time.perf_counter() - started)
+            self.clients.append((client, room))
+
+        await asyncio.gather(*(open_one(room, cookie) for room, cookie in connections))
+
+    async def chat(self, messages, interval):
+        """
+        Have every client send `messages` send_message events to its room,
+        `interval` seconds apart, timing each until its room_message echo.
+        """
+
+        async def chat_one(client, room):
+            for index in range(messages):
+                text = f"benchmark {client.sid} {index}"
+                echo = client.expect('room_message', lambda data: data.get('message') == text)
+                rejection = client.expect('message_rejected')
+                started = time.perf_counter()
+                await client.emit('send_message', {'room': room, 'message': text})
+                done, _ = await asyncio.wait([echo, rejection], timeout=self.timeout, return_when=asyncio.FIRST_COMPLETED)
+                if echo in done:
+                    self.roundTrips.append(time.perf_counter() - started)
+                elif rejection in done:
+                    self.rejected += 1
+                else:
+                    self.timedOut += 1
+                echo.cancel()
+                rejection.cancel()
+                await asyncio.sleep(interval)
+
+        await asyncio.gather(*(chat_one(client, room) for client, room in self.clients))
+
+    async def close(self):
+        await asyncio.gather(*(client.close() for client, _ in self.clients))
+
+    def stats(self):
+        events = defaultdict(int)
+        for client, _ in self.clients:
+            for event, count in client.events.items():
+                events[event] += count
+        return {
+            'connections': len(self.clients),
+            'refused': self.refused,
+            'connectMs': distribution(self.connectTimes, scale=1000),
+            'messages': len(self.roundTrips),
+            'rejected': self.rejected,
+            'timedOut': self.timedOut,
+            'roundTripMs': distribution(self.roundTrips, scale=1000),
+            'eventsReceived': dict(events),
+        }
@@ -0,0 +1,27 @@
+# core/benchmarks/stats.py
+
+import math
+
+
+def percentile(ordered, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+
+    if not ordered:
+        return None
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def distribution(values, scale=1, digits=2):
+    """p50/p95/p99, mean and max of `values`, each multiplied by `scale`."""
+
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    summary = {
+        'p50': percentile(ordered, 0.50),
+        'p95': percentile(ordered, 0.95),
+        'p99': percentile(ordered, 0.99),
+        'mean': sum(ordered) / len(ordered),
+        'max': ordered[-1],
+    }
+    return {key: round(value * scale, digits) for key, value in summary.items()}
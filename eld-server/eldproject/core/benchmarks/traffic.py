@@ -0,0 +1,188 @@
+# core/benchmarks/traffic.py
+#
+# Mixed HTTP traffic against the trip endpoints of core/urls.py, replayed
+# from worker threads through Django's test client: the full middleware and
+# view stack in process, without a server or network in between. Each
+# request's route, status, latency and query count is kept for the report.
+
+import random
+import threading
+import time
+from collections import defaultdict
+from django.conf import settings
+from django.db import connection, connections
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from core.benchmarks.fleet import CITIES
+from core.benchmarks.stats import distribution
+
+ROUTES = ('create-trip', 'get-driver-trips', 'get-trip-byid', 'add-log-sheets', 'update-log-sheets')
+
+# Reads dominate: drivers reopen their trip list and trips far more often than they write.
+DEFAULT_MIX = {
+    'create-trip': 1,
+    'get-driver-trips': 4,
+    'get-trip-byid': 4,
+    'add-log-sheets': 1,
+    'update-log-sheets': 1,
+}
+
+
+def parse_mix(value):
+    """Parse 'route=weight,route=weight' into a mix; unlisted routes get no traffic."""
+
+    mix = {}
+    for part in filter(None, value.split(',')):
+        route, _, weight = part.partition('=')
+        route = route.strip()
+        if route not in ROUTES:
+            raise ValueError(f"Unknown route {route!r}, expected one of {', '.join(ROUTES)}")
+        mix[route] = float(weight or 1)
+    if not any(mix.values()):
+        raise ValueError("The mix gives no route any weight")
+    return mix
+
+
+def log_sheet_payload(rng):
+    current, pickup, dropoff = rng.sample(sorted(CITIES), 3)
+    return {'currentLocation': current, 'pickup': pickup, 'dropoff': dropoff,
+            'currentCycleUsed': str(round(rng.uniform(0, 60), 2))}
+
+
+class TrafficReplay:
+    """
+    Replays a weighted mix of requests against a Fleet. Rows created along
+    the way (trips, log sheets) join the pool later requests pick from.
+    """
+
+    def __init__(self, fleet, mix=None, seed=0):
+        self.fleet = fleet
+        self.mix = mix or DEFAULT_MIX
+        self.seed = seed
+        self.referer = (list(getattr(settings, 'CORS_ALLOWED_ORIGINS', [])) or [''])[0] + '/'
+        self._lock = threading.Lock()
+        self._trip_ids = [trip_id for trip_ids in fleet.trips.values() for trip_id in trip_ids]
+        self._trips_with_sheets = [trip_id for trip_id in self._trip_ids if fleet.logSheets.get(trip_id)]
+
+    def schedule(self, count):
+        rng = random.Random(self.seed)
+        return rng.choices(list(self.mix), weights=list(self.mix.values()), k=count)
+
+    def build(self, route, rng):
+        """The request for one `route` call: method, path, data and headers."""
+
+        with self._lock:
+            email = rng.choice(self.fleet.drivers)
+            trip_id = rng.choice(self._trip_ids)
+            sheet_trip_id = rng.choice(self._trips_with_sheets) if self._trips_with_sheets else trip_id
+            sheet_ids = list(self.fleet.logSheets.get(sheet_trip_id, ()))
+
+        if route == 'create-trip':
+            pickup, dropoff = rng.sample(sorted(CITIES), 2)
+            data = {
+                'email': email, 'tripTitle': 'Benchmark', 'pickup': pickup, 'dropoff': dropoff,
+                'cycleUsed': str(round(rng.uniform(0, 60), 2)),
+                'logSheets': [log_sheet_payload(rng) for _ in range(rng.randint(1, 3))],
+            }
+            return 'post', '/api/create-trip/', data, {}
+        if route == 'get-driver-trips':
+            return 'get', '/api/get-driver-trips/', {'email': email, 'limit': 20}, {'Referer': self.referer}
+        if route == 'get-trip-byid':
+            return 'get', '/api/get-trip-byid/', {'tripId': trip_id}, {}
+        if route == 'add-log-sheets':
+            return 'post', '/api/add-log-sheets/', {'tripId': trip_id, 'logSheets': [log_sheet_payload(rng)]}, {}
+
+        # update-log-sheets: new cycle hours for up to three sheets, moving half of them.
+        updates = []
+        for sheet_id in rng.sample(sheet_ids, min(3, len(sheet_ids))):
+            update = {'uniqueId': sheet_id, 'currentCycleUsed': str(round(rng.uniform(0, 60), 2))}
+            if rng.random() < 0.5:
+                update['currentLocation'] = rng.choice(sorted(CITIES))
+            updates.append(update)
+        return 'patch', '/api/update-log-sheets/', {'tripId': sheet_trip_id, 'logSheets': updates}, {}
+
+    def send(self, client, route, rng):
+        method, path, data, headers = self.build(route, rng)
+        kwargs = {'headers': headers}
+        if method != 'get':
+            kwargs['content_type'] = 'application/json'
+
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            response = getattr(client, method)(path, data, **kwargs)
+            elapsed = time.perf_counter() - started
+
+        self.record(route, data, response)
+        return route, response.status_code, elapsed, len(queries)
+
+    def record(self, route, data, response):
+        if response.status_code != 201:
+            return
+        body = response.json()
+        with self._lock:
+            if route == 'create-trip':
+                self.fleet.trips[data['email']].append(body['tripId'])
+                self._trip_ids.append(body['tripId'])
+            elif route == 'add-log-sheets':
+                sheet_ids = self.fleet.logSheets[data['tripId']]
+                if not sheet_ids:
+                    self._trips_with_sheets.append(data['tripId'])
+                sheet_ids.extend(sheet['uniqueId'] for sheet in body['logSheets'])
+
+    def run(self, count, concurrency):
+        """
+        Send `count` requests from `concurrency` threads, each with its own
+        client and database connection. Returns the samples and the elapsed
+        wall time.
+        """
+
+        routes = self.schedule(count)
+        samples = [None] * count
+        indexes = iter(range(count))
+        lock = threading.Lock()
+
+        def worker():
+            client = Client()
+            try:
+                while True:
+                    with lock:
+                        index = next(indexes, None)
+                    if index is None:
+                        return
+                    # Seeded per request, so a run's requests do not depend on thread timing.
+                    samples[index] = self.send(client, routes[index], random.Random(f"{self.seed}:{index}"))
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=worker, daemon=True) for _ in range(concurrency)]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return [sample for sample in samples if sample], time.perf_counter() - started
+
+
+def summarize(samples, elapsed):
+    """Per-route (and 'all') request counts, throughput, latency and query count distributions."""
+
+    by_route = defaultdict(list)
+    for sample in samples:
+        by_route[sample[0]].append(sample)
+        by_route['all'].append(sample)
+
+    report = {}
+    for route in [route for route in ROUTES if route in by_route] + ['all']:
+        route_samples = by_route[route]
+        statuses = defaultdict(int)
+        for _, status_code, _, _ in route_samples:
+            statuses[str(status_code)] += 1
+        report[route] = {
+            'requests': len(route_samples),
+            'errors': sum(1 for sample in route_samples if sample[1] >= 400),
+            'statuses': dict(statuses),
+            'throughput': round(len(route_samples) / elapsed, 2) if elapsed else None,
+            'latencyMs': distribution([sample[2] for sample in route_samples], scale=1000),
+            'queries': distribution([sample[3] for sample in route_samples]),
+        }
+    return report
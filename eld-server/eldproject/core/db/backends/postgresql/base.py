@@ -0,0 +1,95 @@
+# core/db/backends/postgresql/base.py
+#
+# PostgreSQL backend whose connections come from a bounded per-process pool
+# (core.db.pool) instead of being opened and kept per thread. Enabled from
+# settings when DB_POOL_MAX_SIZE is set; see the "Database connection pool"
+# block there.
+
+import threading
+from django.conf import settings
+from django.db.backends.postgresql.base import DatabaseWrapper as PostgresDatabaseWrapper
+from django.db.backends.postgresql.psycopg_any import IsolationLevel
+from core.db.pool import ConnectionPool, PoolTimeout, STATS_METRICS
+from core.services.metrics import request_metrics
+
+# libpq's PQTRANS_IDLE, for both psycopg2 and psycopg 3.
+TRANSACTION_STATUS_IDLE = 0
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def _check(connection):
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+        connection.rollback()
+        return True
+    except Exception:
+        return False
+
+
+def _reset(connection):
+    # Only connections that are idle outside a transaction go back in the pool.
+    if connection.closed:
+        return False
+    try:
+        if connection.info.transaction_status != TRANSACTION_STATUS_IDLE:
+            connection.rollback()
+        return connection.info.transaction_status == TRANSACTION_STATUS_IDLE
+    except Exception:
+        return False
+
+
+def get_pool(alias):
+    with _pools_lock:
+        pool = _pools.get(alias)
+        if pool is None:
+            pool = _pools[alias] = ConnectionPool(
+                connect=None,
+                check=_check,
+                reset=_reset,
+                min_size=getattr(settings, 'DB_POOL_MIN_SIZE', 0),
+                max_size=getattr(settings, 'DB_POOL_MAX_SIZE', 10),
+                timeout=getattr(settings, 'DB_POOL_TIMEOUT', 10),
+                health_check_interval=getattr(settings, 'DB_POOL_HEALTH_CHECK_INTERVAL', 30),
+                max_lifetime=getattr(settings, 'DB_POOL_MAX_LIFETIME', 3600),
+            )
+        return pool
+
+
+def pool_stats():
+    with _pools_lock:
+        return {alias: pool.stats() for alias, pool in _pools.items()}
+
+
+request_metrics.add_stats('eld_db_pool', pool_stats, STATS_METRICS, label='alias')
+
+
+class DatabaseWrapper(PostgresDatabaseWrapper):
+    def get_new_connection(self, conn_params):
+        pool = get_pool(self.alias)
+
+        def connect():
+            return super(DatabaseWrapper, self).get_new_connection(conn_params)
+
+        pool.fill(connect)
+        try:
+            connection = pool.acquire(connect)
+        except PoolTimeout as e:
+            raise self.Database.OperationalError(str(e)) from e
+
+        # The parent sets this while connecting; reused connections need it too.
+        isolation_level = self.settings_dict["OPTIONS"].get("isolation_level")
+        self.isolation_level = IsolationLevel(isolation_level) if isolation_level is not None else IsolationLevel.READ_COMMITTED
+        return connection
+
+    def _close(self):
+        if self.connection is None:
+            return
+        pool = get_pool(self.alias)
+        if self.in_atomic_block:
+            # Django keeps referencing a connection closed inside atomic(); never share it.
+            pool.discard(self.connection)
+        else:
+            pool.release(self.connection)
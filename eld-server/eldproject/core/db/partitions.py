@@ -0,0 +1,154 @@
+# core/db/partitions.py
+#
+# Range partitioning by a date column, for Postgres. Django has no notion of
+# partitioned tables, so these create them from the model definitions in
+# migrations and add partitions ahead of time. On other databases (SQLite in
+# development) the tables are created as plain tables and the partition
+# helpers do nothing.
+
+from datetime import date
+from django.db import transaction
+
+
+def is_postgres(connection):
+    return connection.vendor == 'postgresql'
+
+
+def partitioned_table_sql(schema_editor, model, column):
+    """
+    CREATE TABLE for `model`, range-partitioned on `column`. Postgres needs
+    the partition key in every unique constraint, so the primary key becomes
+    (pk, column); the model keeps treating its pk as unique on its own.
+    """
+
+    quote = schema_editor.quote_name
+    columns = []
+    for field in model._meta.local_fields:
+        definition, _ = schema_editor.column_sql(model, field)
+        if field.primary_key:
+            definition = definition.replace(' PRIMARY KEY', '')
+        check = field.db_check(schema_editor.connection)
+        if check:
+            definition += f" CHECK ({check})"
+        columns.append(f"{quote(field.column)} {definition}")
+    columns.append(f"PRIMARY KEY ({quote(model._meta.pk.column)}, {quote(column)})")
+    return (
+        f"CREATE TABLE {quote(model._meta.db_table)} ({', '.join(columns)}) "
+        f"PARTITION BY RANGE ({quote(column)})"
+    )
+
+
+def create_partitioned_model(schema_editor, model, column):
+    """
+    Migration helper: create `model`'s table partitioned on `column` with
+    its indexes and a DEFAULT partition, or as a plain table off Postgres.
+    """
+
+    if not is_postgres(schema_editor.connection):
+        schema_editor.create_model(model)
+        return
+
+    create_partitioned_table(schema_editor, model, column)
+    create_model_indexes(schema_editor, model)
+
+
+def create_partitioned_table(schema_editor, model, column):
+    schema_editor.execute(partitioned_table_sql(schema_editor, model, column))
+    schema_editor.execute(default_partition_sql(schema_editor.quote_name, model._meta.db_table))
+
+
+def create_model_indexes(schema_editor, model):
+    """
+    Indexes and foreign keys of `model`, as Django's create_model would add
+    them. On a partitioned table, Postgres creates them on every partition.
+    """
+
+    for sql in schema_editor._model_indexes_sql(model):
+        schema_editor.execute(sql)
+    for field in model._meta.local_fields:
+        if field.remote_field and field.db_constraint:
+            schema_editor.execute(schema_editor._create_fk_sql(model, field, "_fk_%(to_table)s_%(to_column)s"))
+
+
+def default_partition_sql(quote, table):
+    # Catches rows outside every range instead of failing the insert.
+    return f"CREATE TABLE IF NOT EXISTS {quote(f'{table}_default')} PARTITION OF {quote(table)} DEFAULT"
+
+
+def add_months(day, months):
+    month = day.month - 1 + months
+    return date(day.year + month // 12, month % 12 + 1, 1)
+
+
+def partition_ranges(start, end, months):
+    """(name suffix, from, to) of every `months`-long partition overlapping [start, end]."""
+
+    first = date(start.year, 1, 1) if months == 12 else date(start.year, start.month, 1)
+    ranges = []
+    while first <= end:
+        following = add_months(first, months)
+        suffix = f"{first:%Y}" if months == 12 else f"{first:%Y%m}"
+        ranges.append((suffix, first, following))
+        first = following
+    return ranges
+
+
+def ensure_partitions(connection, table, start, end, months=1):
+    """
+    Create the missing `months`-long partitions of `table` covering the days
+    start..end (UTC bounds). Returns the names of the partitions created.
+    """
+
+    if not is_postgres(connection):
+        return []
+
+    quote = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE parent.relname = %s",
+            [table],
+        )
+        existing = {name for name, in cursor.fetchall()}
+
+        created = []
+        for suffix, first, following in partition_ranges(start, end, months):
+            name = f"{table}_p{suffix}"
+            if name in existing:
+                continue
+            cursor.execute(
+                f"CREATE TABLE {quote(name)} PARTITION OF {quote(table)} "
+                f"FOR VALUES FROM ('{first.isoformat()} 00:00:00+00') TO ('{following.isoformat()} 00:00:00+00')"
+            )
+            created.append(name)
+    return created
+
+
+def drain_default_partition(connection, table, column, months=1):
+    """
+    Move the rows that landed in `table`'s DEFAULT partition (because their
+    partition did not exist yet) into proper partitions. Postgres will not
+    create a partition whose range has rows in the DEFAULT one, so the
+    DEFAULT partition is detached, emptied into the new partitions and
+    attached again, all in one transaction. Returns the number of rows moved.
+    """
+
+    if not is_postgres(connection):
+        return 0
+
+    quote = connection.ops.quote_name
+    default = f"{table}_default"
+    with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+        cursor.execute(f"SELECT min({quote(column)}), max({quote(column)}), count(*) FROM {quote(default)}")
+        first, last, count = cursor.fetchone()
+        if not count:
+            return 0
+
+        cursor.execute(f"ALTER TABLE {quote(table)} DETACH PARTITION {quote(default)}")
+        ensure_partitions(connection, table, first.date(), last.date(), months)
+        cursor.execute(f"INSERT INTO {quote(table)} SELECT * FROM {quote(default)}")
+        cursor.execute(f"TRUNCATE {quote(default)}")
+        cursor.execute(f"ALTER TABLE {quote(table)} ATTACH PARTITION {quote(default)} DEFAULT")
+    return count
@@ -0,0 +1,188 @@
+# core/db/pool.py
+
+import threading
+import time
+from collections import deque
+
+# stats() keys served on metrics/ as eld_db_pool_*, per database alias.
+STATS_METRICS = {
+    'open': ('open', 'gauge', "Connections open."),
+    'idle': ('idle', 'gauge', "Open connections waiting in the pool."),
+    'inUse': ('in_use', 'gauge', "Connections checked out."),
+    'maxSize': ('max_size', 'gauge', "Most connections the pool opens."),
+    'checkouts': ('checkouts_total', 'counter', "Connections handed out."),
+    'created': ('created_total', 'counter', "Connections opened."),
+    'discarded': ('discarded_total', 'counter', "Connections closed as broken, expired or unhealthy."),
+    'healthCheckFailures': ('health_check_failures_total', 'counter', "Idle connections that failed their health check."),
+    'waits': ('waits_total', 'counter', "Checkouts that had to wait for a connection."),
+    'timeouts': ('timeouts_total', 'counter', "Checkouts that gave up waiting."),
+    'avgWaitMs': ('wait_avg_milliseconds', 'gauge', "Average wait of the checkouts that waited."),
+    'maxWaitMs': ('wait_max_milliseconds', 'gauge', "Longest checkout wait."),
+}
+
+
+class PoolTimeout(Exception):
+    pass
+
+
+class ConnectionPool:
+    """
+    Bounded, thread-safe pool of database connections for one process.
+
+    At most `max_size` connections are open at a time; a checkout beyond that
+    waits up to `timeout` seconds for one to be returned, then raises
+    PoolTimeout. Idle connections are reused newest first. A connection that
+    has been idle for `health_check_interval` seconds is checked with `check`
+    before it is handed out, and one older than `max_lifetime` is replaced.
+
+    `connect`, `check(connection)` and `reset(connection)` are supplied by the
+    database backend; `check` and `reset` return False for connections that
+    must be discarded.
+    """
+
+    def __init__(self, connect, check, reset, min_size=0, max_size=10, timeout=10,
+                 health_check_interval=30, max_lifetime=3600):
+        self.connect = connect
+        self.check = check
+        self.reset = reset
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+        self.max_lifetime = max_lifetime
+
+        self._idle = deque()
+        self._opened_at = {}
+        self._open = 0
+        self._condition = threading.Condition()
+
+        self.checkouts = 0
+        self.created = 0
+        self.discarded = 0
+        self.healthCheckFailures = 0
+        self.waits = 0
+        self.timeouts = 0
+        self.totalWait = 0.0
+        self.maxWait = 0.0
+
+    def _expired(self, connection, now):
+        return now - self._opened_at.get(id(connection), now) > self.max_lifetime
+
+    def _open_connection(self, connect):
+        try:
+            connection = connect()
+        except Exception:
+            with self._condition:
+                self._open -= 1
+                self._condition.notify()
+            raise
+        with self._condition:
+            self.created += 1
+            self._opened_at[id(connection)] = time.monotonic()
+        return connection
+
+    def _discard(self, connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
+        with self._condition:
+            self._opened_at.pop(id(connection), None)
+            self._open -= 1
+            self.discarded += 1
+            self._condition.notify()
+
+    def fill(self, connect=None):
+        """Open connections until `min_size` are open."""
+
+        while True:
+            with self._condition:
+                if self._open >= self.min_size:
+                    return
+                self._open += 1
+            connection = self._open_connection(connect or self.connect)
+            with self._condition:
+                self._idle.append((connection, time.monotonic()))
+                self._condition.notify()
+
+    def acquire(self, connect=None):
+        connect = connect or self.connect
+        started = time.monotonic()
+        deadline = started + self.timeout
+        waited = False
+
+        while True:
+            with self._condition:
+                while not self._idle and self._open >= self.max_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.timeouts += 1
+                        raise PoolTimeout(
+                            f"No database connection available within {self.timeout}s "
+                            f"({self.max_size} in use)"
+                        )
+                    waited = True
+                    self._condition.wait(remaining)
+
+                if self._idle:
+                    connection, idle_since = self._idle.pop()
+                else:
+                    self._open += 1
+                    connection = None
+
+            if connection is None:
+                connection = self._open_connection(connect)
+            else:
+                now = time.monotonic()
+                if self._expired(connection, now):
+                    self._discard(connection)
+                    continue
+                if now - idle_since >= self.health_check_interval and not self.check(connection):
+                    with self._condition:
+                        self.healthCheckFailures += 1
+                    self._discard(connection)
+                    continue
+
+            # Count the checkout once, however many discarded connections it went through.
+            with self._condition:
+                self.checkouts += 1
+                if waited:
+                    wait = time.monotonic() - started
+                    self.waits += 1
+                    self.totalWait += wait
+                    self.maxWait = max(self.maxWait, wait)
+            return connection
+
+    def release(self, connection):
+        if not self.reset(connection) or self._expired(connection, time.monotonic()):
+            self._discard(connection)
+            return
+        with self._condition:
+            self._idle.append((connection, time.monotonic()))
+            self._condition.notify()
+
+    def discard(self, connection):
+        self._discard(connection)
+
+    def close(self):
+        with self._condition:
+            idle, self._idle = list(self._idle), deque()
+        for connection, _ in idle:
+            self._discard(connection)
+
+    def stats(self):
+        with self._condition:
+            return {
+                'open': self._open,
+                'idle': len(self._idle),
+                'inUse': self._open - len(self._idle),
+                'maxSize': self.max_size,
+                'checkouts': self.checkouts,
+                'created': self.created,
+                'discarded': self.discarded,
+                'healthCheckFailures': self.healthCheckFailures,
+                'waits': self.waits,
+                'timeouts': self.timeouts,
+                'avgWaitMs': round(self.totalWait / self.waits * 1000, 2) if self.waits else 0,
+                'maxWaitMs': round(self.maxWait * 1000, 2),
+            }
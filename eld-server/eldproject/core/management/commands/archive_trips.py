@@ -0,0 +1,28 @@
+# core/management/commands/archive_trips.py
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from core.services.archive import archive_trips
+
+
+class Command(BaseCommand):
+    help = (
+        "Move soft-deleted trips (and, with --closed-days, trips with no recent log sheets) "
+        "and their log sheets into the archive tables, in batches. Meant to be run "
+        "regularly, e.g. nightly from cron."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--deleted-days', type=int, default=getattr(settings, 'ARCHIVE_DELETED_AFTER_DAYS', 30),
+                            help="Archive trips deleted more than this many days ago.")
+        parser.add_argument('--closed-days', type=int, default=getattr(settings, 'ARCHIVE_CLOSED_AFTER_DAYS', 0),
+                            help="Also archive trips without a log sheet in this many days (0: never).")
+        parser.add_argument('--batch-size', type=int, default=getattr(settings, 'ARCHIVE_BATCH_SIZE', 500))
+
+    def handle(self, *args, **options):
+        total_trips = total_log_sheets = 0
+        for trips, log_sheets in archive_trips(options['deleted_days'], options['closed_days'], options['batch_size']):
+            total_trips += trips
+            total_log_sheets += log_sheets
+            self.stdout.write(f"Archived {trips} trip(s), {log_sheets} log sheet(s)")
+        self.stdout.write(self.style.SUCCESS(f"Done: {total_trips} trip(s), {total_log_sheets} log sheet(s) archived"))
@@ -0,0 +1,125 @@
+# core/management/commands/benchmark_fleet.py
+
+import asyncio
+import contextlib
+import json
+import sys
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.utils import timezone
+from core.benchmarks.fleet import PASSWORD, seed_fleet, delete_fleet, warm_location_caches
+from core.benchmarks.sockets import SocketLoad
+from core.benchmarks.traffic import DEFAULT_MIX, TrafficReplay, parse_mix, summarize
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a synthetic fleet (--drivers x --trips x --log-sheets), replay a mixed "
+        "request load against the trip endpoints while Socket.IO clients stay connected "
+        "and chat in their rooms, and write p50/p95/p99 latency, throughput and query "
+        "counts per route as JSON. Everything runs in process. The geocode and route "
+        "caches are pre-filled for the benchmark's cities (existing entries are kept), "
+        "so no request leaves the machine. The fleet is deleted afterwards unless --keep "
+        "is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--drivers', type=int, default=50)
+        parser.add_argument('--trips', type=int, default=20, help="Per driver.")
+        parser.add_argument('--log-sheets', type=int, default=5, help="Per trip.")
+        parser.add_argument('--requests', type=int, default=2000)
+        parser.add_argument('--concurrency', type=int, default=8)
+        parser.add_argument(
+            '--mix', default=','.join(f"{route}={weight}" for route, weight in DEFAULT_MIX.items()),
+            help="Route weights, e.g. get-trip-byid=4,create-trip=1.",
+        )
+        parser.add_argument('--sockets', type=int, default=20, help="Socket.IO connections, one per driver.")
+        parser.add_argument('--socket-messages', type=int, default=10, help="Messages each connection sends.")
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--output', default='-', help="JSON report path; - for stdout.")
+        parser.add_argument('--keep', action='store_true')
+
+    def handle(self, *args, **options):
+        try:
+            mix = parse_mix(options['mix'])
+        except ValueError as e:
+            raise CommandError(str(e))
+        if options['drivers'] < 1 or options['trips'] < 1:
+            raise CommandError("A fleet needs at least one driver and one trip.")
+
+        warm_location_caches()
+        started = time.perf_counter()
+        fleet = seed_fleet(options['drivers'], options['trips'], options['log_sheets'], options['seed'])
+        seed_seconds = time.perf_counter() - started
+
+        try:
+            # The views and socket handlers print as they go; keep stdout for the report.
+            with contextlib.redirect_stdout(sys.stderr):
+                cookies = self.log_in(fleet.drivers[:options['sockets']])
+                connection.close()
+                traffic, sockets = asyncio.run(self.run(fleet, mix, cookies, options))
+        finally:
+            if not options['keep']:
+                delete_fleet(fleet.prefix)
+
+        report = {
+            'startedAt': timezone.now().isoformat(),
+            'database': connection.vendor,
+            'fleet': {
+                'prefix': fleet.prefix,
+                'drivers': options['drivers'],
+                'tripsPerDriver': options['trips'],
+                'logSheetsPerTrip': options['log_sheets'],
+                'seedSeconds': round(seed_seconds, 2),
+                'afterRun': fleet.stats(),
+            },
+            'traffic': traffic,
+            'sockets': sockets,
+        }
+        data = json.dumps(report, indent=2)
+        if options['output'] == '-':
+            self.stdout.write(data)
+        else:
+            with open(options['output'], 'w') as output:
+                output.write(data + '\n')
+            self.stderr.write(f"Report written to {options['output']}")
+
+    def log_in(self, emails):
+        cookies = []
+        for email in emails:
+            response = Client().post('/api/login/', {'email': email, 'password': PASSWORD}, content_type='application/json')
+            if response.status_code != 200:
+                raise CommandError(f"Could not log in as {email}: {response.content.decode()}")
+            cookies.append((f"user_{email}", f"token={response.cookies['token'].value}"))
+        return cookies
+
+    async def run(self, fleet, mix, cookies, options):
+        from eldproject.asgi import application, outbox
+
+        sockets = SocketLoad(application)
+        await sockets.open(cookies)
+
+        # HTTP traffic from worker threads while the sockets chat on this loop;
+        # the events the views publish reach the connected drivers' rooms.
+        replay = TrafficReplay(fleet, mix, options['seed'])
+        http = asyncio.get_running_loop().run_in_executor(None, replay.run, options['requests'], options['concurrency'])
+        # Stay under the per-connection message rate limit.
+        interval = 1 / getattr(settings, 'SOCKETIO_MESSAGE_RATE', 5)
+        await sockets.chat(options['socket_messages'], interval)
+        samples, elapsed = await http
+
+        # Let the outbox deliver what the last requests published.
+        await asyncio.sleep(getattr(settings, 'SOCKET_OUTBOX_FLUSH_INTERVAL', 0.05) * 4)
+        await sockets.close()
+
+        traffic = {
+            'requests': len(samples),
+            'concurrency': options['concurrency'],
+            'mix': mix,
+            'elapsedSeconds': round(elapsed, 2),
+            'routes': summarize(samples, elapsed),
+        }
+        return traffic, dict(sockets.stats(), outbox=outbox.stats())
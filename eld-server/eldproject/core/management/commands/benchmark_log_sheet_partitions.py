@@ -0,0 +1,126 @@
+# core/management/commands/benchmark_log_sheet_partitions.py
+
+import statistics
+import time
+import uuid
+from datetime import timedelta
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Sum
+from django.utils import timezone
+from core.db.partitions import add_months, ensure_partitions, is_postgres
+from core.models import Driver, Trip, LogSheet
+from core.serializers.fastSerializers import serialize_trip_data
+
+SEED_SQL = """
+WITH trips AS (
+    INSERT INTO core_trip ("uniqueId", "driverId_id", "tripTitle", "createdDate", "isDeleted")
+    SELECT gen_random_uuid(), %(driver)s, 'Benchmark ' || n, %(start)s::timestamptz + n * %(spacing)s::interval, false
+    FROM generate_series(1, %(trips)s) n
+    RETURNING "uniqueId", "createdDate"
+)
+INSERT INTO core_logsheet ("uniqueId", "tripId_id", "currentLocation", "createdDate", "logNumber", "isDeleted", "dutyTotals")
+SELECT gen_random_uuid(), trips."uniqueId", 'Omaha, NE', trips."createdDate" + k * interval '1 hour', k, false,
+       '{"cycleHours": 8.5, "drivingHours": 6.0, "totalDistance": 500.0}'::jsonb
+FROM trips, generate_series(1, %(sheets)s) k
+"""
+
+
+class Command(BaseCommand):
+    help = (
+        "Grow core_logsheet to --rows synthetic rows in --steps, a year of older history "
+        "per step, and time the trip-detail and recent driver-history queries after each "
+        "step. With monthly partitions both should stay flat. Postgres only; the "
+        "synthetic rows are deleted afterwards unless --keep is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=10_000_000)
+        parser.add_argument('--steps', type=int, default=5)
+        parser.add_argument('--sheets-per-trip', type=int, default=10)
+        parser.add_argument('--batch-rows', type=int, default=200_000, help="Rows per INSERT.")
+        parser.add_argument('--repeat', type=int, default=50)
+        parser.add_argument('--keep', action='store_true')
+
+    def handle(self, *args, **options):
+        if not is_postgres(connection):
+            raise CommandError("Partitioning only applies to Postgres; run this against a Postgres database.")
+
+        suffix = uuid.uuid4().hex[:8]
+        driver = Driver.objects.create(
+            fullName='Benchmark', username=f"bench-{suffix}", email=f"bench-{suffix}@example.com", password='benchmark',
+        )
+        # The trip a driver is looking at today, and its sheets.
+        probe = Trip.objects.create(driverId=driver, tripTitle='Probe', pickup='Chicago, IL', dropoff='Denver, CO')
+        LogSheet.objects.bulk_create([
+            LogSheet(tripId=probe, currentLocation='Omaha, NE', logNumber=index + 1,
+                     dutyTotals={'cycleHours': 8.5, 'drivingHours': 6.0, 'totalDistance': 500.0})
+            for index in range(options['sheets_per_trip'])
+        ])
+
+        self.stdout.write(f"{'rows':>12} {'partitions':>10} {'detail ms':>10} {'unbounded ms':>13} {'8-day ms':>9} {'scanned':>8}")
+        try:
+            now = timezone.now()
+            rows_per_step = options['rows'] // options['steps']
+            for step in range(options['steps']):
+                # Each step adds the year before the history seeded so far.
+                end = now - timedelta(days=365 * step + 30)
+                self.seed(driver, end - timedelta(days=365), end, rows_per_step, options)
+                self.report(driver, probe, options)
+        finally:
+            if not options['keep']:
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        'DELETE FROM core_logsheet WHERE "tripId_id" IN (SELECT "uniqueId" FROM core_trip WHERE "driverId_id" = %s)',
+                        [driver.uniqueId],
+                    )
+                    cursor.execute('DELETE FROM core_trip WHERE "driverId_id" = %s', [driver.uniqueId])
+                driver.delete()
+
+    def seed(self, driver, start, end, rows, options):
+        ensure_partitions(connection, LogSheet._meta.db_table, start.date(), add_months(end.date(), 1))
+        sheets = options['sheets_per_trip']
+        trips = rows // sheets
+        spacing = (end - start) / max(trips, 1)
+        batch_trips = max(1, options['batch_rows'] // sheets)
+
+        with connection.cursor() as cursor:
+            for first in range(0, trips, batch_trips):
+                cursor.execute(SEED_SQL, {
+                    'driver': driver.uniqueId,
+                    'start': start + spacing * first,
+                    'spacing': spacing,
+                    'trips': min(batch_trips, trips - first),
+                    'sheets': sheets,
+                })
+            cursor.execute("ANALYZE core_trip")
+            cursor.execute("ANALYZE core_logsheet")
+
+    def timed(self, function, repeat):
+        samples = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            function()
+            samples.append((time.perf_counter() - started) * 1000)
+        return statistics.median(samples)
+
+    def report(self, driver, probe, options):
+        repeat = options['repeat']
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT count(*) FROM core_logsheet")
+            rows, = cursor.fetchone()
+            cursor.execute("SELECT count(*) FROM pg_inherits WHERE inhparent = 'core_logsheet'::regclass")
+            partitions, = cursor.fetchone()
+
+        detail = self.timed(lambda: serialize_trip_data(str(probe.uniqueId)), repeat)
+        # The same sheets without the createdDate bound: every partition's index is probed.
+        unbounded = self.timed(lambda: list(LogSheet.objects.filter(tripId=probe).values('uniqueId', 'dutyTotals')), repeat)
+        since = timezone.now() - timedelta(days=8)
+        window = self.timed(
+            lambda: LogSheet.objects.filter(tripId__driverId=driver, createdDate__gte=since).aggregate(Sum('logNumber')),
+            repeat,
+        )
+
+        plan = probe.log_sheets().values('uniqueId').explain()
+        scanned = sum(' on core_logsheet_' in line for line in plan.splitlines())
+        self.stdout.write(f"{rows:>12} {partitions:>10} {detail:>10.2f} {unbounded:>13.2f} {window:>9.2f} {scanned:>8}")
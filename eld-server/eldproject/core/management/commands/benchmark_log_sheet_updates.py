@@ -0,0 +1,79 @@
+# core/management/commands/benchmark_log_sheet_updates.py
+
+import time
+import uuid
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.shortcuts import get_object_or_404
+from django.test.utils import CaptureQueriesContext
+from core.models import Driver, Trip, LogSheet
+from core.serializers.tripSerializers import LogSheetSerializer
+from core.views.tripViews import update_log_sheets
+
+
+class Rollback(Exception):
+    pass
+
+
+def update_one_by_one(trip, log_sheets_data):
+    """update-log-sheets/ as it was: one lookup and one full-row save per sheet."""
+
+    updated_log_sheets = []
+    for log_sheet_data in log_sheets_data:
+        log_sheet = get_object_or_404(LogSheet, uniqueId=log_sheet_data['uniqueId'], tripId=trip)
+        serializer = LogSheetSerializer(log_sheet, data=log_sheet_data, partial=True)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        updated_log_sheets.append(serializer.data)
+    return updated_log_sheets
+
+
+class Command(BaseCommand):
+    help = (
+        "Time update-log-sheets/ before (a lookup and save per sheet) and after "
+        "(one fetch and grouped bulk_update) for batches of --sizes sheets, with "
+        "query counts. Runs in a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[1, 100, 1000])
+        parser.add_argument('--repeat', type=int, default=3)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self.run(options['sizes'], options['repeat'])
+                raise Rollback
+        except Rollback:
+            pass
+
+    def run(self, sizes, repeat):
+        suffix = uuid.uuid4().hex[:8]
+        driver = Driver.objects.create(
+            fullName='Benchmark', username=f"bench-{suffix}", email=f"bench-{suffix}@example.com", password='benchmark',
+        )
+        trip = Trip.objects.create(driverId=driver, tripTitle='Benchmark', pickup='Chicago, IL', dropoff='Denver, CO')
+        log_sheets = LogSheet.objects.bulk_create([
+            LogSheet(tripId=trip, currentLocation='Omaha, NE', pickup='Chicago, IL', dropoff='Denver, CO',
+                     currentCycleUsed='3.25', logNumber=index + 1)
+            for index in range(max(sizes))
+        ], batch_size=500)
+
+        for size in sizes:
+            line = []
+            for label, update in (('before', update_one_by_one), ('after', update_log_sheets)):
+                best, queries = None, 0
+                for attempt in range(repeat):
+                    # Locations stay put: the old path never re-geocoded, so only compare the writes.
+                    log_sheets_data = [
+                        {'uniqueId': str(log_sheet.uniqueId), 'currentCycleUsed': str(attempt + 1)}
+                        for log_sheet in log_sheets[:size]
+                    ]
+                    with CaptureQueriesContext(connection) as captured:
+                        started = time.perf_counter()
+                        update(trip, log_sheets_data)
+                        elapsed = time.perf_counter() - started
+                    best = elapsed if best is None else min(best, elapsed)
+                    queries = len(captured)
+                line.append(f"{label} {best * 1000:.1f} ms / {queries} queries")
+            self.stdout.write(f"{size} sheets: " + ", ".join(line))
@@ -0,0 +1,92 @@
+# core/management/commands/benchmark_serializers.py
+
+import json
+import time
+import uuid
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.utils.encoders import JSONEncoder
+from core.models import Driver, Trip, LogSheet
+from core.serializers.tripSerializers import GetDriverTripsSerializer, GetTripDataSerializer
+from core.serializers.fastSerializers import driver_trips_values, serialize_driver_trips, serialize_trip_data
+
+
+class Rollback(Exception):
+    pass
+
+
+def normalize(data):
+    return json.loads(json.dumps(data, cls=JSONEncoder))
+
+
+def timed(render, repeat):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = render()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+
+class Command(BaseCommand):
+    help = (
+        "Time the DRF read serializers against the .values() fast path on "
+        "generated data, and fail if their outputs differ. Nothing is kept."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--trips', type=int, default=1000)
+        parser.add_argument('--log-sheets', type=int, default=10000)
+        parser.add_argument('--repeat', type=int, default=3)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self.run(options['trips'], options['log_sheets'], options['repeat'])
+                raise Rollback
+        except Rollback:
+            pass
+
+    def run(self, trip_count, log_sheet_count, repeat):
+        driver = Driver.objects.create(
+            fullName='Benchmark', username=f"bench-{uuid.uuid4().hex[:8]}",
+            email=f"bench-{uuid.uuid4().hex[:8]}@example.com", password='benchmark',
+        )
+        trips = Trip.objects.bulk_create([
+            Trip(driverId=driver, tripTitle=f"Trip {index}", pickup='Chicago, IL', dropoff='Denver, CO',
+                 cycleUsed='12.5', instructions='Benchmark trip', tripNumber=index + 1)
+            for index in range(trip_count)
+        ])
+        LogSheet.objects.bulk_create([
+            LogSheet(tripId=trips[index % trip_count], currentLocation='Omaha, NE', pickup='Chicago, IL',
+                     dropoff='Denver, CO', currentCycleUsed='3.25', logNumber=index + 1,
+                     dutyTotals={'drivingHours': 8.0, 'totalDistance': 420.0})
+            for index in range(log_sheet_count)
+        ], batch_size=500)
+
+        queryset = Trip.objects.filter(driverId=driver).order_by('-createdDate', '-tripNumber')
+        trip_ids = [trip.uniqueId for trip in trips]
+
+        cases = [
+            (
+                f"driver trips list ({trip_count} trips)",
+                lambda: GetDriverTripsSerializer(queryset, many=True).data,
+                lambda: serialize_driver_trips(driver_trips_values(queryset)),
+            ),
+            (
+                f"trip detail x{trip_count} ({log_sheet_count} log sheets)",
+                lambda: [GetTripDataSerializer(Trip.objects.prefetch_related('logSheets').get(uniqueId=trip_id)).data for trip_id in trip_ids],
+                lambda: [serialize_trip_data(trip_id) for trip_id in trip_ids],
+            ),
+        ]
+
+        for name, drf_render, fast_render in cases:
+            drf_data, drf_time = timed(drf_render, repeat)
+            fast_data, fast_time = timed(fast_render, repeat)
+            if normalize(drf_data) != normalize(fast_data):
+                raise CommandError(f"{name}: fast path output differs from the DRF serializer")
+            self.stdout.write(
+                f"{name}: drf {drf_time * 1000:.1f} ms, fast {fast_time * 1000:.1f} ms, "
+                f"{drf_time / fast_time:.1f}x, outputs identical"
+            )
@@ -0,0 +1,97 @@
+# core/management/commands/benchmark_trip_views.py
+
+import asyncio
+import time
+import uuid
+from django.core.management.base import BaseCommand
+from django.test import AsyncClient
+from core.models import Driver, Trip, LogSheet
+from core.services.tripcache import trip_cache
+
+REFERER = {"Referer": "http://localhost:3000/"}
+
+
+class Command(BaseCommand):
+    help = (
+        "Side-by-side throughput of the sync (DRF) and async trip endpoints "
+        "with concurrent clients, in process through Django's ASGI handler. "
+        "Uses a throwaway driver that is deleted afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=20)
+        parser.add_argument('--requests', type=int, default=400)
+        parser.add_argument('--trips', type=int, default=50)
+        parser.add_argument('--log-sheets', type=int, default=10, help="Per trip.")
+
+    def handle(self, *args, **options):
+        suffix = uuid.uuid4().hex[:8]
+        driver = Driver.objects.create(
+            fullName='Benchmark', username=f"bench-{suffix}", email=f"bench-{suffix}@example.com", password='benchmark',
+        )
+        trips = Trip.objects.bulk_create([
+            Trip(driverId=driver, tripTitle=f"Trip {index}", pickup='Chicago, IL', dropoff='Denver, CO',
+                 cycleUsed='12.5', tripNumber=index + 1)
+            for index in range(options['trips'])
+        ])
+        log_sheets = LogSheet.objects.bulk_create([
+            LogSheet(tripId=trip, currentLocation='Omaha, NE', pickup='Chicago, IL', dropoff='Denver, CO',
+                     currentCycleUsed='3.25', logNumber=index + 1)
+            for trip in trips for index in range(options['log_sheets'])
+        ], batch_size=500)
+        log_sheet_ids = [(str(log_sheet.tripId.uniqueId), str(log_sheet.uniqueId)) for log_sheet in log_sheets]
+
+        try:
+            asyncio.run(self.run(driver, [str(trip.uniqueId) for trip in trips], log_sheet_ids, options))
+        finally:
+            Trip.objects.filter(driverId=driver).delete()
+            driver.delete()
+
+    async def run(self, driver, trip_ids, log_sheet_ids, options):
+        client = AsyncClient()
+        trip_payload = {
+            'email': driver.email, 'tripTitle': 'Benchmark', 'pickup': 'Chicago, IL', 'dropoff': 'Denver, CO',
+            'cycleUsed': '10', 'logSheets': [{'currentLocation': 'Chicago, IL', 'currentCycleUsed': '10'}],
+        }
+        # Warm the geocoding cache so create-trip measures the view, not Nominatim.
+        await client.post('/api/create-trip/', trip_payload, content_type='application/json')
+
+        cases = [
+            ('get-driver-trips', lambda prefix, index: client.get(
+                f'/api/{prefix}get-driver-trips/', {'email': driver.email, 'limit': 20}, headers=REFERER)),
+            ('get-trip-byid', lambda prefix, index: client.get(
+                f'/api/{prefix}get-trip-byid/', {'tripId': trip_ids[index % len(trip_ids)]})),
+            ('create-trip', lambda prefix, index: client.post(
+                f'/api/{prefix}create-trip/', trip_payload, content_type='application/json')),
+            ('add-log-sheets', lambda prefix, index: client.post(
+                f'/api/{prefix}add-log-sheets/',
+                {'tripId': trip_ids[index % len(trip_ids)], 'logSheets': trip_payload['logSheets']},
+                content_type='application/json')),
+            ('update-log-sheets', lambda prefix, index: client.patch(
+                f'/api/{prefix}update-log-sheets/',
+                {'tripId': log_sheet_ids[index % len(log_sheet_ids)][0], 'logSheets': [
+                    {'uniqueId': log_sheet_ids[index % len(log_sheet_ids)][1], 'currentCycleUsed': str(index % 60)},
+                ]},
+                content_type='application/json')),
+        ]
+
+        for name, request in cases:
+            line = []
+            for label, prefix in (('sync', ''), ('async', 'async/')):
+                trip_cache.clear()
+                rate, statuses = await self.measure(lambda index: request(prefix, index), options)
+                line.append(f"{label} {rate:.0f} req/s {statuses}")
+            self.stdout.write(f"{name}: " + ", ".join(line))
+
+    async def measure(self, request, options):
+        semaphore = asyncio.Semaphore(options['concurrency'])
+        statuses = {}
+
+        async def one(index):
+            async with semaphore:
+                response = await request(index)
+                statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one(index) for index in range(options['requests'])))
+        return options['requests'] / (time.perf_counter() - started), statuses
@@ -0,0 +1,95 @@
+# core/management/commands/load_test_trips.py
+
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from django.core.management.base import BaseCommand
+from django.db import connection, connections
+from django.test import Client
+from core.models import Driver, Trip
+from core.db.backends.postgresql.base import pool_stats
+
+
+class Command(BaseCommand):
+    help = (
+        "Create trips concurrently through create-trip/ and report throughput, "
+        "errors, peak database connections and connection pool metrics. "
+        "Creates a throwaway driver and deletes it (and its trips) afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=50)
+        parser.add_argument('--trips', type=int, default=500)
+        parser.add_argument('--log-sheets', type=int, default=3)
+
+    def server_connections(self):
+        if connection.vendor != 'postgresql':
+            return None
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT count(*) FROM pg_stat_activity WHERE datname = current_database()")
+            return cursor.fetchone()[0]
+
+    def handle(self, *args, **options):
+        suffix = uuid.uuid4().hex[:8]
+        driver = Driver.objects.create(
+            fullName='Load test', username=f"load-{suffix}", email=f"load-{suffix}@example.com", password='load-test',
+        )
+        payload = {
+            'email': driver.email,
+            'tripTitle': 'Load test',
+            'pickup': 'Chicago, IL',
+            'dropoff': 'Denver, CO',
+            'cycleUsed': '10',
+            'logSheets': [
+                {'currentLocation': 'Chicago, IL', 'pickup': 'Chicago, IL', 'dropoff': 'Denver, CO', 'currentCycleUsed': '10'}
+                for _ in range(options['log_sheets'])
+            ],
+        }
+        connection.close()
+
+        statuses = {}
+        latencies = []
+        lock = threading.Lock()
+        peak = {'connections': 0}
+        done = threading.Event()
+
+        def create_trip(_):
+            client = Client()
+            started = time.perf_counter()
+            response = client.post('/api/create-trip/', payload, content_type='application/json')
+            elapsed = time.perf_counter() - started
+            with lock:
+                statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+                latencies.append(elapsed)
+
+        def sample():
+            while not done.wait(0.2):
+                count = self.server_connections()
+                if count is None:
+                    return
+                peak['connections'] = max(peak['connections'], count)
+            connections.close_all()
+
+        sampler = threading.Thread(target=sample, daemon=True)
+        sampler.start()
+        started = time.perf_counter()
+        try:
+            with ThreadPoolExecutor(max_workers=options['concurrency']) as executor:
+                list(executor.map(create_trip, range(options['trips'])))
+        finally:
+            elapsed = time.perf_counter() - started
+            done.set()
+            sampler.join()
+            Trip.objects.filter(driverId=driver).delete()
+            driver.delete()
+
+        latencies.sort()
+        self.stdout.write(f"trips: {options['trips']} at concurrency {options['concurrency']} in {elapsed:.2f}s "
+                          f"({options['trips'] / elapsed:.1f}/s)")
+        self.stdout.write(f"status codes: {statuses}")
+        self.stdout.write(f"latency p50 {latencies[len(latencies) // 2] * 1000:.0f} ms, "
+                          f"p99 {latencies[int(len(latencies) * 0.99) - 1] * 1000:.0f} ms")
+        if peak['connections']:
+            self.stdout.write(f"peak server connections: {peak['connections']}")
+        self.stdout.write(f"pool: {pool_stats() or 'not enabled for this database'}")
@@ -0,0 +1,36 @@
+# core/management/commands/maintain_log_sheet_partitions.py
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.utils import timezone
+from core.db.partitions import add_months, drain_default_partition, ensure_partitions, is_postgres
+from core.models import LogSheet
+
+
+class Command(BaseCommand):
+    help = (
+        "Create core_logsheet's monthly partitions ahead of time and move any rows that "
+        "landed in its DEFAULT partition into proper ones. Run it at least monthly, "
+        "e.g. daily from cron."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--months-ahead', type=int, default=getattr(settings, 'LOG_SHEET_PARTITIONS_AHEAD', 3))
+
+    def handle(self, *args, **options):
+        if not is_postgres(connection):
+            self.stdout.write("Log sheets are only partitioned on Postgres; nothing to do.")
+            return
+
+        table = LogSheet._meta.db_table
+        today = timezone.now().date()
+        created = ensure_partitions(connection, table, today, add_months(today, options['months_ahead']))
+        for name in created:
+            self.stdout.write(f"Created partition {name}")
+
+        moved = drain_default_partition(connection, table, 'createdDate')
+        if moved:
+            self.stdout.write(self.style.WARNING(f"Moved {moved} row(s) out of the DEFAULT partition"))
+
+        self.stdout.write(self.style.SUCCESS(f"{len(created)} partition(s) created"))
@@ -0,0 +1,42 @@
+# core/management/commands/rebuild_hos_totals.py
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from core.models import Driver, LogSheet, DriverDailyHours
+from core.services.hos import attach_duty_totals, record_duty_changes
+from core.services.tripcache import trip_cache
+
+
+class Command(BaseCommand):
+    help = "Recompute every log sheet's dutyTotals and dutyGrid and rebuild the per-driver daily HOS buckets."
+
+    def handle(self, *args, **options):
+        for driver in Driver.objects.iterator():
+            log_sheets = list(
+                LogSheet.objects.filter(tripId__driverId=driver)
+                .order_by('tripId', 'logNumber')
+                .only('uniqueId', 'tripId', 'dropoff', 'coordinates', 'createdDate', 'logNumber')
+            )
+
+            # Fueling stops depend on the distance already driven on each trip.
+            trips = {}
+            for log_sheet in log_sheets:
+                trips.setdefault(log_sheet.tripId_id, []).append(log_sheet)
+            for trip_log_sheets in trips.values():
+                items = [{'coordinates': log_sheet.coordinates, 'dropoff': log_sheet.dropoff} for log_sheet in trip_log_sheets]
+                attach_duty_totals(items)
+                for log_sheet, item in zip(trip_log_sheets, items):
+                    log_sheet.dutyTotals = item['dutyTotals']
+                    log_sheet.dutyGrid = item['dutyGrid']
+
+            with transaction.atomic():
+                LogSheet.objects.bulk_update(log_sheets, ['dutyTotals', 'dutyGrid'], batch_size=500)
+                DriverDailyHours.objects.filter(driverId=driver).delete()
+                record_duty_changes(
+                    driver.uniqueId,
+                    [(log_sheet.createdDate, None, log_sheet.dutyTotals) for log_sheet in log_sheets],
+                )
+                for trip_id in trips:
+                    trip_cache.invalidate(trip_id)
+
+            self.stdout.write(f"{driver.username}: {len(log_sheets)} log sheets")
@@ -0,0 +1,58 @@
+# core/management/commands/scan_hos_violations.py
+
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from rest_framework.utils.encoders import JSONEncoder
+from core.services.hosscan import stale_drivers, scan_fleet
+
+
+class Command(BaseCommand):
+    help = (
+        "Fleet-wide 70-hour/8-day and daily driving window sweep over every active "
+        "driver's log sheets, saving a HosViolationReport per driver. Incremental: "
+        "only drivers with log sheets newer than their last report are scanned. "
+        "Meant to be run nightly, e.g. from cron."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help="Rescan every driver's whole history.")
+        parser.add_argument('--workers', type=int, default=getattr(settings, 'HOS_SCAN_WORKERS', 4),
+                            help="Worker processes (0 scans in this process).")
+        parser.add_argument('--batch-size', type=int, default=getattr(settings, 'HOS_SCAN_BATCH_SIZE', 200),
+                            help="Drivers per query and per worker task.")
+        parser.add_argument('--output', help="Also write every scanned driver's report to this file as NDJSON.")
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        drivers = stale_drivers(options['full'])
+        self.stdout.write(f"Scanning {len(drivers)} driver(s)")
+
+        output = open(options['output'], 'w') if options['output'] else None
+        encoder = JSONEncoder()
+        scanned = flagged = 0
+        try:
+            for report in scan_fleet(drivers, options['workers'], options['batch_size']):
+                scanned += 1
+                if report.violationCount:
+                    flagged += 1
+                    latest = report.violations[-1]
+                    self.stdout.write(self.style.WARNING(
+                        f"{report.driverId_id}: {report.violationCount} violation(s), latest {latest['rule']} "
+                        f"on {latest['date']}, max 8-day total {report.maxCycleHours} h"
+                    ))
+                if output:
+                    output.write(encoder.encode({
+                        'driverId': report.driverId_id,
+                        'scannedThrough': report.scannedThrough,
+                        'violationCount': report.violationCount,
+                        'maxCycleHours': report.maxCycleHours,
+                        'violations': report.violations,
+                    }) + '\n')
+        finally:
+            if output:
+                output.close()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Scanned {scanned} driver(s), {flagged} with violations, in {time.perf_counter() - started:.1f}s"
+        ))
@@ -1 +1,2 @@
-from .referer_middleware import RefererCheckMiddleware
\ No newline at end of file
+from .referer_middleware import RefererCheckMiddleware
+from .metrics_middleware import RequestMetricsMiddleware
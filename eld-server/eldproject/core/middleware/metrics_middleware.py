@@ -0,0 +1,66 @@
+import time
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from core.services.metrics import request_metrics
+
+
+def _view_name(request):
+    match = getattr(request, 'resolver_match', None)
+    return match.view_name if match else 'unresolved'
+
+
+class RequestMetricsMiddleware:
+    """
+    Record latency, query count, DB time and serializer time per view for a
+    sample of requests (see core.services.metrics). Works in both the WSGI
+    and ASGI handlers; put it first in MIDDLEWARE so the latency covers the
+    rest of the stack.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+
+        recorder, token = request_metrics.start()
+        if recorder is None:
+            return self.get_response(request)
+
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            request_metrics.finish(token)
+        duration = time.perf_counter() - started
+
+        view = _view_name(request)
+        request_metrics.observe(view, request.method, response.status_code, recorder, duration)
+        if request_metrics.is_slow(duration):
+            request_metrics.log_slow_request(view, request.method, recorder, duration)
+        return response
+
+    async def __acall__(self, request):
+        recorder, token = request_metrics.start()
+        if recorder is None:
+            return await self.get_response(request)
+
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            request_metrics.finish(token)
+        duration = time.perf_counter() - started
+
+        view = _view_name(request)
+        request_metrics.observe(view, request.method, response.status_code, recorder, duration)
+        if request_metrics.is_slow(duration):
+            # Sync views ran their queries on the thread-sensitive executor; EXPLAIN there too.
+            await sync_to_async(request_metrics.log_slow_request)(view, request.method, recorder, duration)
+        return response
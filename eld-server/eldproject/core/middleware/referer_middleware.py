@@ -1,11 +1,22 @@
+import asyncio
 from django.http import HttpResponseForbidden
 from django.conf import settings
 
+def _referer_allowed(request):
+    allowed_origins = getattr(settings, 'CORS_ALLOWED_ORIGINS', [])
+    referer = request.META.get('HTTP_REFERER', '')
+    return bool(referer) and any(referer.startswith(origin) for origin in allowed_origins)
+
 def referer_check(view_func):
+    if asyncio.iscoroutinefunction(view_func):
+        async def async_wrapper(self, request, *args, **kwargs):
+            if _referer_allowed(request):
+                return await view_func(self, request, *args, **kwargs)
+            return HttpResponseForbidden("Forbidden")
+        return async_wrapper
+
     def wrapper(self, request, *args, **kwargs):
-        allowed_origins = getattr(settings, 'CORS_ALLOWED_ORIGINS', [])
-        referer = request.META.get('HTTP_REFERER', '')
-        if referer and any(referer.startswith(origin) for origin in allowed_origins):
+        if _referer_allowed(request):
             return view_func(self, request, *args, **kwargs)
         return HttpResponseForbidden("Forbidden")
     return wrapper
@@ -0,0 +1,37 @@
+# Generated by Django 4.2.20 on 2026-10-18 16:45
+
+from django.db import migrations, models
+from django.db.models import Max
+
+
+SEQUENCES = (
+    ('accountNumber', 'Driver'),
+    ('tripNumber', 'Trip'),
+    ('logNumber', 'LogSheet'),
+)
+
+
+def seed_sequences(apps, schema_editor):
+    Sequence = apps.get_model('core', 'Sequence')
+    for name, model_name in SEQUENCES:
+        model = apps.get_model('core', model_name)
+        last_value = model.objects.aggregate(last=Max(name))['last'] or 0
+        Sequence.objects.update_or_create(name=name, defaults={'lastValue': last_value})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_delete_refreshtoken'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Sequence',
+            fields=[
+                ('name', models.CharField(max_length=50, primary_key=True, serialize=False)),
+                ('lastValue', models.PositiveBigIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(seed_sequences, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.20 on 2026-10-18 16:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_sequence'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='trip',
+            index=models.Index(fields=['driverId', 'createdDate', 'tripNumber'], name='trip_driver_created_idx'),
+        ),
+    ]
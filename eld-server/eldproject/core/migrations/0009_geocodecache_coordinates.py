@@ -0,0 +1,34 @@
+# Generated by Django 4.2.20 on 2026-10-18 16:48
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_trip_driver_created_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GeocodeCache',
+            fields=[
+                ('query', models.CharField(max_length=255, primary_key=True, serialize=False)),
+                ('lat', models.FloatField(null=True)),
+                ('lon', models.FloatField(null=True)),
+                ('resolvedDate', models.DateTimeField(default=django.utils.timezone.now)),
+                ('lastUsedDate', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='logsheet',
+            name='coordinates',
+            field=models.JSONField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='trip',
+            name='coordinates',
+            field=models.JSONField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 4.2.20 on 2026-10-18 16:49
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_geocodecache_coordinates'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RouteCache',
+            fields=[
+                ('key', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('distance', models.FloatField()),
+                ('duration', models.FloatField()),
+                ('polyline', models.TextField(blank=True)),
+                ('resolvedDate', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 4.2.20 on 2026-10-18 16:51
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_routecache'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='logsheet',
+            name='dutyTotals',
+            field=models.JSONField(blank=True, null=True),
+        ),
+        migrations.CreateModel(
+            name='DriverDailyHours',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('cycleHours', models.FloatField(default=0)),
+                ('drivingHours', models.FloatField(default=0)),
+                ('driverId', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='dailyHours', to='core.driver')),
+            ],
+            options={
+                'unique_together': {('driverId', 'date')},
+            },
+        ),
+    ]
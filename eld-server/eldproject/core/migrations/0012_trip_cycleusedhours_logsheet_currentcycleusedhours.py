@@ -0,0 +1,23 @@
+# Generated by Django 4.2.20 on 2026-10-18 17:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_driverdailyhours_logsheet_dutytotals'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='trip',
+            name='cycleUsedHours',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=6, null=True),
+        ),
+        migrations.AddField(
+            model_name='logsheet',
+            name='currentCycleUsedHours',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=6, null=True),
+        ),
+    ]
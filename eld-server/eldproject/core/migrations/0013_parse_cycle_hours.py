@@ -0,0 +1,47 @@
+# Generated by Django 4.2.20 on 2026-10-18 17:05
+
+import re
+from decimal import Decimal, ROUND_HALF_UP
+from django.db import migrations
+
+
+NUMBER_PATTERN = re.compile(r'-?\d+(?:\.\d+)?')
+BATCH_SIZE = 1000
+
+
+def parse_hours(value):
+    match = NUMBER_PATTERN.search(value or '')
+    if not match:
+        return None
+    hours = Decimal(match.group()).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+    # Anything negative or too large for max_digits=6 is not a real hour count
+    # (and CycleHoursField refuses it).
+    return hours if 0 <= hours < 10000 else None
+
+
+def backfill(model, source, target):
+    batch = []
+    for row in model.objects.only('pk', source).iterator(chunk_size=BATCH_SIZE):
+        setattr(row, target, parse_hours(getattr(row, source)))
+        batch.append(row)
+        if len(batch) == BATCH_SIZE:
+            model.objects.bulk_update(batch, [target])
+            batch = []
+    if batch:
+        model.objects.bulk_update(batch, [target])
+
+
+def parse_cycle_hours(apps, schema_editor):
+    backfill(apps.get_model('core', 'Trip'), 'cycleUsed', 'cycleUsedHours')
+    backfill(apps.get_model('core', 'LogSheet'), 'currentCycleUsed', 'currentCycleUsedHours')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_trip_cycleusedhours_logsheet_currentcycleusedhours'),
+    ]
+
+    operations = [
+        migrations.RunPython(parse_cycle_hours, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 4.2.20 on 2026-10-18 17:05
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_parse_cycle_hours'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='trip',
+            name='cycleUsed',
+        ),
+        migrations.RemoveField(
+            model_name='logsheet',
+            name='currentCycleUsed',
+        ),
+        migrations.RenameField(
+            model_name='trip',
+            old_name='cycleUsedHours',
+            new_name='cycleUsed',
+        ),
+        migrations.RenameField(
+            model_name='logsheet',
+            old_name='currentCycleUsedHours',
+            new_name='currentCycleUsed',
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.20 on 2026-10-18 17:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0014_cycle_hours_decimal'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='logsheet',
+            name='dutyGrid',
+            field=models.JSONField(blank=True, null=True),
+        ),
+    ]
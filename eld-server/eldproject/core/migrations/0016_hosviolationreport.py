@@ -0,0 +1,27 @@
+# Generated by Django 4.2.20 on 2026-10-18 17:18
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0015_logsheet_dutygrid'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HosViolationReport',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scannedThrough', models.DateTimeField()),
+                ('violations', models.JSONField(default=list)),
+                ('violationCount', models.PositiveIntegerField(default=0)),
+                ('maxCycleHours', models.FloatField(default=0)),
+                ('scannedAt', models.DateTimeField(default=django.utils.timezone.now)),
+                ('driverId', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='hosReport', to='core.driver')),
+            ],
+        ),
+    ]
@@ -0,0 +1,85 @@
+# Generated by Django 4.2.20 on 2026-10-18 17:21
+
+from django.db import migrations, models
+import django.utils.timezone
+from core.db.partitions import create_partitioned_model
+
+
+def create_archive_tables(apps, schema_editor):
+    # Partitioned by year of createdDate on Postgres; archive_trips adds the partitions.
+    for name in ('ArchivedTrip', 'ArchivedLogSheet'):
+        create_partitioned_model(schema_editor, apps.get_model('core', name), 'createdDate')
+
+
+def drop_archive_tables(apps, schema_editor):
+    for name in ('ArchivedTrip', 'ArchivedLogSheet'):
+        schema_editor.delete_model(apps.get_model('core', name))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0016_hosviolationreport'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='logsheet',
+            name='isDeleted',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='trip',
+            name='deletedDate',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='trip',
+            name='isDeleted',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name='ArchivedTrip',
+                    fields=[
+                        ('uniqueId', models.UUIDField(editable=False, primary_key=True, serialize=False)),
+                        ('driverId', models.UUIDField()),
+                        ('tripTitle', models.CharField(max_length=255)),
+                        ('pickup', models.CharField(max_length=150, null=True)),
+                        ('dropoff', models.CharField(max_length=150, null=True)),
+                        ('cycleUsed', models.DecimalField(blank=True, decimal_places=2, max_digits=6, null=True)),
+                        ('instructions', models.TextField(blank=True, null=True)),
+                        ('coordinates', models.JSONField(blank=True, null=True)),
+                        ('createdDate', models.DateTimeField()),
+                        ('tripNumber', models.PositiveIntegerField(blank=True, null=True)),
+                        ('isDeleted', models.BooleanField(default=False)),
+                        ('deletedDate', models.DateTimeField(blank=True, null=True)),
+                        ('archivedDate', models.DateTimeField(default=django.utils.timezone.now)),
+                    ],
+                    options={
+                        'indexes': [models.Index(fields=['driverId', 'createdDate'], name='archivedtrip_driver_idx')],
+                    },
+                ),
+                migrations.CreateModel(
+                    name='ArchivedLogSheet',
+                    fields=[
+                        ('uniqueId', models.UUIDField(editable=False, primary_key=True, serialize=False)),
+                        ('tripId', models.UUIDField(db_index=True)),
+                        ('currentLocation', models.CharField(max_length=255)),
+                        ('pickup', models.CharField(max_length=150, null=True)),
+                        ('dropoff', models.CharField(max_length=150, null=True)),
+                        ('currentCycleUsed', models.DecimalField(blank=True, decimal_places=2, max_digits=6, null=True)),
+                        ('coordinates', models.JSONField(blank=True, null=True)),
+                        ('dutyTotals', models.JSONField(blank=True, null=True)),
+                        ('dutyGrid', models.JSONField(blank=True, null=True)),
+                        ('createdDate', models.DateTimeField()),
+                        ('logNumber', models.PositiveIntegerField(blank=True, null=True)),
+                        ('isDeleted', models.BooleanField(default=False)),
+                        ('archivedDate', models.DateTimeField(default=django.utils.timezone.now)),
+                    ],
+                ),
+            ],
+        ),
+        migrations.RunPython(create_archive_tables, drop_archive_tables),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 4.2.20 on 2026-10-18 17:24
+
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+from core.db.partitions import (
+    add_months, create_model_indexes, create_partitioned_table, ensure_partitions, is_postgres,
+)
+
+
+def partition_log_sheets(apps, schema_editor):
+    """
+    Rebuild core_logsheet as a table range-partitioned by month of
+    createdDate (Postgres only). The rows are copied in this migration's
+    transaction, so the table is locked for as long as the copy takes.
+    """
+
+    connection = schema_editor.connection
+    if not is_postgres(connection):
+        return
+
+    LogSheet = apps.get_model('core', 'LogSheet')
+    table = LogSheet._meta.db_table
+    old_table = f"{table}_unpartitioned"
+    quote = schema_editor.quote_name
+
+    # Free the names the new table and its primary key need; the old indexes go with the old table.
+    schema_editor.execute(f"ALTER TABLE {quote(table)} RENAME TO {quote(old_table)}")
+    schema_editor.execute(f"ALTER TABLE {quote(old_table)} RENAME CONSTRAINT {quote(f'{table}_pkey')} TO {quote(f'{old_table}_pkey')}")
+    create_partitioned_table(schema_editor, LogSheet, 'createdDate')
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT min({quote('createdDate')}) FROM {quote(old_table)}")
+        oldest, = cursor.fetchone()
+    today = timezone.now().date()
+    ahead = add_months(today, getattr(settings, 'LOG_SHEET_PARTITIONS_AHEAD', 3))
+    ensure_partitions(connection, table, oldest.date() if oldest else today, ahead)
+
+    columns = ', '.join(quote(field.column) for field in LogSheet._meta.local_fields)
+    schema_editor.execute(f"INSERT INTO {quote(table)} ({columns}) SELECT {columns} FROM {quote(old_table)}")
+    schema_editor.execute(f"DROP TABLE {quote(old_table)}")
+    create_model_indexes(schema_editor, LogSheet)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0017_soft_delete_and_archive'),
+    ]
+
+    operations = [
+        # Not reversible: going back would mean copying every row into a plain table again.
+        migrations.RunPython(partition_log_sheets),
+        migrations.AddIndex(
+            model_name='logsheet',
+            index=models.Index(fields=['tripId', 'createdDate'], name='logsheet_trip_created_idx'),
+        ),
+    ]
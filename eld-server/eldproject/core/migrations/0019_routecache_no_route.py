@@ -0,0 +1,30 @@
+# Generated by Django 4.2.20 on 2026-10-18 17:50
+
+from django.db import migrations, models
+
+
+def null_no_route_legs(apps, schema_editor):
+    # "No route" used to be stored as a zero-length leg.
+    RouteCache = apps.get_model('core', 'RouteCache')
+    RouteCache.objects.filter(distance=0, duration=0, polyline='').update(distance=None, duration=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0018_partition_logsheet'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='routecache',
+            name='distance',
+            field=models.FloatField(null=True),
+        ),
+        migrations.AlterField(
+            model_name='routecache',
+            name='duration',
+            field=models.FloatField(null=True),
+        ),
+        migrations.RunPython(null_no_route_legs, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.20 on 2026-10-18 18:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0019_routecache_no_route'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='driver',
+            name='isStaff',
+            field=models.BooleanField(default=False),
+        ),
+    ]
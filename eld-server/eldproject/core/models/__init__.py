@@ -3,6 +3,13 @@
 from .driver import Driver
 from .trip import Trip
 from .logSheet import LogSheet
+from .sequence import Sequence
+from .geocodeCache import GeocodeCache
+from .routeCache import RouteCache
+from .driverDailyHours import DriverDailyHours
 
 
 
+from .hosViolationReport import HosViolationReport
+from .archivedTrip import ArchivedTrip
+from .archivedLogSheet import ArchivedLogSheet
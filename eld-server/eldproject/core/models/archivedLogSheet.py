@@ -0,0 +1,29 @@
+# core/models/archivedLogSheet.py
+
+from django.utils.timezone import now
+from django.db import models
+
+class ArchivedLogSheet(models.Model):
+    """
+    A log sheet moved out of core_logsheet with its trip by archive_trips.
+    On Postgres the table is range-partitioned by year of createdDate.
+    """
+
+    uniqueId = models.UUIDField(primary_key=True, editable=False)
+
+    tripId = models.UUIDField(db_index=True)
+    currentLocation = models.CharField(max_length=255)
+    pickup = models.CharField(max_length=150, null=True)
+    dropoff = models.CharField(max_length=150, null=True)
+    currentCycleUsed = models.DecimalField(max_digits=6, decimal_places=2, blank=True, null=True)
+    coordinates = models.JSONField(blank=True, null=True)
+    dutyTotals = models.JSONField(blank=True, null=True)
+    dutyGrid = models.JSONField(blank=True, null=True)
+
+    createdDate = models.DateTimeField()
+    logNumber = models.PositiveIntegerField(blank=True, null=True)
+    isDeleted = models.BooleanField(default=False)
+    archivedDate = models.DateTimeField(default=now)
+
+    def __str__(self):
+        return f"{self.tripId} - {self.currentLocation} (archived)"
@@ -0,0 +1,35 @@
+# core/models/archivedTrip.py
+
+from django.utils.timezone import now
+from django.db import models
+
+class ArchivedTrip(models.Model):
+    """
+    A trip moved out of core_trip by archive_trips, with the same columns.
+    On Postgres the table is range-partitioned by year of createdDate.
+    """
+
+    uniqueId = models.UUIDField(primary_key=True, editable=False)
+
+    # Plain ids: archived rows must not hold up (or follow) changes to the live tables.
+    driverId = models.UUIDField()
+    tripTitle = models.CharField(max_length=255)
+    pickup = models.CharField(max_length=150, null=True)
+    dropoff = models.CharField(max_length=150, null=True)
+    cycleUsed = models.DecimalField(max_digits=6, decimal_places=2, blank=True, null=True)
+    instructions = models.TextField(blank=True, null=True)
+    coordinates = models.JSONField(blank=True, null=True)
+
+    createdDate = models.DateTimeField()
+    tripNumber = models.PositiveIntegerField(blank=True, null=True)
+    isDeleted = models.BooleanField(default=False)
+    deletedDate = models.DateTimeField(blank=True, null=True)
+    archivedDate = models.DateTimeField(default=now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['driverId', 'createdDate'], name='archivedtrip_driver_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.driverId} - {self.tripTitle} (archived)"
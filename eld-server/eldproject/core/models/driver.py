@@ -1,9 +1,9 @@
 # core/models/driver.py
 
-import bcrypt
 import uuid
 from django.utils.timezone import now
 from django.db import models
+from core.services.passwords import password_hasher
 
 class Driver(models.Model):
 
@@ -21,6 +21,8 @@ class Driver(models.Model):
 
     isActive = models.BooleanField(default=True)
     isDeleted = models.BooleanField(default=False)
+    # Set in the admin only; grants fleet-wide exports.
+    isStaff = models.BooleanField(default=False)
 
     createdDate = models.DateTimeField(default=now, editable=False)
     accountNumber = models.PositiveIntegerField(blank=True, null=True)
@@ -32,8 +34,7 @@ class Driver(models.Model):
         """
 
         if not self.password.startswith('$2b$'):
-            hashed = bcrypt.hashpw(self.password.encode('utf-8'), bcrypt.gensalt())
-            self.password = hashed.decode('utf-8')
+            self.password = password_hasher.hash(self.password)
         super().save(*args, **kwargs)
 
     def __str__(self):
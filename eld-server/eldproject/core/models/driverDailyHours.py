@@ -0,0 +1,22 @@
+# core/models/driverDailyHours.py
+
+from django.db import models
+from core.models.driver import Driver
+
+class DriverDailyHours(models.Model):
+    """
+    Running duty totals of one driver for one day, kept up to date as log
+    sheets are written so HOS checks never rescan the sheets themselves.
+    """
+
+    driverId = models.ForeignKey(Driver, on_delete=models.CASCADE, related_name='dailyHours')
+    date = models.DateField()
+
+    cycleHours = models.FloatField(default=0)
+    drivingHours = models.FloatField(default=0)
+
+    class Meta:
+        unique_together = ('driverId', 'date')
+
+    def __str__(self):
+        return f"{self.driverId.username} - {self.date}"
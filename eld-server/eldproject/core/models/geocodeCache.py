@@ -0,0 +1,19 @@
+# core/models/geocodeCache.py
+
+from django.utils.timezone import now
+from django.db import models
+
+class GeocodeCache(models.Model):
+
+    # Normalized location string, see core.services.geocoding.normalize_location
+    query = models.CharField(max_length=255, primary_key=True)
+
+    # Both are null when the provider had no match for the query.
+    lat = models.FloatField(null=True)
+    lon = models.FloatField(null=True)
+
+    resolvedDate = models.DateTimeField(default=now)
+    lastUsedDate = models.DateTimeField(default=now, db_index=True)
+
+    def __str__(self):
+        return self.query
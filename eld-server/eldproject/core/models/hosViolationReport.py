@@ -0,0 +1,25 @@
+# core/models/hosViolationReport.py
+
+from django.utils.timezone import now
+from django.db import models
+from core.models.driver import Driver
+
+class HosViolationReport(models.Model):
+    """
+    Latest compliance sweep result for one driver (see the
+    scan_hos_violations command). scannedThrough is the newest log sheet
+    the sweep has seen: later sweeps skip the driver until a newer one exists.
+    """
+
+    driverId = models.OneToOneField(Driver, on_delete=models.CASCADE, related_name='hosReport')
+    scannedThrough = models.DateTimeField()
+
+    # [{'date', 'rule', 'hours'}, ...] from core.services.hos.hos_violations, oldest first.
+    violations = models.JSONField(default=list)
+    violationCount = models.PositiveIntegerField(default=0)
+    maxCycleHours = models.FloatField(default=0)
+
+    scannedAt = models.DateTimeField(default=now)
+
+    def __str__(self):
+        return f"{self.driverId.username} - {self.violationCount} violations"
@@ -4,6 +4,7 @@ import uuid
 from django.utils.timezone import now
 from django.db import models
 from core.models.trip import Trip
+from core.models.managers import SoftDeleteManager
 
 class LogSheet(models.Model):
 
@@ -17,10 +18,34 @@ class LogSheet(models.Model):
     currentLocation = models.CharField(max_length=255)
     pickup = models.CharField(max_length=150, null=True)
     dropoff = models.CharField(max_length=150, null=True)
-    currentCycleUsed = models.CharField(blank=True, null=True)
+    currentCycleUsed = models.DecimalField(max_digits=6, decimal_places=2, blank=True, null=True)
+
+    # Resolved {lat, lon} per location field, filled in at write time.
+    coordinates = models.JSONField(blank=True, null=True)
+
+    # Duty-status totals computed by core.services.hos when the sheet is written.
+    dutyTotals = models.JSONField(blank=True, null=True)
+
+    # The day's duty-status timeline from core.services.hos.compute_duty_grid:
+    # run-length encoded [status, slots, ...] over 96 15-minute slots.
+    dutyGrid = models.JSONField(blank=True, null=True)
 
     createdDate = models.DateTimeField(default=now, editable=False)
     logNumber = models.PositiveIntegerField(blank=True, null=True)
 
+    # Set together with its trip's (see Trip.soft_delete).
+    isDeleted = models.BooleanField(default=False)
+
+    objects = SoftDeleteManager()
+    allObjects = models.Manager()
+
+    class Meta:
+        # On Postgres the table is range-partitioned by month of createdDate
+        # (migration 0018, maintain_log_sheet_partitions); filter on
+        # createdDate, e.g. through Trip.log_sheets(), to read fewer partitions.
+        indexes = [
+            models.Index(fields=['tripId', 'createdDate'], name='logsheet_trip_created_idx'),
+        ]
+
     def __str__(self):
         return f"{self.tripId.tripTitle} - {self.currentLocation}"
@@ -0,0 +1,12 @@
+# core/models/managers.py
+
+from django.db import models
+
+class SoftDeleteManager(models.Manager):
+    """
+    Default manager of soft-deletable models: leaves out rows with
+    isDeleted set. Their `allObjects` manager still sees everything.
+    """
+
+    def get_queryset(self):
+        return super().get_queryset().filter(isDeleted=False)
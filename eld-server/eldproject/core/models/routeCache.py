@@ -0,0 +1,19 @@
+# core/models/routeCache.py
+
+from django.utils.timezone import now
+from django.db import models
+
+class RouteCache(models.Model):
+
+    # sha256 of the rounded (origin, destination) pair, see core.services.routing.route_key
+    key = models.CharField(max_length=64, primary_key=True)
+
+    # Both null when there is no road between the endpoints.
+    distance = models.FloatField(null=True)  # km
+    duration = models.FloatField(null=True)  # hours
+    polyline = models.TextField(blank=True)
+
+    resolvedDate = models.DateTimeField(default=now)
+
+    def __str__(self):
+        return self.key
@@ -0,0 +1,94 @@
+# core/models/sequence.py
+
+import threading
+from django.conf import settings
+from django.db import models, transaction
+
+
+class SequenceManager(models.Manager):
+    """
+    Hands out numbers for accountNumber, tripNumber and logNumber from a
+    counter row instead of scanning the numbered table on every insert.
+
+    Numbers are reserved in blocks (settings.SEQUENCE_BLOCK_SIZES), each in
+    its own short transaction, and served from this process until the block
+    runs out, so the counter row is locked once per block rather than for
+    the length of every insert. Callers take their numbers before opening
+    their own transaction. Numbers a process never uses (it restarted, or
+    the insert they were taken for failed) are left as gaps.
+    """
+
+    _lock = threading.Lock()
+    _name_locks = {}
+    _blocks = {}
+
+    def block_size(self, name):
+        return max(1, int(getattr(settings, 'SEQUENCE_BLOCK_SIZES', {}).get(name, 1)))
+
+    def reserve(self, name, count=1):
+        """
+        Reserve `count` consecutive numbers straight from the counter row
+        and return the first one. The counter row stays locked until the
+        transaction ends: call it outside any transaction so that is right
+        away.
+        """
+
+        with transaction.atomic():
+            sequence, _ = self.select_for_update().get_or_create(name=name)
+            first = sequence.lastValue + 1
+            sequence.lastValue += count
+            sequence.save(update_fields=['lastValue'])
+        return first
+
+    def _name_lock(self, name):
+        with self._lock:
+            return self._name_locks.setdefault(name, threading.Lock())
+
+    def take(self, name, count):
+        """
+        Return `count` ascending numbers for `name`, served from this
+        process' block and reserving new blocks as needed. Threads share the
+        block, so numbers stay gap-free within a process.
+        """
+
+        numbers = []
+        if count < 1:
+            return numbers
+        with self._name_lock(name):
+            while len(numbers) < count:
+                block = self._blocks.get(name)
+                if not block or block[0] > block[1]:
+                    if transaction.get_connection().in_atomic_block:
+                        # A rollback would hand a cached block out twice; take exactly what is needed.
+                        first = self.reserve(name, count - len(numbers))
+                        numbers.extend(range(first, first + count - len(numbers)))
+                        break
+                    size = max(self.block_size(name), count - len(numbers))
+                    first = self.reserve(name, size)
+                    block = self._blocks[name] = [first, first + size - 1]
+                taken = min(count - len(numbers), block[1] - block[0] + 1)
+                numbers.extend(range(block[0], block[0] + taken))
+                block[0] += taken
+        return numbers
+
+    def next_value(self, name):
+        """Return the next number for `name`; see take()."""
+
+        return self.take(name, 1)[0]
+
+    def forget_blocks(self):
+        """Drop the numbers reserved by this process, e.g. after a test reset the counters."""
+
+        with self._lock:
+            self._blocks.clear()
+
+
+class Sequence(models.Model):
+
+    name = models.CharField(max_length=50, primary_key=True)
+    lastValue = models.PositiveBigIntegerField(default=0)
+
+    objects = SequenceManager()
+
+    def __str__(self):
+        return f"{self.name} - {self.lastValue}"
@@ -4,6 +4,7 @@ import uuid
 from django.utils.timezone import now
 from django.db import models
 from core.models.driver import Driver
+from core.models.managers import SoftDeleteManager
 
 class Trip(models.Model):
 
@@ -17,12 +18,46 @@ class Trip(models.Model):
     tripTitle = models.CharField(max_length=255)
     pickup = models.CharField(max_length=150, null=True)
     dropoff = models.CharField(max_length=150, null=True)
-    cycleUsed = models.CharField(max_length=150, null=True)
+    cycleUsed = models.DecimalField(max_digits=6, decimal_places=2, blank=True, null=True)
     instructions = models.TextField(blank=True, null=True)
 
+    # Resolved {lat, lon} per location field, filled in at write time.
+    coordinates = models.JSONField(blank=True, null=True)
+
     createdDate = models.DateTimeField(default=now, editable=False)
     tripNumber = models.PositiveIntegerField(blank=True, null=True)
 
+    # Deleted trips are only hidden; archive_trips moves them out of this table later.
+    isDeleted = models.BooleanField(default=False)
+    deletedDate = models.DateTimeField(blank=True, null=True)
+
+    objects = SoftDeleteManager()
+    allObjects = models.Manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['driverId', 'createdDate', 'tripNumber'], name='trip_driver_created_idx'),
+        ]
+
+    def log_sheets(self):
+        """
+        The trip's log sheets. None is older than the trip, and saying so
+        lets Postgres skip every monthly partition of core_logsheet before it.
+        """
+
+        return self.logSheets.filter(createdDate__gte=self.createdDate)
+
+    def soft_delete(self):
+        """
+        Hide the trip and its log sheets with two UPDATEs, however many
+        sheets it has, instead of deleting them.
+        """
+
+        self.isDeleted = True
+        self.deletedDate = now()
+        Trip.allObjects.filter(pk=self.pk).update(isDeleted=True, deletedDate=self.deletedDate)
+        self.log_sheets().update(isDeleted=True)
+
     def __str__(self):
         return f"{self.driverId.username} - {self.tripTitle}"
 
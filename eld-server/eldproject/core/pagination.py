@@ -0,0 +1,16 @@
+# core/pagination.py
+
+from django.conf import settings
+from rest_framework.pagination import CursorPagination
+
+
+class DriverTripsPagination(CursorPagination):
+    """
+    Keyset pagination over a driver's trips, newest first. Backed by the
+    (driverId, createdDate, tripNumber) index on Trip.
+    """
+
+    ordering = ('-createdDate', '-tripNumber')
+    page_size = getattr(settings, 'DRIVER_TRIPS_PAGE_SIZE', 50)
+    page_size_query_param = 'limit'
+    max_page_size = getattr(settings, 'DRIVER_TRIPS_MAX_PAGE_SIZE', 200)
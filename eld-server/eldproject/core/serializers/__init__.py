@@ -2,3 +2,4 @@ from core.serializers.driverSerializers import VerifyTokenSerializer, DriverSeri
 from core.serializers.tripSerializers import TripSerializer, GetDriverTripsSerializer, GetTripDataSerializer
 
 
+from core.serializers.fastSerializers import serialize_driver_trips, serialize_trip_data
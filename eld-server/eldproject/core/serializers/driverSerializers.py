@@ -1,9 +1,13 @@
 from rest_framework import serializers
 from core.models.driver import Driver
+from core.models.sequence import Sequence
 from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.http import Http404
 from django.shortcuts import get_object_or_404
+from core.services.auth import driver_cache
+from core.services.passwords import password_hasher
 import jwt
-import bcrypt
 
 
 class VerifyTokenSerializer(serializers.Serializer):
@@ -30,7 +34,14 @@ class VerifyTokenSerializer(serializers.Serializer):
         if not email:
             raise serializers.ValidationError({"error": "Invalid token payload"})
 
-        driver = get_object_or_404(Driver, email=email)
+        unique_id = decoded.get("uniqueId")
+        if unique_id:
+            try:
+                driver = driver_cache.get(unique_id, email)
+            except (Driver.DoesNotExist, ValueError, DjangoValidationError):
+                raise Http404("No Driver matches the given query.")
+        else:
+            driver = get_object_or_404(Driver, email=email)
 
         if driver.isDeleted:
             raise serializers.ValidationError({"error": "User not found"})
@@ -56,8 +67,7 @@ class DriverSerializer(serializers.ModelSerializer):
         }
 
     def create(self, validated_data):
-        last_driver = Driver.objects.order_by('-accountNumber').first()
-        validated_data['accountNumber'] = (last_driver.accountNumber + 1) if last_driver else 1
+        validated_data['accountNumber'] = Sequence.objects.next_value('accountNumber')
 
         return super().create(validated_data)
 
@@ -67,25 +77,27 @@ class LoginSerializer(serializers.Serializer):
     email = serializers.EmailField()
     password = serializers.CharField(write_only=True)
 
-    def validate(self, data):
+    async def aauthenticate(self):
         """
-        Custom validation to check driver credentials.
+        Check the validated credentials and return the driver. Async so the
+        bcrypt check runs on the hashing pool without holding a request
+        thread. Raises ValidationError, or PasswordHashingBusy.
         """
-        email = data.get("email")
-        password = data.get("password")
-
-        try:
-            driver = Driver.objects.get(email=email)
-        except Driver.DoesNotExist:
-            raise serializers.ValidationError({"error": "User not found"})
+        email = self.validated_data["email"]
+        password = self.validated_data["password"]
 
-        if driver.isDeleted:
+        driver = await Driver.objects.filter(email=email).afirst()
+        if driver is None or driver.isDeleted:
             raise serializers.ValidationError({"error": "User not found"})
         if not driver.isActive:
             raise serializers.ValidationError({"error": "User account is inactive"})
 
-        if not bcrypt.checkpw(password.encode('utf-8'), driver.password.encode('utf-8')):
+        if not await password_hasher.acheck(password, driver.password):
             raise serializers.ValidationError({"error": "Invalid password"})
 
-        data["driver"] = driver
-        return data
+        # Re-hash with the current work factor while we still have the plain password.
+        if password_hasher.needs_upgrade(driver.password):
+            driver.password = await password_hasher.ahash(password)
+            await driver.asave(update_fields=['password'])
+
+        return driver
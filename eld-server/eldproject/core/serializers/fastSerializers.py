@@ -0,0 +1,167 @@
+import decimal
+from functools import lru_cache
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.utils import timezone
+from rest_framework import serializers, ISO_8601
+from rest_framework.settings import api_settings
+from django.http import Http404
+from django.shortcuts import get_object_or_404
+from core.models.trip import Trip
+from core.models.logSheet import LogSheet
+from core.serializers.tripSerializers import GetDriverTripsSerializer, GetLogSheetSerializer, GetTripDataSerializer, attach_route_legs
+from core.services.metrics import serializer_timer
+
+
+# Fields whose representation is the database value itself.
+PASSTHROUGH_FIELDS = (serializers.CharField, serializers.IntegerField, serializers.BooleanField, serializers.JSONField)
+
+
+def _datetime_converter(field, current_timezone):
+    # DateTimeField.to_representation with the active timezone looked up once per batch.
+    if getattr(field, 'format', api_settings.DATETIME_FORMAT) != ISO_8601 or hasattr(field, 'timezone') or current_timezone is None:
+        return field.to_representation
+
+    def convert(value):
+        if value.tzinfo is None:
+            return field.to_representation(value)
+        value = value.astimezone(current_timezone).isoformat()
+        return value[:-6] + 'Z' if value.endswith('+00:00') else value
+    return convert
+
+
+def _decimal_converter(field):
+    # DecimalField.to_representation with the quantize exponent and context built once.
+    coerce_to_string = getattr(field, 'coerce_to_string', api_settings.COERCE_DECIMAL_TO_STRING)
+    if not coerce_to_string or field.localize or field.normalize_output or field.decimal_places is None:
+        return field.to_representation
+
+    exponent = decimal.Decimal('.1') ** field.decimal_places
+    context = decimal.getcontext().copy()
+    if field.max_digits is not None:
+        context.prec = field.max_digits
+
+    def convert(value):
+        if not isinstance(value, decimal.Decimal):
+            value = decimal.Decimal(str(value).strip())
+        return '{:f}'.format(value.quantize(exponent, rounding=field.rounding, context=context))
+    return convert
+
+
+class FieldPlan:
+    """
+    Read-only rendering plan precomputed from a DRF serializer: the .values()
+    columns to select and one converter per output field. Rows become dicts
+    directly, without model instances or per-row field binding, and match the
+    serializer's output. Nested serializers are left to the caller.
+    """
+
+    def __init__(self, serializer_class, fields=()):
+        self.fields = [
+            (name, field)
+            for name, field in serializer_class().fields.items()
+            if not (fields and name not in fields) and not isinstance(field, serializers.BaseSerializer)
+        ]
+        self.columns = [field.source for _, field in self.fields]
+        self._decimals = {
+            name: _decimal_converter(field)
+            for name, field in self.fields if isinstance(field, serializers.DecimalField)
+        }
+
+    def _converter(self, name, field, current_timezone):
+        if isinstance(field, serializers.UUIDField) and field.uuid_format == 'hex_verbose':
+            return str
+        if isinstance(field, PASSTHROUGH_FIELDS):
+            return None
+        if isinstance(field, serializers.DateTimeField):
+            return _datetime_converter(field, current_timezone)
+        return self._decimals.get(name, field.to_representation)
+
+    def bind(self, prefix=''):
+        """
+        (name, row key, converter) triples with the active timezone resolved,
+        for rows whose columns carry `prefix` (e.g. from a join).
+        """
+
+        current_timezone = timezone.get_current_timezone() if settings.USE_TZ else None
+        return [
+            (name, prefix + field.source, self._converter(name, field, current_timezone))
+            for name, field in self.fields
+        ]
+
+    def iter_render(self, rows):
+        plan = self.bind()
+        for row in rows:
+            yield render_row(row, plan)
+
+    def render(self, rows):
+        with serializer_timer():
+            return list(self.iter_render(rows))
+
+
+def render_row(row, plan):
+    data = {}
+    for name, key, convert in plan:
+        value = row[key]
+        data[name] = value if value is None or convert is None else convert(value)
+    return data
+
+
+@lru_cache(maxsize=None)
+def field_plan(serializer_class, fields=()):
+    return FieldPlan(serializer_class, fields)
+
+
+def driver_trips_values(queryset, fields=None):
+    """
+    The .values() form of a driver's trips queryset, selecting what
+    serialize_driver_trips needs plus the DriverTripsPagination cursor columns.
+    """
+
+    plan = field_plan(GetDriverTripsSerializer, tuple(fields or ()))
+    return queryset.values(*dict.fromkeys(plan.columns + ['createdDate', 'tripNumber']))
+
+
+def serialize_driver_trips(rows, fields=None):
+    """Same output as GetDriverTripsSerializer(trips, many=True, fields=fields).data."""
+
+    plan = field_plan(GetDriverTripsSerializer, tuple(fields or ()))
+    return plan.render(rows)
+
+
+def serialize_trip_data(trip_id):
+    """Same output as GetTripDataSerializer(trip).data. Raises Http404."""
+
+    trip_plan = field_plan(GetTripDataSerializer)
+    log_sheet_plan = field_plan(GetLogSheetSerializer)
+
+    row = get_object_or_404(Trip.objects.values(*trip_plan.columns), uniqueId=trip_id)
+    trip = trip_plan.render([row])[0]
+    # Bounded like Trip.log_sheets(), so only partitions from the trip's month on are read.
+    trip['logSheets'] = log_sheet_plan.render(
+        LogSheet.objects.filter(tripId_id=trip_id, createdDate__gte=row['createdDate']).values(*log_sheet_plan.columns)
+    )
+    attach_route_legs(trip['logSheets'])
+    return trip
+
+
+async def aserialize_trip_data(trip_id):
+    """serialize_trip_data() on the async ORM, for async views. Raises Http404."""
+
+    trip_plan = field_plan(GetTripDataSerializer)
+    log_sheet_plan = field_plan(GetLogSheetSerializer)
+
+    try:
+        row = await Trip.objects.values(*trip_plan.columns).aget(uniqueId=trip_id)
+    except Trip.DoesNotExist:
+        raise Http404("No Trip matches the given query.")
+
+    trip = trip_plan.render([row])[0]
+    trip['logSheets'] = log_sheet_plan.render([
+        log_sheet async for log_sheet in LogSheet.objects.filter(
+            tripId_id=trip_id, createdDate__gte=row['createdDate'],
+        ).values(*log_sheet_plan.columns)
+    ])
+    # A single RouteCache query (reads never route upstream), but through the sync ORM.
+    await sync_to_async(attach_route_legs)(trip['logSheets'])
+    return trip
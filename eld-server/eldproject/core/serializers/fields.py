@@ -0,0 +1,46 @@
+import re
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from rest_framework import serializers
+
+NUMBER_PATTERN = re.compile(r'-?\d+(?:\.\d+)?')
+
+
+def parse_cycle_hours(value):
+    """
+    Pull the hour count out of free-form input such as "5", "5.5" or "5 hrs".
+    Returns None when there is no number in it.
+    """
+
+    if value is None:
+        return None
+    match = NUMBER_PATTERN.search(str(value))
+    return Decimal(match.group()) if match else None
+
+
+class CycleHoursField(serializers.DecimalField):
+    """
+    Decimal hours that still accepts the free-text values drivers type in.
+    Extra decimal places are rounded half up, as migration 0013 rounded the
+    existing values; negative hours are refused.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault('max_digits', 6)
+        kwargs.setdefault('decimal_places', 2)
+        kwargs.setdefault('min_value', Decimal(0))
+        kwargs.setdefault('rounding', ROUND_HALF_UP)
+        kwargs.setdefault('required', False)
+        kwargs.setdefault('allow_null', True)
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        if data in ('', None):
+            return None
+        hours = parse_cycle_hours(data)
+        if hours is None:
+            self.fail('invalid')
+        try:
+            hours = self.quantize(hours)
+        except InvalidOperation:
+            self.fail('max_digits', max_digits=self.max_digits)
+        return super().to_internal_value(hours)
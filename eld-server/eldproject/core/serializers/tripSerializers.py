@@ -2,35 +2,119 @@ from rest_framework import serializers
 from core.models.trip import Trip
 from core.models.logSheet import LogSheet
 from core.models.driver import Driver
+from core.models.sequence import Sequence
+from core.serializers.fields import CycleHoursField
+from core.services.geocoding import resolve_coordinates, TRIP_LOCATION_FIELDS, LOG_SHEET_LOCATION_FIELDS
+from core.services.routing import route_many, route_key, log_sheet_legs
+from core.services.hos import attach_duty_totals, record_duty_changes, trip_distance
+from django.conf import settings
+from django.db import transaction
 from django.shortcuts import get_object_or_404
 
+
+def attach_coordinates(items, fields):
+    # Geocode before opening any transaction so upstream lookups never hold row locks.
+    pending = [item for item in items if 'coordinates' not in item]
+    for item, coordinates in zip(pending, resolve_coordinates(pending, fields)):
+        item['coordinates'] = coordinates
+
+
+def attach_route_legs(log_sheets):
+    """
+    Attach each serialized log sheet's precomputed legs (segmentDistances in
+    km, segmentDurations in hours, routePolylines) in one RouteCache query.
+    Legs are routed when sheets are written (attach_duty_totals); reads never
+    go upstream, and legs that are not cached or have no road come back as
+    null so the client routes them itself.
+    """
+
+    sheet_legs = [log_sheet_legs(log_sheet['coordinates']) for log_sheet in log_sheets]
+    routes = route_many((leg for legs in sheet_legs for leg in legs), fetch=False)
+
+    for log_sheet, legs in zip(log_sheets, sheet_legs):
+        leg_routes = [routes.get(route_key(*leg)) for leg in legs]
+        log_sheet['segmentDistances'] = [route['distance'] if route else None for route in leg_routes]
+        log_sheet['segmentDurations'] = [route['duration'] if route else None for route in leg_routes]
+        log_sheet['routePolylines'] = [route['polyline'] if route else None for route in leg_routes]
+
+
+def take_log_numbers(log_sheets_data):
+    pending = [item for item in log_sheets_data if 'logNumber' not in item]
+    for item, number in zip(pending, Sequence.objects.take('logNumber', len(pending))):
+        item['logNumber'] = number
+
+
+class LogSheetListSerializer(serializers.ListSerializer):
+    def create(self, validated_data):
+        """
+        Write the whole batch with one block of log numbers and a single
+        bulk INSERT instead of one lookup and INSERT per sheet.
+        """
+
+        if not validated_data:
+            return []
+
+        trip = validated_data[0]['tripId']
+        attach_coordinates(validated_data, LOG_SHEET_LOCATION_FIELDS)
+        pending = [item for item in validated_data if 'dutyTotals' not in item]
+        if pending:
+            attach_duty_totals(pending, trip_distance(trip))
+
+        # Numbers come first, so the counter row is not locked for the whole insert.
+        take_log_numbers(validated_data)
+        with transaction.atomic():
+            log_sheets = [LogSheet(**item) for item in validated_data]
+            log_sheets = LogSheet.objects.bulk_create(
+                log_sheets, batch_size=getattr(settings, 'LOG_SHEET_BATCH_SIZE', 500)
+            )
+            record_duty_changes(
+                trip.driverId_id,
+                [(log_sheet.createdDate, None, log_sheet.dutyTotals) for log_sheet in log_sheets],
+            )
+            return log_sheets
+
+
 class LogSheetSerializer(serializers.ModelSerializer):
+    currentCycleUsed = CycleHoursField()
+
     class Meta:
         model = LogSheet
-        fields = ['uniqueId', 'tripId', 'currentLocation', 'pickup', 'dropoff', 'currentCycleUsed', 'createdDate', 'logNumber']
+        fields = ['uniqueId', 'tripId', 'currentLocation', 'pickup', 'dropoff', 'currentCycleUsed', 'coordinates', 'dutyTotals', 'dutyGrid', 'createdDate', 'logNumber']
         extra_kwargs = {
             'uniqueId': {'read_only': True},
             'tripId': {'read_only': True},
+            'coordinates': {'read_only': True},
+            'dutyTotals': {'read_only': True},
+            'dutyGrid': {'read_only': True},
             'logNumber': {'read_only': True},
         }
+        list_serializer_class = LogSheetListSerializer
 
     def create(self, validated_data):
+        trip = validated_data['tripId']
+        attach_coordinates([validated_data], LOG_SHEET_LOCATION_FIELDS)
+        attach_duty_totals([validated_data], trip_distance(trip))
+
         # Auto-generate logNumber
-        last_log = LogSheet.objects.order_by('-logNumber').first()
-        validated_data['logNumber'] = (last_log.logNumber + 1) if last_log else 1
-        
-        return super().create(validated_data)
+        validated_data['logNumber'] = Sequence.objects.next_value('logNumber')
+        with transaction.atomic():
+            log_sheet = super().create(validated_data)
+            record_duty_changes(trip.driverId_id, [(log_sheet.createdDate, None, log_sheet.dutyTotals)])
+
+        return log_sheet
 
 
 class TripSerializer(serializers.ModelSerializer):
     logSheets = LogSheetSerializer(many=True)
+    cycleUsed = CycleHoursField()
 
     class Meta:
         model = Trip
-        fields = ['uniqueId', 'driverId', 'tripTitle', 'pickup', 'dropoff', 'cycleUsed', 'instructions', 'createdDate', 'tripNumber', 'logSheets']
+        fields = ['uniqueId', 'driverId', 'tripTitle', 'pickup', 'dropoff', 'cycleUsed', 'instructions', 'coordinates', 'createdDate', 'tripNumber', 'logSheets']
         extra_kwargs = {
             'uniqueId': {'read_only': True},
             'driverId': {'read_only': True},
+            'coordinates': {'read_only': True},
             'tripNumber': {'read_only': True},
         }
 
@@ -39,23 +123,34 @@ class TripSerializer(serializers.ModelSerializer):
         email = self.context['email']
         driver = get_object_or_404(Driver, email=email)
         validated_data['driverId'] = driver
+
+        attach_coordinates([validated_data], TRIP_LOCATION_FIELDS)
+        attach_coordinates(log_sheets_data, LOG_SHEET_LOCATION_FIELDS)
+        attach_duty_totals(log_sheets_data)
         
-        last_trip = Trip.objects.order_by('-tripNumber').first()
-        validated_data['tripNumber'] = (last_trip.tripNumber + 1) if last_trip else 1
-        
-        trip = super().create(validated_data)
-        
-        for log_sheet_data in log_sheets_data:
-            log_sheet_serializer = LogSheetSerializer(data=log_sheet_data)
-            if log_sheet_serializer.is_valid():
-                log_sheet_serializer.save(tripId=trip)
-            else:
-                raise serializers.ValidationError(log_sheet_serializer.errors)
+        validated_data['tripNumber'] = Sequence.objects.next_value('tripNumber')
+        take_log_numbers(log_sheets_data)
+        with transaction.atomic():
+            trip = super().create(validated_data)
+
+            # logSheets were already validated as part of this serializer.
+            for log_sheet_data in log_sheets_data:
+                log_sheet_data['tripId'] = trip
+            self.fields['logSheets'].create(log_sheets_data)
         
         return trip
 
 
 class GetDriverTripsSerializer(serializers.ModelSerializer):
+    def __init__(self, *args, **kwargs):
+        # Optional subset of fields requested by the client, e.g. ?fields=uniqueId,tripTitle
+        fields = kwargs.pop('fields', None)
+        super().__init__(*args, **kwargs)
+
+        if fields:
+            for field_name in set(self.fields) - set(fields):
+                self.fields.pop(field_name)
+
     class Meta:
         model = Trip
         fields = ['uniqueId', 'tripTitle', 'pickup', 'dropoff', 'cycleUsed', 'instructions', 'createdDate', 'tripNumber']
@@ -68,7 +163,7 @@ class GetDriverTripsSerializer(serializers.ModelSerializer):
 class GetLogSheetSerializer(serializers.ModelSerializer):
     class Meta:
         model = LogSheet
-        fields = ['uniqueId', 'currentLocation', 'pickup', 'dropoff', 'currentCycleUsed', 'createdDate', 'logNumber']
+        fields = ['uniqueId', 'currentLocation', 'pickup', 'dropoff', 'currentCycleUsed', 'coordinates', 'dutyTotals', 'dutyGrid', 'createdDate', 'logNumber']
         extra_kwargs = {
             'uniqueId': {'read_only': True},
             'logNumber': {'read_only': True},
@@ -79,8 +174,13 @@ class GetTripDataSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Trip
-        fields = ['uniqueId', 'tripTitle', 'pickup', 'dropoff', 'cycleUsed', 'instructions', 'createdDate', 'tripNumber', 'logSheets']
+        fields = ['uniqueId', 'tripTitle', 'pickup', 'dropoff', 'cycleUsed', 'instructions', 'coordinates', 'createdDate', 'tripNumber', 'logSheets']
         extra_kwargs = {
             'uniqueId': {'read_only': True},
             'tripNumber': {'read_only': True},
-        }
\ No newline at end of file
+        }
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        attach_route_legs(data['logSheets'])
+        return data
@@ -0,0 +1,95 @@
+# core/services/archive.py
+#
+# Moves old trips, with their log sheets, from the live tables into the
+# archive tables (see the archive_trips command), so that the tables every
+# trip query reads only hold recent history.
+
+from datetime import timedelta
+from django.db import connection, transaction
+from django.db.models import DateTimeField, Max, Min, Q, Value
+from django.utils import timezone
+from core.db.partitions import ensure_partitions
+from core.models import Trip, LogSheet, ArchivedTrip, ArchivedLogSheet
+from core.services.tripcache import trip_cache
+
+
+def archivable_trips(deleted_after_days, closed_after_days=None):
+    """
+    Trips soft-deleted more than `deleted_after_days` ago and, if
+    `closed_after_days` is set, trips with no log sheet written in that many days.
+    """
+
+    now = timezone.now()
+    condition = Q(isDeleted=True, deletedDate__lt=now - timedelta(days=deleted_after_days))
+    trips = Trip.allObjects.all()
+    if closed_after_days:
+        cutoff = now - timedelta(days=closed_after_days)
+        trips = trips.annotate(lastLogSheet=Max('logSheets__createdDate'))
+        condition |= Q(createdDate__lt=cutoff) & (Q(lastLogSheet__isnull=True) | Q(lastLogSheet__lt=cutoff))
+    return trips.filter(condition)
+
+
+def copy_rows_sql(source, target_model):
+    """
+    INSERT ... SELECT copying `source` (a queryset) into `target_model`'s
+    table, matching columns by field name and stamping archivedDate.
+    """
+
+    names = [field.name for field in target_model._meta.local_fields if field.name != 'archivedDate']
+    select = source.annotate(
+        archivedNow=Value(timezone.now(), output_field=DateTimeField())
+    ).values_list(*[source.model._meta.get_field(name).attname for name in names], 'archivedNow')
+    sql, params = select.query.sql_with_params()
+
+    quote = connection.ops.quote_name
+    columns = ', '.join(quote(target_model._meta.get_field(name).column) for name in names + ['archivedDate'])
+    return f"INSERT INTO {quote(target_model._meta.db_table)} ({columns}) {sql}", params
+
+
+def ensure_archive_partitions(trips):
+    # Yearly partitions from the oldest trip being archived (its sheets are never older) to today.
+    oldest = trips.aggregate(oldest=Min('createdDate'))['oldest']
+    if oldest is None:
+        return []
+    today = timezone.now().date()
+    return [
+        name
+        for model in (ArchivedTrip, ArchivedLogSheet)
+        for name in ensure_partitions(connection, model._meta.db_table, oldest.date(), today, months=12)
+    ]
+
+
+def archive_batch(trip_ids):
+    """
+    Copy one batch of trips and their log sheets into the archive and delete
+    them from the live tables, in one short transaction.
+    """
+
+    with transaction.atomic():
+        log_sheets = LogSheet.allObjects.filter(tripId__in=trip_ids)
+        with connection.cursor() as cursor:
+            cursor.execute(*copy_rows_sql(log_sheets, ArchivedLogSheet))
+            archived_log_sheets = cursor.rowcount
+            cursor.execute(*copy_rows_sql(Trip.allObjects.filter(pk__in=trip_ids), ArchivedTrip))
+            archived_trips = cursor.rowcount
+
+        # No LogSheet delete signals, so this is a single DELETE.
+        log_sheets.delete()
+        Trip.allObjects.filter(pk__in=trip_ids).delete()
+        # Retire cached get-trip-byid/ responses on commit, whether or not the
+        # Trip delete above still goes through post_delete receivers.
+        for trip_id in trip_ids:
+            trip_cache.invalidate(trip_id)
+    return archived_trips, archived_log_sheets
+
+
+def archive_trips(deleted_after_days, closed_after_days=None, batch_size=500):
+    """Archive every archivable trip, a batch at a time. Yields (trips, log sheets) per batch."""
+
+    trips = archivable_trips(deleted_after_days, closed_after_days)
+    ensure_archive_partitions(trips)
+    while True:
+        trip_ids = list(trips.order_by('createdDate').values_list('uniqueId', flat=True)[:batch_size])
+        if not trip_ids:
+            break
+        yield archive_batch(trip_ids)
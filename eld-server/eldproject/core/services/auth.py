@@ -0,0 +1,123 @@
+# core/services/auth.py
+
+import threading
+import time
+from collections import OrderedDict
+from django.conf import settings
+from django.core.cache import caches
+from core.models.driver import Driver
+from core.services.metrics import request_metrics
+
+# Everything DriverSerializer returns, plus the permissions views check, so a
+# cached entry can stand in for the row.
+CACHED_FIELDS = (
+    'uniqueId', 'fullName', 'username', 'email', 'phone',
+    'isActive', 'isDeleted', 'isStaff', 'createdDate', 'accountNumber',
+)
+
+# stats() keys served on metrics/ as eld_driver_cache_*.
+STATS_METRICS = {
+    'size': ('entries', 'gauge', "Drivers cached in this worker."),
+    'hits': ('hits_total', 'counter', "Token verifications served from this worker's cache."),
+    'sharedHits': ('shared_hits_total', 'counter', "Token verifications served from DRIVER_CACHE_BACKEND."),
+    'misses': ('misses_total', 'counter', "Token verifications that queried the driver."),
+    'hitRate': ('hit_rate', 'gauge', "Share of token verifications served from either cache."),
+}
+
+
+class DriverCache:
+    """
+    Per-process LRU + TTL cache of the driver fields token verification needs,
+    keyed by the token subject (the driver's uniqueId).
+
+    When settings.DRIVER_CACHE_BACKEND names a Django cache, it is used as a
+    second, shared tier behind the local one. Driver saves and deletes drop
+    the entry from both tiers through signals (see core.signals); other
+    processes' local tiers expire within DRIVER_CACHE_TTL.
+    """
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.sharedHits = 0
+        self.misses = 0
+
+    @property
+    def ttl(self):
+        return getattr(settings, 'DRIVER_CACHE_TTL', 60)
+
+    @property
+    def max_size(self):
+        return getattr(settings, 'DRIVER_CACHE_MAX_SIZE', 10000)
+
+    @property
+    def shared(self):
+        alias = getattr(settings, 'DRIVER_CACHE_BACKEND', None)
+        return caches[alias] if alias else None
+
+    def _shared_key(self, unique_id):
+        return f"driver-auth:{unique_id}"
+
+    def _remember(self, key, fields):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, fields)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def get(self, unique_id, email):
+        """
+        Return an unsaved Driver carrying the cached fields for `unique_id`,
+        loading it from the database on a miss. Raises Driver.DoesNotExist.
+        """
+
+        key = str(unique_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > time.monotonic() and entry[1]['email'] == email:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return Driver(**entry[1])
+
+        shared = self.shared
+        fields = shared.get(self._shared_key(key)) if shared else None
+        if fields and fields['email'] == email:
+            with self._lock:
+                self.sharedHits += 1
+        else:
+            with self._lock:
+                self.misses += 1
+            fields = Driver.objects.filter(uniqueId=key, email=email).values(*CACHED_FIELDS).get()
+            if shared:
+                shared.set(self._shared_key(key), fields, self.ttl)
+
+        self._remember(key, fields)
+        return Driver(**fields)
+
+    def invalidate(self, unique_id):
+        key = str(unique_id)
+        with self._lock:
+            self._entries.pop(key, None)
+        shared = self.shared
+        if shared:
+            shared.delete(self._shared_key(key))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.sharedHits + self.misses
+            return {
+                'size': len(self._entries),
+                'hits': self.hits,
+                'sharedHits': self.sharedHits,
+                'misses': self.misses,
+                'hitRate': round((self.hits + self.sharedHits) / lookups, 4) if lookups else 0,
+            }
+
+
+driver_cache = DriverCache()
+request_metrics.add_stats('eld_driver_cache', driver_cache.stats, STATS_METRICS)
@@ -0,0 +1,133 @@
+# core/services/exports.py
+
+import csv
+import io
+from django.conf import settings
+from django.db.models import FilteredRelation, Q
+from rest_framework.utils.encoders import JSONEncoder
+from core.models.trip import Trip
+from core.serializers.fastSerializers import field_plan, render_row
+from core.serializers.tripSerializers import GetTripDataSerializer, GetLogSheetSerializer
+
+EXPORT_FORMATS = ('ndjson', 'csv')
+CONTENT_TYPES = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+
+def log_history_rows(drivers=None, start=None, end=None):
+    """
+    One query over trips LEFT JOINed to their log sheets, ordered by driver,
+    trip and log number: a row per log sheet, or a single row with empty
+    sheet columns for a trip that has none.
+
+    With a date range, only log sheets created in it are exported, and a trip
+    is exported when it was created in the range or has such a log sheet.
+
+    Returns the queryset and the prefix of the log sheet columns.
+    """
+
+    trips = Trip.objects.all()
+    if drivers is not None:
+        trips = trips.filter(driverId__in=drivers)
+
+    bounds = {}
+    if start:
+        bounds['createdDate__gte'] = start
+    if end:
+        bounds['createdDate__lt'] = end
+
+    if bounds:
+        relation = 'exportedLogSheet'
+        condition = Q(**{f"logSheets__{lookup}": value for lookup, value in bounds.items()})
+        trips = trips.annotate(exportedLogSheet=FilteredRelation('logSheets', condition=condition))
+        trips = trips.filter(Q(**bounds) | Q(exportedLogSheet__isnull=False))
+    else:
+        relation = 'logSheets'
+
+    prefix = f"{relation}__"
+    trip_plan = field_plan(GetTripDataSerializer)
+    log_sheet_plan = field_plan(GetLogSheetSerializer)
+    rows = trips.order_by('driverId_id', 'createdDate', 'tripNumber', 'uniqueId', f"{prefix}logNumber").values(
+        'driverId__email', *trip_plan.columns, *[prefix + column for column in log_sheet_plan.columns],
+    )
+    return rows, prefix
+
+
+def iter_log_history(rows, prefix):
+    """
+    Walk log_history_rows() with a server-side cursor, yielding
+    ('trip', data) once per trip followed by ('logSheet', data) per sheet.
+    Memory use does not depend on how many rows are exported.
+    """
+
+    trip_plan = field_plan(GetTripDataSerializer).bind()
+    log_sheet_plan = field_plan(GetLogSheetSerializer).bind(prefix)
+    current_trip = None
+
+    for row in rows.iterator(chunk_size=getattr(settings, 'EXPORT_CHUNK_SIZE', 2000)):
+        if row['uniqueId'] != current_trip:
+            current_trip = row['uniqueId']
+            trip = render_row(row, trip_plan)
+            yield 'trip', {'driverEmail': row['driverId__email'], **trip}
+        if row[f"{prefix}uniqueId"] is not None:
+            yield 'logSheet', {'tripId': trip['uniqueId'], **render_row(row, log_sheet_plan)}
+
+
+def ndjson_lines(records):
+    encoder = JSONEncoder()
+    for record, data in records:
+        yield encoder.encode({'record': record, **data}) + '\n'
+
+
+def csv_lines(records):
+    """
+    One CSV row per log sheet, carrying its trip's columns; trips without log
+    sheets get a row of their own with empty log sheet columns. JSON columns are written as JSON text.
+    """
+
+    trip_columns = ['driverEmail'] + [name for name, _ in field_plan(GetTripDataSerializer).fields]
+    log_sheet_columns = [name for name, _ in field_plan(GetLogSheetSerializer).fields]
+    header = [f"trip.{column}" for column in trip_columns] + [f"logSheet.{column}" for column in log_sheet_columns]
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    encoder = JSONEncoder()
+
+    def cell(value):
+        return encoder.encode(value) if isinstance(value, (dict, list)) else value
+
+    def flush():
+        line = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return line
+
+    writer.writerow(header)
+    yield flush()
+
+    empty_log_sheet = [''] * len(log_sheet_columns)
+    trip_cells = None
+    trip_written = True
+    for record, data in records:
+        if record == 'trip':
+            if not trip_written:
+                writer.writerow(trip_cells + empty_log_sheet)
+                yield flush()
+            trip_cells = [cell(data[column]) for column in trip_columns]
+            trip_written = False
+        else:
+            writer.writerow(trip_cells + [cell(data[column]) for column in log_sheet_columns])
+            trip_written = True
+            yield flush()
+
+    if not trip_written:
+        writer.writerow(trip_cells + empty_log_sheet)
+        yield flush()
+
+
+def export_lines(export_format, drivers=None, start=None, end=None):
+    rows, prefix = log_history_rows(drivers, start, end)
+    records = iter_log_history(rows, prefix)
+    return ndjson_lines(records) if export_format == 'ndjson' else csv_lines(records)
@@ -0,0 +1,213 @@
+# core/services/geocoding.py
+
+import hashlib
+import json
+import logging
+import math
+import time
+import urllib.parse
+import urllib.request
+from datetime import timedelta
+from functools import lru_cache
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.module_loading import import_string
+from django.utils.timezone import now
+from core.models.geocodeCache import GeocodeCache
+
+logger = logging.getLogger(__name__)
+
+TRIP_LOCATION_FIELDS = ('pickup', 'dropoff')
+LOG_SHEET_LOCATION_FIELDS = ('currentLocation', 'pickup', 'dropoff')
+
+
+def normalize_location(location):
+    """
+    Normalize a free-form location so equivalent spellings share one cache entry.
+    """
+
+    if not location:
+        return ''
+    return ' '.join(location.split()).casefold()[:255]
+
+
+class NominatimGeocodingProvider:
+    """
+    Resolves locations with the public OpenStreetMap Nominatim API.
+    """
+
+    url = 'https://nominatim.openstreetmap.org/search'
+    # The public instance allows one request per second; see wait_for_upstream_slot().
+    rate_limited = True
+
+    def geocode(self, query):
+        params = urllib.parse.urlencode({'q': query, 'format': 'json', 'limit': 1})
+        request = urllib.request.Request(
+            f"{self.url}?{params}",
+            headers={'User-Agent': getattr(settings, 'GEOCODING_USER_AGENT', 'eld-server')},
+        )
+        timeout = getattr(settings, 'GEOCODING_TIMEOUT', 5)
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            results = json.loads(response.read())
+
+        if not results:
+            return None
+        return float(results[0]['lat']), float(results[0]['lon'])
+
+
+class LocalGeocodingProvider:
+    """
+    Resolves locations from settings.GEOCODING_LOCAL_COORDINATES without any
+    network access. Meant for tests and offline development.
+    """
+
+    def __init__(self):
+        self.coordinates = {
+            normalize_location(location): tuple(coords)
+            for location, coords in getattr(settings, 'GEOCODING_LOCAL_COORDINATES', {}).items()
+        }
+
+    def geocode(self, query):
+        return self.coordinates.get(query)
+
+
+@lru_cache(maxsize=None)
+def get_provider():
+    return import_string(settings.GEOCODING_PROVIDER)()
+
+
+def _failure_cache():
+    return caches[getattr(settings, 'GEOCODING_FAILURE_CACHE_BACKEND', 'default')]
+
+
+def _failure_key(query):
+    return f"geocode-failed:{hashlib.sha256(query.encode('utf-8')).hexdigest()}"
+
+
+def wait_for_upstream_slot():
+    """
+    Keep lookups by rate-limited providers under GEOCODING_RATE_LIMIT per second. Each lookup
+    claims a time slot in GEOCODING_FAILURE_CACHE_BACKEND (shared by every
+    worker when that cache is) and sleeps until it starts. Returns False when
+    no slot is free within GEOCODING_RATE_LIMIT_WAIT seconds.
+    """
+
+    rate = getattr(settings, 'GEOCODING_RATE_LIMIT', 1)
+    if not rate:
+        return True
+
+    interval = 1 / rate
+    max_wait = getattr(settings, 'GEOCODING_RATE_LIMIT_WAIT', 2)
+    started = time.time()
+    slot_cache = _failure_cache()
+    for slot in range(math.floor(started / interval), math.floor((started + max_wait) / interval) + 1):
+        if slot_cache.add(f"geocode-slot:{slot}", True, math.ceil(max_wait + interval) + 1):
+            time.sleep(max(0, slot * interval - time.time()))
+            return True
+    return False
+
+
+def geocode_many(locations):
+    """
+    Resolve many locations at once. Returns a dict of normalized location to
+    {'lat', 'lon'}, or None when the provider has no match. Locations whose
+    lookup failed or was throttled are left out.
+
+    Fresh cache entries are read with a single query; only the misses and
+    entries older than GEOCODE_CACHE_TTL go upstream, at most
+    GEOCODING_RATE_LIMIT per second for rate-limited providers. A failed lookup is not retried for
+    GEOCODING_FAILURE_TTL seconds, and the first failure skips the rest of
+    the batch so an outage costs one timeout per call.
+    """
+
+    queries = {normalize_location(location) for location in locations} - {''}
+    if not queries:
+        return {}
+
+    current_time = now()
+    fresh_after = current_time - timedelta(seconds=getattr(settings, 'GEOCODE_CACHE_TTL', 30 * 86400))
+    cached = {
+        entry.query: entry
+        for entry in GeocodeCache.objects.filter(query__in=queries, resolvedDate__gte=fresh_after)
+    }
+
+    resolved = {
+        query: {'lat': entry.lat, 'lon': entry.lon} if entry.lat is not None else None
+        for query, entry in cached.items()
+    }
+
+    missing = sorted(queries - set(cached))
+    failed = _failure_cache().get_many([_failure_key(query) for query in missing]) if missing else {}
+    provider = get_provider()
+    new_entries = []
+    for query in missing:
+        if _failure_key(query) in failed:
+            continue
+        if getattr(provider, 'rate_limited', False) and not wait_for_upstream_slot():
+            logger.warning("Geocoding rate limit reached, leaving %r and the rest for later", query)
+            break
+        try:
+            coords = provider.geocode(query)
+        except Exception as e:
+            # Leave it out of the cache and the result; it is retried after the failure TTL.
+            logger.warning("Geocoding %r failed: %s", query, e)
+            _failure_cache().set(_failure_key(query), True, getattr(settings, 'GEOCODING_FAILURE_TTL', 60))
+            break
+
+        lat, lon = coords if coords else (None, None)
+        resolved[query] = {'lat': lat, 'lon': lon} if coords else None
+        new_entries.append(GeocodeCache(query=query, lat=lat, lon=lon, resolvedDate=current_time, lastUsedDate=current_time))
+
+    if cached:
+        GeocodeCache.objects.filter(query__in=list(cached)).update(lastUsedDate=current_time)
+    if new_entries:
+        GeocodeCache.objects.bulk_create(
+            new_entries,
+            update_conflicts=True,
+            unique_fields=['query'],
+            update_fields=['lat', 'lon', 'resolvedDate', 'lastUsedDate'],
+        )
+        evict_least_recently_used()
+
+    return resolved
+
+
+def geocode(location):
+    return geocode_many([location]).get(normalize_location(location))
+
+
+def evict_least_recently_used():
+    """
+    Trim the cache down to GEOCODE_CACHE_MAX_ENTRIES, dropping the entries
+    that have gone unused the longest.
+    """
+
+    max_entries = getattr(settings, 'GEOCODE_CACHE_MAX_ENTRIES', 100000)
+    cutoff = (
+        GeocodeCache.objects.order_by('-lastUsedDate')
+        .values_list('lastUsedDate', flat=True)[max_entries:max_entries + 1]
+    )
+    cutoff = list(cutoff)
+    if cutoff:
+        GeocodeCache.objects.filter(lastUsedDate__lte=cutoff[0]).delete()
+
+
+def resolve_coordinates(items, fields):
+    """
+    Build the `coordinates` value for each item (a dict of field values),
+    resolving every distinct location across all items in one pass. Fields
+    whose lookup failed are omitted so clients can fall back to their own.
+    """
+
+    resolved = geocode_many(item.get(field) for item in items for field in fields)
+    coordinates = []
+    for item in items:
+        item_coordinates = {}
+        for field in fields:
+            query = normalize_location(item.get(field))
+            if not query:
+                item_coordinates[field] = None
+            elif query in resolved:
+                item_coordinates[field] = resolved[query]
+        coordinates.append(item_coordinates)
+    return coordinates
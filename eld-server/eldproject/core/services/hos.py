@@ -0,0 +1,301 @@
+# core/services/hos.py
+
+from collections import defaultdict, deque
+from datetime import timedelta
+from django.db.models import F
+from django.utils.timezone import localdate, now
+from core.models.driverDailyHours import DriverDailyHours
+from core.services.routing import route_many, route_key, log_sheet_legs
+
+# Property-carrying driver rules, as applied by the trip planner.
+DRIVING_HOURS_BEFORE_BREAK = 10
+REST_BREAK_HOURS = 0.5
+PICKUP_HOURS = 0.5
+DROPOFF_HOURS = 0.5
+FUELING_INTERVAL_KM = 1000
+FUELING_HOURS = 0.5
+DRIVING_WINDOW_HOURS = 14
+CYCLE_LIMIT_HOURS = 70
+CYCLE_WINDOW_DAYS = 8
+HOURS_PER_DAY = 24
+
+# Daily grid: 15-minute slots, with the day's driving starting at 06:30.
+SLOTS_PER_HOUR = 4
+SLOTS_PER_DAY = HOURS_PER_DAY * SLOTS_PER_HOUR
+DAY_START_HOURS = 6.5
+
+# Duty statuses, numbered like the rows of the paper log.
+OFF_DUTY = 1
+SLEEPER_BERTH = 2
+DRIVING = 3
+ON_DUTY = 4
+
+
+def fueling_stop_after(distance_before, leg_distance):
+    """
+    Whether a leg of `leg_distance` km, driven `distance_before` km into
+    the trip, ends with a fueling stop: the trip planner (the client's
+    mapServices) stops once after a leg that reaches a multiple of
+    FUELING_INTERVAL_KM, however many it crosses.
+    """
+
+    cumulative = distance_before + leg_distance
+    return cumulative >= FUELING_INTERVAL_KM and cumulative % FUELING_INTERVAL_KM <= leg_distance
+
+
+def compute_duty_totals(legs, has_dropoff, distance_before=0):
+    """
+    Duty-status totals of one log sheet, by the trip planner's rules (the
+    client's mapServices): at most one REST_BREAK_HOURS break per sheet,
+    taken when a leg needs more than DRIVING_HOURS_BEFORE_BREAK hours of
+    driving, and at most one fueling stop per leg (fueling_stop_after).
+
+    `legs` are the sheet's routed legs ({'distance', 'duration'}, km and
+    hours); `distance_before` is the distance already driven on the trip,
+    so fueling stops land every FUELING_INTERVAL_KM across the whole trip.
+    """
+
+    driving_hours = sum(leg['duration'] for leg in legs)
+    total_distance = sum(leg['distance'] for leg in legs)
+
+    rest_breaks = 1 if any(leg['duration'] > DRIVING_HOURS_BEFORE_BREAK for leg in legs) else 0
+    fueling_stops = 0
+    for leg in legs:
+        fueling_stops += fueling_stop_after(distance_before, leg['distance'])
+        distance_before += leg['distance']
+
+    on_duty_hours = (
+        PICKUP_HOURS
+        + (DROPOFF_HOURS if has_dropoff else 0)
+        + fueling_stops * FUELING_HOURS
+        + rest_breaks * REST_BREAK_HOURS
+    )
+    cycle_hours = driving_hours + on_duty_hours
+    off_duty_hours = max(0, HOURS_PER_DAY - cycle_hours)
+
+    warnings = []
+    if cycle_hours > DRIVING_WINDOW_HOURS:
+        warnings.append(f"{DRIVING_WINDOW_HOURS}-Hour Driving Window exceeded ({cycle_hours:.2f} hrs)")
+
+    return {
+        'drivingHours': round(driving_hours, 2),
+        'onDutyHours': round(on_duty_hours, 2),
+        'sleeperBerthHours': 0,
+        'offDutyHours': round(off_duty_hours, 2),
+        'cycleHours': round(cycle_hours, 2),
+        'totalDistance': round(total_distance, 2),
+        'restBreaks': rest_breaks,
+        'fuelingStops': fueling_stops,
+        'warnings': warnings,
+    }
+
+
+def compute_duty_grid(legs, has_dropoff, distance_before=0):
+    """
+    The sheet's 24-hour duty-status timeline, following the same rules as
+    compute_duty_totals: off duty until DAY_START_HOURS, then each leg's
+    driving (the first leg over DRIVING_HOURS_BEFORE_BREAK hours is split by
+    the sheet's rest break), pickup after the first leg, fueling after each
+    leg that calls for it, dropoff at the end, and off duty for the rest of
+    the day.
+
+    Run-length encoded over SLOTS_PER_DAY 15-minute slots as a flat
+    [status, slots, status, slots, ...] list summing to SLOTS_PER_DAY.
+    """
+
+    periods = [(OFF_DUTY, DAY_START_HOURS)]
+    if not legs:
+        periods.append((ON_DUTY, PICKUP_HOURS))
+
+    rest_break_taken = False
+    for index, leg in enumerate(legs):
+        if leg['duration'] > DRIVING_HOURS_BEFORE_BREAK and not rest_break_taken:
+            periods += [(DRIVING, DRIVING_HOURS_BEFORE_BREAK), (ON_DUTY, REST_BREAK_HOURS),
+                        (DRIVING, leg['duration'] - DRIVING_HOURS_BEFORE_BREAK)]
+            rest_break_taken = True
+        else:
+            periods.append((DRIVING, leg['duration']))
+
+        if index == 0:
+            periods.append((ON_DUTY, PICKUP_HOURS))
+        if fueling_stop_after(distance_before, leg['distance']):
+            periods.append((ON_DUTY, FUELING_HOURS))
+        distance_before += leg['distance']
+
+    if has_dropoff:
+        periods.append((ON_DUTY, DROPOFF_HOURS))
+
+    grid = []
+    elapsed = 0
+    slot = 0
+    for status, hours in periods:
+        # Round cumulative times, not durations, so slots never drift.
+        elapsed += hours
+        end = min(SLOTS_PER_DAY, round(elapsed * SLOTS_PER_HOUR))
+        if end <= slot:
+            continue
+        if grid and grid[-2] == status:
+            grid[-1] += end - slot
+        else:
+            grid += [status, end - slot]
+        slot = end
+
+    if slot < SLOTS_PER_DAY:
+        if grid[-2] == OFF_DUTY:
+            grid[-1] += SLOTS_PER_DAY - slot
+        else:
+            grid += [OFF_DUTY, SLOTS_PER_DAY - slot]
+    return grid
+
+
+def attach_duty_totals(items, distance_before=0):
+    """
+    Compute `dutyTotals` and `dutyGrid` for log sheet dicts (with `coordinates` already
+    resolved), in trip order, routing every leg in one batch.
+    """
+
+    sheet_legs = [log_sheet_legs(item.get('coordinates')) for item in items]
+    routes = route_many(leg for legs in sheet_legs for leg in legs)
+
+    for item, legs in zip(items, sheet_legs):
+        routed = [route for route in (routes.get(route_key(*leg)) for leg in legs) if route and route['distance'] is not None]
+        item['dutyTotals'] = compute_duty_totals(routed, bool(item.get('dropoff')), distance_before)
+        item['dutyGrid'] = compute_duty_grid(routed, bool(item.get('dropoff')), distance_before)
+        distance_before += item['dutyTotals']['totalDistance']
+
+
+def refresh_duty_totals(trip, log_sheets):
+    """
+    Recompute `dutyTotals` and `dutyGrid` after the locations of some log sheets of one trip
+    changed. Fueling stops depend on the distance driven before a sheet, so
+    every later sheet of the trip is recomputed as well.
+
+    Returns the sheets that were not passed in but got new totals, and the
+    changes to pass to record_duty_changes.
+    """
+
+    changed = {log_sheet.pk: log_sheet for log_sheet in log_sheets}
+    trip_log_sheets = [
+        changed.get(log_sheet.pk, log_sheet)
+        for log_sheet in trip.log_sheets().order_by('logNumber').only(
+            'uniqueId', 'tripId', 'dropoff', 'coordinates', 'dutyTotals', 'createdDate', 'logNumber'
+        )
+    ]
+    first = min(index for index, log_sheet in enumerate(trip_log_sheets) if log_sheet.pk in changed)
+    distance_before = sum(
+        (log_sheet.dutyTotals or {}).get('totalDistance', 0) for log_sheet in trip_log_sheets[:first]
+    )
+
+    to_refresh = trip_log_sheets[first:]
+    old_totals = [log_sheet.dutyTotals for log_sheet in to_refresh]
+    items = [{'coordinates': log_sheet.coordinates, 'dropoff': log_sheet.dropoff} for log_sheet in to_refresh]
+    attach_duty_totals(items, distance_before)
+
+    followers = []
+    changes = []
+    for log_sheet, old, item in zip(to_refresh, old_totals, items):
+        if log_sheet.pk not in changed and old == item['dutyTotals']:
+            continue
+        log_sheet.dutyTotals = item['dutyTotals']
+        log_sheet.dutyGrid = item['dutyGrid']
+        changes.append((log_sheet.createdDate, old, log_sheet.dutyTotals))
+        if log_sheet.pk not in changed:
+            followers.append(log_sheet)
+
+    return followers, changes
+
+
+def record_duty_changes(driver_id, changes):
+    """
+    Apply (createdDate, old totals, new totals) changes to the driver's
+    daily buckets. Either side may be None for added or removed sheets.
+    """
+
+    deltas = defaultdict(lambda: [0, 0])
+    for created_date, old_totals, new_totals in changes:
+        day = localdate(created_date)
+        for totals, sign in ((old_totals, -1), (new_totals, 1)):
+            if totals:
+                deltas[day][0] += sign * totals['cycleHours']
+                deltas[day][1] += sign * totals['drivingHours']
+
+    for day, (cycle_delta, driving_delta) in deltas.items():
+        if not cycle_delta and not driving_delta:
+            continue
+        DriverDailyHours.objects.get_or_create(driverId_id=driver_id, date=day)
+        DriverDailyHours.objects.filter(driverId_id=driver_id, date=day).update(
+            cycleHours=F('cycleHours') + cycle_delta,
+            drivingHours=F('drivingHours') + driving_delta,
+        )
+
+
+def trip_distance(trip):
+    """
+    Distance already driven on a trip, from its stored sheet totals.
+    """
+
+    return sum(
+        (totals or {}).get('totalDistance', 0)
+        for totals in trip.log_sheets().values_list('dutyTotals', flat=True)
+    )
+
+
+def hos_status(driver, today=None):
+    """
+    70-hour/8-day status of a driver, read from at most CYCLE_WINDOW_DAYS buckets.
+    """
+
+    today = today or localdate(now())
+    window_start = today - timedelta(days=CYCLE_WINDOW_DAYS - 1)
+    days = list(
+        DriverDailyHours.objects
+        .filter(driverId=driver, date__range=(window_start, today))
+        .order_by('date')
+        .values('date', 'cycleHours', 'drivingHours')
+    )
+    cycle_hours = round(sum(day['cycleHours'] for day in days), 2)
+    # Buckets accumulate float deltas; report them like the totals they came from.
+    for day in days:
+        day['cycleHours'] = round(day['cycleHours'], 2)
+        day['drivingHours'] = round(day['drivingHours'], 2)
+
+    return {
+        'windowStart': window_start,
+        'windowEnd': today,
+        'cycleLimitHours': CYCLE_LIMIT_HOURS,
+        'cycleHours': cycle_hours,
+        'remainingHours': round(max(0, CYCLE_LIMIT_HOURS - cycle_hours), 2),
+        'violation': cycle_hours > CYCLE_LIMIT_HOURS,
+        'days': days,
+    }
+
+
+def hos_violations(daily_hours, since=None):
+    """
+    Days on which the 70-hour/8-day limit (rule 'cycle', with the window's
+    hours) or the daily DRIVING_WINDOW_HOURS (rule 'window', with the day's
+    hours) was exceeded, checking only days on or after `since`.
+
+    `daily_hours` is [(date, cycle hours), ...] in date order; it must
+    include the CYCLE_WINDOW_DAYS - 1 days before `since`. Also returns the
+    highest 8-day total seen.
+    """
+
+    violations = []
+    max_cycle_hours = 0
+    window = deque()
+    for day, hours in daily_hours:
+        window.append((day, hours))
+        while window[0][0] <= day - timedelta(days=CYCLE_WINDOW_DAYS):
+            window.popleft()
+
+        if since and day < since:
+            continue
+        window_hours = sum(day_hours for _, day_hours in window)
+        max_cycle_hours = max(max_cycle_hours, window_hours)
+        if hours > DRIVING_WINDOW_HOURS:
+            violations.append({'date': day.isoformat(), 'rule': 'window', 'hours': round(hours, 2)})
+        if window_hours > CYCLE_LIMIT_HOURS:
+            violations.append({'date': day.isoformat(), 'rule': 'cycle', 'hours': round(window_hours, 2)})
+
+    return violations, round(max_cycle_hours, 2)
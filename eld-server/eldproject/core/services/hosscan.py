@@ -0,0 +1,138 @@
+# core/services/hosscan.py
+#
+# Fleet-wide HOS compliance sweep, run by the scan_hos_violations command.
+# Drivers are scanned in batches, each batch with one chunked query over its
+# drivers' log sheets, and batches run in a pool of worker processes with
+# their own database connections. Each driver's report records the newest
+# sheet scanned, so a rerun only looks at drivers with newer sheets, and
+# for those only at the days the new sheets can affect.
+
+import multiprocessing
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, time, timedelta
+from django.conf import settings
+from django.db.models import F, Max, Q
+from django.utils import timezone
+from core.models import Driver, LogSheet, HosViolationReport
+from core.services.hos import hos_violations, CYCLE_WINDOW_DAYS
+from core.services.workers import setup_django
+
+
+def stale_drivers(full=False):
+    """
+    (driverId, scannedThrough) of active drivers with log sheets newer than
+    their last report, or of every active driver with log sheets if `full`.
+    """
+
+    drivers = (
+        Driver.objects.filter(isActive=True, isDeleted=False)
+        .annotate(latestSheet=Max('trip__logSheets__createdDate', filter=Q(trip__isDeleted=False)))
+        .filter(latestSheet__isnull=False)
+    )
+    if not full:
+        drivers = drivers.filter(Q(hosReport__isnull=True) | Q(latestSheet__gt=F('hosReport__scannedThrough')))
+        return list(drivers.order_by('uniqueId').values_list('uniqueId', 'hosReport__scannedThrough'))
+    return [(driver_id, None) for driver_id in drivers.order_by('uniqueId').values_list('uniqueId', flat=True)]
+
+
+def scan_batch(batch):
+    """
+    Scan [(driverId, scannedThrough), ...]. Returns a result per driver with
+    sheets: the violations from the first day the new sheets can change, the
+    newest sheet seen, and the highest 8-day total over those days.
+    """
+
+    since_days = {
+        driver_id: timezone.localdate(scanned_through) if scanned_through else None
+        for driver_id, scanned_through in batch
+    }
+    known = [day for day in since_days.values() if day]
+    log_sheets = LogSheet.objects.filter(tripId__driverId__in=list(since_days))
+    if known and len(known) == len(since_days):
+        # Nothing before the earliest window any driver needs.
+        first_day = min(known) - timedelta(days=CYCLE_WINDOW_DAYS - 1)
+        log_sheets = log_sheets.filter(
+            createdDate__gte=timezone.make_aware(datetime.combine(first_day, time.min))
+        )
+
+    daily = defaultdict(lambda: defaultdict(float))
+    latest = {}
+    rows = log_sheets.order_by().values_list('tripId__driverId', 'createdDate', 'dutyTotals__cycleHours')
+    for driver_id, created_date, cycle_hours in rows.iterator(chunk_size=getattr(settings, 'HOS_SCAN_CHUNK_SIZE', 2000)):
+        daily[driver_id][timezone.localdate(created_date)] += cycle_hours or 0
+        if driver_id not in latest or created_date > latest[driver_id]:
+            latest[driver_id] = created_date
+
+    results = []
+    for driver_id, days in daily.items():
+        since = since_days[driver_id]
+        violations, max_cycle_hours = hos_violations(sorted(days.items()), since)
+        results.append({
+            'driverId': driver_id,
+            'since': since,
+            'scannedThrough': latest[driver_id],
+            'violations': violations,
+            'maxCycleHours': max_cycle_hours,
+        })
+    return results
+
+
+def scan_fleet(drivers, workers=0, batch_size=200):
+    """
+    Scan `drivers` (from stale_drivers) and save their reports. Yields each
+    saved HosViolationReport as its batch finishes.
+    """
+
+    batches = (drivers[start:start + batch_size] for start in range(0, len(drivers), batch_size))
+    if workers:
+        # Spawned, not forked: each worker sets Django up and opens its own connection.
+        pool = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('spawn'), initializer=setup_django)
+        results = pool.map(scan_batch, batches)
+    else:
+        pool = None
+        results = map(scan_batch, batches)
+
+    try:
+        for batch_results in results:
+            yield from save_reports(batch_results)
+    finally:
+        if pool:
+            pool.shutdown(cancel_futures=True)
+
+
+def save_reports(results):
+    """
+    Merge incremental results into the drivers' reports: violations before
+    a result's `since` day are kept, the rest replaced.
+    """
+
+    previous = {
+        report.driverId_id: report
+        for report in HosViolationReport.objects.filter(driverId__in=[result['driverId'] for result in results])
+    }
+    reports = []
+    for result in results:
+        report = previous.get(result['driverId'])
+        violations = result['violations']
+        max_cycle_hours = result['maxCycleHours']
+        if report and result['since']:
+            since = result['since'].isoformat()
+            violations = [violation for violation in report.violations if violation['date'] < since] + violations
+            max_cycle_hours = max(max_cycle_hours, report.maxCycleHours)
+        reports.append(HosViolationReport(
+            driverId_id=result['driverId'],
+            scannedThrough=result['scannedThrough'],
+            violations=violations,
+            violationCount=len(violations),
+            maxCycleHours=max_cycle_hours,
+            scannedAt=timezone.now(),
+        ))
+
+    HosViolationReport.objects.bulk_create(
+        reports,
+        update_conflicts=True,
+        unique_fields=['driverId'],
+        update_fields=['scannedThrough', 'violations', 'violationCount', 'maxCycleHours', 'scannedAt'],
+    )
+    return reports
@@ -0,0 +1,383 @@
+# core/services/logrender.py
+#
+# Printable FMCSA-style daily logs, rendered on the server as SVG or PDF.
+# A sheet is first laid out as a short list of drawing operations, which
+# both output formats draw. Each rendered page is cached under a hash of its
+# inputs, so only new or changed sheets are ever rendered again; misses are
+# rendered in a process pool. The drawing code needs no Django setup, so the
+# pool's workers only import this module.
+
+import hashlib
+import json
+import multiprocessing
+import threading
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from xml.sax.saxutils import escape
+from django.conf import settings
+from django.core.cache import caches
+from django.utils import timezone
+
+# Bump whenever the layout changes, so cached pages are not reused.
+RENDER_VERSION = 1
+RENDER_FORMATS = ('svg', 'pdf')
+CONTENT_TYPES = {
+    'svg': 'image/svg+xml',
+    'pdf': 'application/pdf',
+}
+
+# US Letter, landscape, in points.
+PAGE_WIDTH = 792
+PAGE_HEIGHT = 612
+
+GRID_LEFT = 150
+GRID_TOP = 150
+HOUR_WIDTH = 22
+ROW_HEIGHT = 30
+GRID_WIDTH = 24 * HOUR_WIDTH
+TOTALS_LEFT = GRID_LEFT + GRID_WIDTH + 14
+
+STATUS_LABELS = ['1. Off Duty', '2. Sleeper Berth', '3. Driving', '4. On Duty (not driving)']
+HOUR_LABELS = ['Mid'] + [str(hour) for hour in range(1, 12)] + ['Noon'] + [str(hour) for hour in range(1, 12)] + ['Mid']
+KM_PER_MILE = 1.609344
+
+BLACK = (0, 0, 0)
+GREY = (0.55, 0.55, 0.55)
+BLUE = (0.1, 0.2, 0.75)
+
+
+def log_sheet_layout(sheet):
+    """
+    Drawing operations for one daily log:
+
+        ('text', x, y, size, bold, text)
+        ('line', x1, y1, x2, y2, width, color)
+        ('path', [(x, y), ...], width, color)
+
+    in points from the top left of the page. `sheet` is a dict as built by
+    render_inputs(); the duty-status line comes from its dutyGrid.
+    """
+
+    ops = []
+    totals = sheet.get('dutyTotals') or {}
+    grid = sheet.get('dutyGrid') or []
+
+    def text(x, y, value, size=9, bold=False):
+        ops.append(('text', x, y, size, bold, str(value)))
+
+    def line(x1, y1, x2, y2, width=0.5, color=BLACK):
+        ops.append(('line', x1, y1, x2, y2, width, color))
+
+    text(36, 48, "Driver's Daily Log (24 hours)", 16, True)
+    text(600, 48, f"Date: {sheet['date']}", 11, True)
+    text(36, 76, f"Driver: {sheet['driverName']}")
+    text(300, 76, f"Trip: {sheet['tripTitle']}")
+    text(600, 76, f"Log #{sheet['logNumber'] or '-'}")
+    text(36, 94, f"From: {sheet['pickup'] or 'N/A'}")
+    text(300, 94, f"To: {sheet['dropoff'] or 'N/A'}")
+    distance = totals.get('totalDistance', 0)
+    text(36, 112, f"Total distance today: {distance / KM_PER_MILE:.1f} mi ({distance:.1f} km)")
+    text(300, 112, f"Cycle used: {sheet['currentCycleUsed'] or '0'} h")
+    text(600, 112, f"Cycle hours today: {totals.get('cycleHours', 0):.2f}")
+
+    # Hour labels, rows and hour / quarter-hour ticks.
+    for hour, label in enumerate(HOUR_LABELS):
+        text(GRID_LEFT + hour * HOUR_WIDTH - 2 * len(label), GRID_TOP - 6, label, 7)
+    text(TOTALS_LEFT, GRID_TOP - 6, 'Total hours', 7, True)
+
+    grid_bottom = GRID_TOP + 4 * ROW_HEIGHT
+    for row, label in enumerate(STATUS_LABELS):
+        top = GRID_TOP + row * ROW_HEIGHT
+        text(36, top + ROW_HEIGHT / 2 + 3, label, 8)
+        line(GRID_LEFT, top, GRID_LEFT + GRID_WIDTH, top)
+        for quarter in range(1, 96):
+            if quarter % 4 == 0:
+                continue
+            x = GRID_LEFT + quarter * HOUR_WIDTH / 4
+            line(x, top, x, top + ROW_HEIGHT * (0.5 if quarter % 4 == 2 else 0.25), 0.4, GREY)
+    line(GRID_LEFT, grid_bottom, GRID_LEFT + GRID_WIDTH, grid_bottom)
+    for hour in range(25):
+        x = GRID_LEFT + hour * HOUR_WIDTH
+        line(x, GRID_TOP, x, grid_bottom, 0.8 if hour % 6 == 0 else 0.5)
+
+    # Duty-status line, and the hours per row it adds up to.
+    row_hours = [0.0] * 4
+    if grid:
+        points = []
+        slot = 0
+        for index in range(0, len(grid), 2):
+            status, slots = grid[index], grid[index + 1]
+            y = GRID_TOP + (status - 0.5) * ROW_HEIGHT
+            points.append((GRID_LEFT + slot * HOUR_WIDTH / 4, y))
+            slot += slots
+            points.append((GRID_LEFT + slot * HOUR_WIDTH / 4, y))
+            row_hours[status - 1] += slots / 4
+        ops.append(('path', points, 2, BLUE))
+    else:
+        row_hours = [
+            totals.get('offDutyHours', 0), totals.get('sleeperBerthHours', 0),
+            totals.get('drivingHours', 0), totals.get('onDutyHours', 0),
+        ]
+    for row, hours in enumerate(row_hours):
+        text(TOTALS_LEFT, GRID_TOP + row * ROW_HEIGHT + ROW_HEIGHT / 2 + 3, f"{hours:.2f}", 9, True)
+    text(TOTALS_LEFT, grid_bottom + 14, f"= {sum(row_hours):.2f}", 9, True)
+
+    # Remarks
+    y = grid_bottom + 44
+    text(36, y, 'Remarks', 11, True)
+    line(36, y + 4, PAGE_WIDTH - 36, y + 4)
+    remarks = [
+        f"Current location: {sheet['currentLocation']}",
+        f"Pickup: {sheet['pickup'] or 'N/A'}",
+        f"Dropoff: {sheet['dropoff'] or 'N/A'}",
+        f"Rest breaks: {totals.get('restBreaks', 0)}    Fueling stops: {totals.get('fuelingStops', 0)}",
+    ] + [f"Warning: {warning}" for warning in totals.get('warnings', [])]
+    for remark in remarks:
+        y += 16
+        text(44, y, remark)
+
+    text(36, PAGE_HEIGHT - 24, f"Log sheet {sheet['uniqueId']}", 6)
+    return ops
+
+
+# SVG
+
+def svg_page(ops):
+    parts = []
+    for op in ops:
+        if op[0] == 'text':
+            _, x, y, size, bold, value = op
+            weight = ' font-weight="bold"' if bold else ''
+            parts.append(f'<text x="{x:g}" y="{y:g}" font-size="{size}"{weight}>{escape(value)}</text>')
+        elif op[0] == 'line':
+            _, x1, y1, x2, y2, width, color = op
+            parts.append(
+                f'<line x1="{x1:g}" y1="{y1:g}" x2="{x2:g}" y2="{y2:g}" stroke-width="{width:g}" stroke="{svg_color(color)}"/>'
+            )
+        else:
+            _, points, width, color = op
+            coordinates = ' '.join(f"{x:g},{y:g}" for x, y in points)
+            parts.append(
+                f'<polyline points="{coordinates}" fill="none" stroke-width="{width:g}" stroke="{svg_color(color)}"/>'
+            )
+    return ''.join(parts).encode()
+
+
+def svg_color(color):
+    return '#' + ''.join(f"{round(channel * 255):02x}" for channel in color)
+
+
+def svg_document(pages, title):
+    height = PAGE_HEIGHT * len(pages)
+    header = (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{PAGE_WIDTH}" height="{height}" '
+        f'viewBox="0 0 {PAGE_WIDTH} {height}" font-family="Helvetica, Arial, sans-serif">'
+        f'<title>{escape(title)}</title>'
+    )
+    body = b''.join(
+        f'<g transform="translate(0 {index * PAGE_HEIGHT})"><rect width="{PAGE_WIDTH}" height="{PAGE_HEIGHT}" fill="white"/>'.encode()
+        + page + b'</g>'
+        for index, page in enumerate(pages)
+    )
+    return header.encode() + body + b'</svg>'
+
+
+# PDF
+
+def pdf_text(value):
+    value = value.encode('cp1252', 'replace')
+    return b'(' + value.replace(b'\\', b'\\\\').replace(b'(', b'\\(').replace(b')', b'\\)') + b')'
+
+
+def pdf_page(ops):
+    """A page's content stream, Flate-compressed. PDF's origin is the bottom left."""
+
+    parts = []
+    for op in ops:
+        if op[0] == 'text':
+            _, x, y, size, bold, value = op
+            font = b'/F2' if bold else b'/F1'
+            parts.append(b'BT %s %d Tf %.2f %.2f Td %s Tj ET' % (font, size, x, PAGE_HEIGHT - y, pdf_text(value)))
+        elif op[0] == 'line':
+            _, x1, y1, x2, y2, width, color = op
+            parts.append(b'%.2f %.2f %.2f RG %.2f w %.2f %.2f m %.2f %.2f l S' % (
+                *color, width, x1, PAGE_HEIGHT - y1, x2, PAGE_HEIGHT - y2,
+            ))
+        else:
+            _, points, width, color = op
+            path = [b'%.2f %.2f %s' % (x, PAGE_HEIGHT - y, b'l' if index else b'm') for index, (x, y) in enumerate(points)]
+            parts.append(b'%.2f %.2f %.2f RG %.2f w 1 j ' % (*color, width) + b' '.join(path) + b' S')
+    return zlib.compress(b'\n'.join(parts))
+
+
+def pdf_document(pages, title):
+    """Pages (from pdf_page) as one PDF: catalog, page tree, fonts, then a page and its content per sheet."""
+
+    objects = [
+        b'<< /Type /Catalog /Pages 2 0 R >>',
+        b'<< /Type /Pages /Kids [%s] /Count %d >>' % (
+            b' '.join(b'%d 0 R' % (5 + 2 * index) for index in range(len(pages))), len(pages),
+        ),
+        b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>',
+        b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>',
+    ]
+    for index, content in enumerate(pages):
+        objects.append(
+            b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d] /Resources << /Font << /F1 3 0 R /F2 4 0 R >> >> '
+            b'/Contents %d 0 R >>' % (PAGE_WIDTH, PAGE_HEIGHT, 6 + 2 * index)
+        )
+        objects.append(b'<< /Length %d /Filter /FlateDecode >>\nstream\n' % len(content) + content + b'\nendstream')
+    objects.append(b'<< /Title %s /Producer (ELD) >>' % pdf_text(title))
+
+    output = bytearray(b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n')
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += b'%d 0 obj\n' % number + body + b'\nendobj\n'
+
+    xref = len(output)
+    output += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+    output += b''.join(b'%010d 00000 n \n' % offset for offset in offsets)
+    output += b'trailer\n<< /Size %d /Root 1 0 R /Info %d 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (
+        len(objects) + 1, len(objects), xref,
+    )
+    return bytes(output)
+
+
+PAGE_RENDERERS = {'svg': svg_page, 'pdf': pdf_page}
+DOCUMENT_RENDERERS = {'svg': svg_document, 'pdf': pdf_document}
+
+
+def render_page(sheet, render_format):
+    return PAGE_RENDERERS[render_format](log_sheet_layout(sheet))
+
+
+def render_pages(sheets, render_format):
+    # One task per batch of sheets, so small pages are not dominated by pickling.
+    return [render_page(sheet, render_format) for sheet in sheets]
+
+
+def page_key(sheet, render_format):
+    body = json.dumps([RENDER_VERSION, render_format, sheet], sort_keys=True, default=str).encode()
+    return f"logrender:{render_format}:{hashlib.sha256(body).hexdigest()}"
+
+
+class LogSheetRenderer:
+    """
+    Renders and caches printable log pages.
+
+    Pages are cached in the LOG_RENDER_CACHE_BACKEND Django cache under a
+    hash of everything drawn on them, so a changed sheet simply gets a new
+    key and nothing has to be invalidated. Misses are rendered in a pool of
+    LOG_RENDER_WORKERS processes (0 renders in the calling thread).
+    """
+
+    def __init__(self):
+        self._pool = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.poolBatches = 0
+
+    @property
+    def cache(self):
+        return caches[getattr(settings, 'LOG_RENDER_CACHE_BACKEND', 'default')]
+
+    @property
+    def ttl(self):
+        return getattr(settings, 'LOG_RENDER_CACHE_TTL', 604800)
+
+    @property
+    def workers(self):
+        return getattr(settings, 'LOG_RENDER_WORKERS', 2)
+
+    def _get_pool(self):
+        with self._lock:
+            if self._pool is None:
+                # Spawned, not forked: the server process has threads and open sockets.
+                self._pool = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context('spawn'))
+            return self._pool
+
+    def _render(self, sheets, render_format):
+        if not self.workers or len(sheets) < 2:
+            return render_pages(sheets, render_format)
+
+        size = -(-len(sheets) // self.workers)
+        batches = [sheets[start:start + size] for start in range(0, len(sheets), size)]
+        try:
+            results = list(self._get_pool().map(render_pages, batches, [render_format] * len(batches)))
+        except BrokenProcessPool:
+            self.close()
+            return render_pages(sheets, render_format)
+        self.poolBatches += len(batches)
+        return [page for batch in results for page in batch]
+
+    def document_etag(self, sheets, render_format):
+        keys = [page_key(sheet, render_format) for sheet in sheets]
+        return f'"{hashlib.sha1(chr(10).join(keys).encode()).hexdigest()}"'
+
+    def render(self, sheets, render_format, title=''):
+        """The whole document for `sheets` (dicts from render_inputs), one page per sheet."""
+
+        keys = [page_key(sheet, render_format) for sheet in sheets]
+        pages = self.cache.get_many(keys)
+        missing = [(key, sheet) for key, sheet in zip(keys, sheets) if key not in pages]
+        self.hits += len(keys) - len(missing)
+        self.misses += len(missing)
+
+        if missing:
+            rendered = self._render([sheet for _, sheet in missing], render_format)
+            new_pages = {key: page for (key, _), page in zip(missing, rendered)}
+            self.cache.set_many(new_pages, self.ttl)
+            pages.update(new_pages)
+
+        return DOCUMENT_RENDERERS[render_format]([pages[key] for key in keys], title)
+
+    def close(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'poolBatches': self.poolBatches,
+            'workers': self.workers,
+        }
+
+
+def render_inputs(log_sheets, limit=None):
+    """
+    Everything a page shows, as plain JSON-able dicts (what the workers get
+    and what the cache key hashes), from a LogSheet queryset; at most `limit`
+    pages when given.
+    """
+
+    rows = log_sheets.order_by('createdDate', 'logNumber').values(
+        'uniqueId', 'createdDate', 'logNumber', 'currentLocation', 'pickup', 'dropoff', 'currentCycleUsed',
+        'dutyTotals', 'dutyGrid', 'tripId__tripTitle', 'tripId__driverId__fullName',
+    )
+    if limit is not None:
+        rows = rows[:limit]
+    return [
+        {
+            'uniqueId': str(row['uniqueId']),
+            'date': timezone.localtime(row['createdDate']).date().isoformat(),
+            'logNumber': row['logNumber'],
+            'driverName': row['tripId__driverId__fullName'],
+            'tripTitle': row['tripId__tripTitle'],
+            'currentLocation': row['currentLocation'],
+            'pickup': row['pickup'],
+            'dropoff': row['dropoff'],
+            'currentCycleUsed': None if row['currentCycleUsed'] is None else str(row['currentCycleUsed']),
+            'dutyTotals': row['dutyTotals'],
+            'dutyGrid': row['dutyGrid'],
+        }
+        for row in rows
+    ]
+
+
+log_renderer = LogSheetRenderer()
@@ -0,0 +1,303 @@
+# core/services/metrics.py
+#
+# Per-view request metrics: latency, database query count and time, and
+# serializer time, kept as in-process histograms and served in the
+# Prometheus text format by metrics/ next to the counters other services
+# register with add_stats(). Each worker process keeps its own
+# histograms, so scrape every worker (or sum them) for the whole picture.
+
+import bisect
+import heapq
+import logging
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+SECONDS_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 200, 500)
+
+HISTOGRAMS = (
+    ('duration', 'eld_request_duration_seconds', "Total request latency.", SECONDS_BUCKETS),
+    ('queries', 'eld_request_db_queries', "Database queries per request.", QUERY_BUCKETS),
+    ('dbTime', 'eld_request_db_seconds', "Time spent in database queries per request.", SECONDS_BUCKETS),
+    ('serializerTime', 'eld_request_serializer_seconds', "Time spent serializing responses per request, database time excluded.", SECONDS_BUCKETS),
+)
+
+# The recorder of the request being measured in this context; None when it is not sampled.
+_current = ContextVar('request_metrics_recorder', default=None)
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        # Buckets are upper bounds, inclusive as in Prometheus' "le".
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class RequestRecorder:
+    """
+    What one sampled request did. Queries are added by the execute wrapper
+    on every connection, in whichever thread runs them: sync_to_async copies
+    the context, so the view's thread sees the same recorder.
+    """
+
+    __slots__ = ('queries', 'dbTime', 'serializerTime', 'slowest', '_serializing')
+
+    def __init__(self):
+        self.queries = 0
+        self.dbTime = 0.0
+        self.serializerTime = 0.0
+        self.slowest = []
+        self._serializing = 0
+
+    def add_query(self, alias, sql, params, elapsed):
+        self.queries += 1
+        self.dbTime += elapsed
+        keep = getattr(settings, 'REQUEST_METRICS_EXPLAIN_QUERIES', 3)
+        if not keep:
+            return
+        # Min-heap of the slowest queries; the counter breaks ties without comparing params.
+        entry = (elapsed, self.queries, alias, sql, params)
+        if len(self.slowest) < keep:
+            heapq.heappush(self.slowest, entry)
+        elif elapsed > self.slowest[0][0]:
+            heapq.heapreplace(self.slowest, entry)
+
+
+class RequestMetrics:
+    """
+    Histograms per (view, method), fed by RequestMetricsMiddleware for a
+    REQUEST_METRICS_SAMPLE_RATE share of requests. Unsampled requests cost
+    one random() call and one context variable lookup per query.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._series = {}
+        self._responses = {}
+        self.sampled = 0
+        self.skipped = 0
+        self.slow = 0
+        self._stats = {}
+
+    @property
+    def sample_rate(self):
+        return getattr(settings, 'REQUEST_METRICS_SAMPLE_RATE', 0.1)
+
+    @property
+    def slow_seconds(self):
+        return getattr(settings, 'REQUEST_METRICS_SLOW_SECONDS', 1.0)
+
+    def add_stats(self, prefix, source, metrics, label=None):
+        """
+        Serve a component's counters on metrics/ too. `source` returns its
+        stats() dict, or with `label` a dict of such dicts keyed by that
+        label's value; `metrics` maps the keys to serve to (name suffix,
+        Prometheus type, description). Registering a prefix again replaces it.
+        """
+
+        with self._lock:
+            self._stats[prefix] = (source, metrics, label)
+
+    def install(self, connection):
+        """Measure every query `connection` runs while a request is being recorded."""
+
+        if self.execute not in connection.execute_wrappers:
+            connection.execute_wrappers.append(self.execute)
+
+    def execute(self, execute, sql, params, many, context):
+        recorder = _current.get()
+        if recorder is None:
+            return execute(sql, params, many, context)
+
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            recorder.add_query(context['connection'].alias, sql, None if many else params, time.perf_counter() - started)
+
+    def start(self):
+        """
+        A recorder for the current request and the token to pass to finish(),
+        or (None, None) when the request is not sampled.
+        """
+
+        rate = self.sample_rate
+        if rate <= 0 or (rate < 1 and random.random() >= rate):
+            with self._lock:
+                self.skipped += 1
+            return None, None
+        recorder = RequestRecorder()
+        return recorder, _current.set(recorder)
+
+    def finish(self, token):
+        _current.reset(token)
+
+    def observe(self, view, method, status_code, recorder, duration):
+        values = {
+            'duration': duration,
+            'queries': recorder.queries,
+            'dbTime': recorder.dbTime,
+            'serializerTime': recorder.serializerTime,
+        }
+        key = (view, method)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = {name: Histogram(buckets) for name, _, _, buckets in HISTOGRAMS}
+            for name, value in values.items():
+                series[name].observe(value)
+            response_key = (view, method, str(status_code))
+            self._responses[response_key] = self._responses.get(response_key, 0) + 1
+            self.sampled += 1
+
+    def is_slow(self, duration):
+        threshold = self.slow_seconds
+        return threshold is not None and threshold >= 0 and duration >= threshold
+
+    def log_slow_request(self, view, method, recorder, duration):
+        """
+        Log a slow request with the plans of its slowest SELECTs. Runs the
+        EXPLAINs on the request's connections, so call it from the thread
+        that ran the request's queries, after its recorder was reset.
+        """
+
+        with self._lock:
+            self.slow += 1
+        plans = []
+        for elapsed, _, alias, sql, params in sorted(recorder.slowest, reverse=True):
+            plans.append(f"-- {elapsed * 1000:.1f} ms\n{sql}\n{explain(alias, sql, params)}")
+        logger.warning(
+            "Slow request %s %s: %.0f ms, %d queries in %.0f ms, serializers %.0f ms\n%s",
+            method, view, duration * 1000, recorder.queries, recorder.dbTime * 1000,
+            recorder.serializerTime * 1000, '\n\n'.join(plans),
+        )
+
+    def render(self):
+        """All series in the Prometheus text exposition format (version 0.0.4)."""
+
+        with self._lock:
+            series = {key: {name: (list(h.counts), h.sum, h.count) for name, h in histograms.items()}
+                      for key, histograms in sorted(self._series.items())}
+            responses = sorted(self._responses.items())
+            sampled, skipped, slow = self.sampled, self.skipped, self.slow
+            sources = sorted(self._stats.items())
+
+        lines = []
+        for name, metric, description, buckets in HISTOGRAMS:
+            lines += [f"# HELP {metric} {description} Sampled requests only.", f"# TYPE {metric} histogram"]
+            for (view, method), histograms in series.items():
+                counts, total, count = histograms[name]
+                labels = f'view="{escape(view)}",method="{escape(method)}"'
+                cumulative = 0
+                for bound, bucket_count in zip(buckets + ('+Inf',), counts):
+                    cumulative += bucket_count
+                    lines.append(f'{metric}_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f"{metric}_sum{{{labels}}} {total!r}")
+                lines.append(f"{metric}_count{{{labels}}} {count}")
+
+        lines += ["# HELP eld_requests_total Sampled requests by view, method and status.", "# TYPE eld_requests_total counter"]
+        for (view, method, status_code), count in responses:
+            lines.append(f'eld_requests_total{{view="{escape(view)}",method="{escape(method)}",status="{status_code}"}} {count}')
+
+        lines += [
+            "# HELP eld_request_metrics_sampled_total Requests recorded.",
+            "# TYPE eld_request_metrics_sampled_total counter",
+            f"eld_request_metrics_sampled_total {sampled}",
+            "# HELP eld_request_metrics_skipped_total Requests left out by sampling.",
+            "# TYPE eld_request_metrics_skipped_total counter",
+            f"eld_request_metrics_skipped_total {skipped}",
+            "# HELP eld_request_metrics_slow_total Sampled requests over REQUEST_METRICS_SLOW_SECONDS.",
+            "# TYPE eld_request_metrics_slow_total counter",
+            f"eld_request_metrics_slow_total {slow}",
+            "# HELP eld_request_metrics_sample_rate Share of requests recorded.",
+            "# TYPE eld_request_metrics_sample_rate gauge",
+            f"eld_request_metrics_sample_rate {self.sample_rate}",
+        ]
+
+        for prefix, (source, metrics, label) in sources:
+            try:
+                stats = source() or {}
+            except Exception:
+                logger.exception("Collecting %s stats failed", prefix)
+                continue
+            labelled = sorted(stats.items()) if label else [(None, stats)]
+            for key, (suffix, kind, description) in metrics.items():
+                metric = f"{prefix}_{suffix}"
+                lines += [f"# HELP {metric} {description}", f"# TYPE {metric} {kind}"]
+                for value, component_stats in labelled:
+                    if key in component_stats:
+                        labels = f'{{{label}="{escape(str(value))}"}}' if label else ''
+                        lines.append(f"{metric}{labels} {component_stats[key]}")
+        return '\n'.join(lines) + '\n'
+
+    def clear(self):
+        with self._lock:
+            self._series.clear()
+            self._responses.clear()
+            self.sampled = self.skipped = self.slow = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                'sampled': self.sampled,
+                'skipped': self.skipped,
+                'slow': self.slow,
+                'views': len(self._series),
+            }
+
+
+def escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def explain(alias, sql, params):
+    if (sql.split(None, 1) or [''])[0].upper() not in ('SELECT', 'WITH'):
+        return "(not a SELECT, not explained)"
+    connection = connections[alias]
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(f"{connection.ops.explain_query_prefix()} {sql}", params)
+            return '\n'.join(' '.join(str(column) for column in row) for row in cursor.fetchall())
+    except Exception as e:
+        return f"(EXPLAIN failed: {e})"
+
+
+@contextmanager
+def serializer_timer():
+    """
+    Count the enclosed block as serializer time of the request being
+    recorded, minus the database time spent inside it (querysets are often
+    evaluated while rendering). Nested blocks are counted once.
+    """
+
+    recorder = _current.get()
+    if recorder is None:
+        yield
+        return
+
+    recorder._serializing += 1
+    started = time.perf_counter()
+    db_before = recorder.dbTime
+    try:
+        yield
+    finally:
+        recorder._serializing -= 1
+        if not recorder._serializing:
+            recorder.serializerTime += (time.perf_counter() - started) - (recorder.dbTime - db_before)
+
+
+request_metrics = RequestMetrics()
@@ -0,0 +1,173 @@
+# core/services/passwords.py
+
+import asyncio
+import math
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import bcrypt
+from django.conf import settings
+from core.services.metrics import request_metrics
+
+# stats() keys served on metrics/ as eld_password_hashing_*.
+STATS_METRICS = {
+    'workers': ('workers', 'gauge', "bcrypt workers in the pool."),
+    'pending': ('pending', 'gauge', "Hashes queued or running."),
+    'maxPending': ('pending_peak', 'gauge', "Most hashes queued or running at once so far."),
+    'completed': ('completed_total', 'counter', "Hashes and checks completed."),
+    'rejected': ('rejected_total', 'counter', "Requests refused because the queue stayed full."),
+    'avgWaitMs': ('wait_avg_milliseconds', 'gauge', "Average time a hash waited for a worker."),
+    'avgRunMs': ('run_avg_milliseconds', 'gauge', "Average time bcrypt took."),
+}
+
+
+class PasswordHashingBusy(Exception):
+    pass
+
+
+def _hash(password, rounds):
+    started = time.monotonic()
+    hashed = bcrypt.hashpw(password, bcrypt.gensalt(rounds=rounds))
+    return hashed, time.monotonic() - started
+
+
+def _check(password, hashed):
+    started = time.monotonic()
+    matches = bcrypt.checkpw(password, hashed)
+    return matches, time.monotonic() - started
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt on a bounded pool so a burst of logins can only occupy
+    PASSWORD_HASHING_WORKERS cores, and at most PASSWORD_HASHING_MAX_PENDING
+    jobs queue behind them; callers beyond that wait up to
+    PASSWORD_HASHING_QUEUE_TIMEOUT seconds and then get PasswordHashingBusy.
+    """
+
+    def __init__(self):
+        self._executor = None
+        self._slots = None
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.maxPending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.totalWait = 0.0
+        self.totalRun = 0.0
+
+    @property
+    def rounds(self):
+        return getattr(settings, 'BCRYPT_ROUNDS', 12)
+
+    @property
+    def workers(self):
+        return getattr(settings, 'PASSWORD_HASHING_WORKERS', None) or os.cpu_count() or 1
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                if getattr(settings, 'PASSWORD_HASHING_EXECUTOR', 'thread') == 'process':
+                    self._executor = ProcessPoolExecutor(max_workers=self.workers)
+                else:
+                    self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='bcrypt')
+                max_pending = getattr(settings, 'PASSWORD_HASHING_MAX_PENDING', 64)
+                self._slots = threading.BoundedSemaphore(self.workers + max_pending)
+            return self._executor
+
+    @property
+    def queue_timeout(self):
+        return getattr(settings, 'PASSWORD_HASHING_QUEUE_TIMEOUT', 5)
+
+    @property
+    def retry_after(self):
+        # Whole seconds for a Retry-After header when PasswordHashingBusy is raised.
+        return max(1, math.ceil(self.queue_timeout))
+
+    def _reject(self):
+        with self._lock:
+            self.rejected += 1
+        raise PasswordHashingBusy("Too many password operations in progress, try again shortly")
+
+    def _submit(self, fn, *args):
+        executor = self._get_executor()
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            self._reject()
+        return self._start(executor, fn, *args)
+
+    async def _asubmit(self, fn, *args):
+        # Wait for a slot without blocking the event loop.
+        executor = self._get_executor()
+        deadline = time.monotonic() + self.queue_timeout
+        while not self._slots.acquire(blocking=False):
+            if time.monotonic() >= deadline:
+                self._reject()
+            await asyncio.sleep(0.01)
+        return self._start(executor, fn, *args)
+
+    def _start(self, executor, fn, *args):
+        submitted = time.monotonic()
+        with self._lock:
+            self.pending += 1
+            self.maxPending = max(self.maxPending, self.pending)
+
+        future = executor.submit(fn, *args)
+        future.add_done_callback(lambda done: self._finished(done, submitted))
+        return future
+
+    def _finished(self, future, submitted):
+        self._slots.release()
+        with self._lock:
+            self.pending -= 1
+            if future.exception() is None:
+                _, run_time = future.result()
+                self.completed += 1
+                self.totalRun += run_time
+                self.totalWait += max(0.0, time.monotonic() - submitted - run_time)
+
+    def hash(self, password):
+        hashed, _ = self._submit(_hash, password.encode('utf-8'), self.rounds).result()
+        return hashed.decode('utf-8')
+
+    def check(self, password, hashed):
+        matches, _ = self._submit(_check, password.encode('utf-8'), hashed.encode('utf-8')).result()
+        return matches
+
+    # Async views await these: the event loop and the thread-sensitive
+    # executor stay free while bcrypt runs.
+    async def ahash(self, password):
+        future = await self._asubmit(_hash, password.encode('utf-8'), self.rounds)
+        hashed, _ = await asyncio.wrap_future(future)
+        return hashed.decode('utf-8')
+
+    async def acheck(self, password, hashed):
+        future = await self._asubmit(_check, password.encode('utf-8'), hashed.encode('utf-8'))
+        matches, _ = await asyncio.wrap_future(future)
+        return matches
+
+    def needs_upgrade(self, hashed):
+        """
+        True when `hashed` was made with a different work factor than BCRYPT_ROUNDS.
+        """
+
+        try:
+            return int(hashed.split('$')[2]) != self.rounds
+        except (IndexError, ValueError):
+            return True
+
+    def stats(self):
+        with self._lock:
+            return {
+                'workers': self.workers,
+                'pending': self.pending,
+                'maxPending': self.maxPending,
+                'completed': self.completed,
+                'rejected': self.rejected,
+                'avgWaitMs': round(self.totalWait / self.completed * 1000, 2) if self.completed else 0,
+                'avgRunMs': round(self.totalRun / self.completed * 1000, 2) if self.completed else 0,
+            }
+
+
+password_hasher = PasswordHasher()
+request_metrics.add_stats('eld_password_hashing', password_hasher.stats, STATS_METRICS)
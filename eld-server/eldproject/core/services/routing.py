@@ -0,0 +1,206 @@
+# core/services/routing.py
+
+import hashlib
+import json
+import logging
+import math
+import threading
+import urllib.error
+import urllib.request
+from functools import lru_cache
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.module_loading import import_string
+from core.models.routeCache import RouteCache
+
+logger = logging.getLogger(__name__)
+
+COORDINATE_PRECISION = 5
+
+
+def route_key(origin, destination):
+    """
+    Content address of a leg: the hash of its rounded endpoints.
+    """
+
+    points = [
+        f"{round(point['lat'], COORDINATE_PRECISION)},{round(point['lon'], COORDINATE_PRECISION)}"
+        for point in (origin, destination)
+    ]
+    return hashlib.sha256(';'.join(points).encode('utf-8')).hexdigest()
+
+
+def encode_polyline(points):
+    """
+    Encode (lat, lon) pairs in the Google polyline format used by OSRM.
+    """
+
+    result = []
+    previous = (0, 0)
+    for point in points:
+        current = tuple(int(round(value * 10 ** COORDINATE_PRECISION)) for value in point)
+        for delta in (current[0] - previous[0], current[1] - previous[1]):
+            delta = ~(delta << 1) if delta < 0 else delta << 1
+            while delta >= 0x20:
+                result.append(chr((0x20 | (delta & 0x1f)) + 63))
+                delta >>= 5
+            result.append(chr(delta + 63))
+        previous = current
+    return ''.join(result)
+
+
+class OSRMRoutingProvider:
+    """
+    Fetches driving routes from an OSRM server.
+    """
+
+    def route(self, origin, destination):
+        base_url = getattr(settings, 'ROUTING_OSRM_URL', 'https://router.project-osrm.org')
+        url = (
+            f"{base_url}/route/v1/driving/"
+            f"{origin['lon']},{origin['lat']};{destination['lon']},{destination['lat']}?overview=full"
+        )
+        try:
+            with urllib.request.urlopen(url, timeout=getattr(settings, 'ROUTING_TIMEOUT', 10)) as response:
+                data = json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            # OSRM answers NoRoute with a 400; any other error is a failure.
+            if e.code != 400 or self._error_code(e) != 'NoRoute':
+                raise
+            data = {'code': 'NoRoute'}
+
+        if data.get('code') != 'Ok' or not data.get('routes'):
+            # No road between the points: an answer, not a failure, so it is cached.
+            return {'distance': None, 'duration': None, 'polyline': ''}
+
+        route = data['routes'][0]
+        return {
+            'distance': route['distance'] / 1000,
+            'duration': route['duration'] / 3600,
+            'polyline': route['geometry'],
+        }
+
+    def _error_code(self, error):
+        try:
+            return json.loads(error.read()).get('code')
+        except (ValueError, AttributeError):
+            return None
+
+
+class LocalRoutingProvider:
+    """
+    Straight-line routes at ROUTING_LOCAL_SPEED km/h, computed without network
+    access. Meant for tests and offline development.
+    """
+
+    def route(self, origin, destination):
+        lat1, lon1, lat2, lon2 = map(math.radians, (origin['lat'], origin['lon'], destination['lat'], destination['lon']))
+        a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+        distance = 2 * 6371 * math.asin(math.sqrt(a))
+        return {
+            'distance': distance,
+            'duration': distance / getattr(settings, 'ROUTING_LOCAL_SPEED', 80),
+            'polyline': encode_polyline([(origin['lat'], origin['lon']), (destination['lat'], destination['lon'])]),
+        }
+
+
+@lru_cache(maxsize=None)
+def get_provider():
+    return import_string(settings.ROUTING_PROVIDER)()
+
+
+class _InflightCall:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+
+
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+
+def _failure_cache():
+    return caches[getattr(settings, 'ROUTING_FAILURE_CACHE_BACKEND', 'default')]
+
+
+def _failure_key(key):
+    return f"route-failed:{key}"
+
+
+def _fetch_coalesced(key, origin, destination):
+    """
+    Fetch one leg upstream. Concurrent callers asking for the same leg wait
+    for the first caller's request instead of issuing their own.
+    """
+
+    with _inflight_lock:
+        call = _inflight.get(key)
+        leader = call is None
+        if leader:
+            call = _inflight[key] = _InflightCall()
+
+    if not leader:
+        call.done.wait()
+        return call.result
+
+    try:
+        route = get_provider().route(origin, destination)
+        RouteCache.objects.update_or_create(key=key, defaults=route)
+        call.result = route
+    except Exception as e:
+        logger.warning("Routing %s failed: %s", key, e)
+        # Don't ask again for a while; every request for this leg would wait on the timeout.
+        _failure_cache().set(_failure_key(key), True, getattr(settings, 'ROUTING_FAILURE_TTL', 60))
+    finally:
+        with _inflight_lock:
+            del _inflight[key]
+        call.done.set()
+
+    return call.result
+
+
+def route_many(legs, fetch=True):
+    """
+    Resolve (origin, destination) pairs to {'distance', 'duration', 'polyline'}
+    dicts keyed by route_key; distance and duration are None when there is no
+    road between the points. Cached legs are read with a single query.
+
+    With `fetch`, each missing leg costs at most one upstream call, except
+    legs that failed in the last ROUTING_FAILURE_TTL seconds. Failed or
+    skipped legs are left out.
+    """
+
+    keyed = {route_key(origin, destination): (origin, destination) for origin, destination in legs}
+    if not keyed:
+        return {}
+
+    routes = {
+        entry['key']: {'distance': entry['distance'], 'duration': entry['duration'], 'polyline': entry['polyline']}
+        for entry in RouteCache.objects.filter(key__in=list(keyed)).values('key', 'distance', 'duration', 'polyline')
+    }
+
+    missing = set(keyed) - set(routes)
+    if not fetch or not missing:
+        return routes
+
+    failed = _failure_cache().get_many([_failure_key(key) for key in missing])
+    for key in missing:
+        if _failure_key(key) in failed:
+            continue
+        route = _fetch_coalesced(key, *keyed[key])
+        if route is not None:
+            routes[key] = route
+
+    return routes
+
+
+def log_sheet_legs(coordinates):
+    """
+    The legs a log sheet drives: currentLocation -> pickup -> dropoff, skipping
+    any stop that has no coordinates (the same walk the client performs).
+    """
+
+    coordinates = coordinates or {}
+    stops = [coordinates.get(field) for field in ('currentLocation', 'pickup', 'dropoff')]
+    stops = [stop for stop in stops if stop]
+    return list(zip(stops, stops[1:]))
@@ -0,0 +1,177 @@
+# core/services/tripcache.py
+
+import hashlib
+import json
+import threading
+import uuid
+from collections import OrderedDict
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+from rest_framework.utils.encoders import JSONEncoder
+from core.services.metrics import request_metrics
+
+# stats() keys served on metrics/ as eld_trip_cache_*.
+STATS_METRICS = {
+    'size': ('entries', 'gauge', "get-trip-byid/ responses cached in this worker."),
+    'hits': ('hits_total', 'counter', "Lookups served from the cache."),
+    'misses': ('misses_total', 'counter', "Lookups that serialized the trip."),
+    'notModified': ('not_modified_total', 'counter', "Requests answered with 304 Not Modified."),
+    'invalidations': ('invalidations_total', 'counter', "Trip versions retired by writes."),
+    'hitRate': ('hit_rate', 'gauge', "Share of lookups served from the cache."),
+}
+
+
+class TripResponseCache:
+    """
+    Per-process LRU of serialized get-trip-byid/ payloads and their ETags.
+
+    Entries are keyed by (tripId, version). The current version of each trip
+    is a random token kept in the TRIP_CACHE_BACKEND Django cache; writes
+    replace it once their transaction commits, which orphans every cached
+    copy at once. Readers look the version up before querying, so a payload
+    built from pre-commit rows can only ever be stored under the old version.
+    The backend must be shared when running several workers, see check().
+    """
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.notModified = 0
+        self.invalidations = 0
+
+    @property
+    def max_size(self):
+        return getattr(settings, 'TRIP_CACHE_MAX_SIZE', 1000)
+
+    @property
+    def versions(self):
+        return caches[getattr(settings, 'TRIP_CACHE_BACKEND', 'default')]
+
+    @property
+    def version_ttl(self):
+        return getattr(settings, 'TRIP_CACHE_VERSION_TTL', 86400)
+
+    def check(self):
+        """
+        Raise ImproperlyConfigured when several workers would each keep their
+        own versions: a write on one worker would not retire the copies the
+        others serve.
+        """
+
+        if getattr(settings, 'SOCKETIO_CLIENT_MANAGER', 'local') == 'local':
+            return
+        alias = getattr(settings, 'TRIP_CACHE_BACKEND', 'default')
+        if isinstance(caches[alias], LocMemCache):
+            raise ImproperlyConfigured(
+                f"TRIP_CACHE_BACKEND ({alias!r}) is a per-process cache; point it at a cache shared by "
+                f"all workers (Redis, Memcached, database) or set SOCKETIO_CLIENT_MANAGER to 'local'."
+            )
+
+    def _version_key(self, trip_id):
+        return f"trip-version:{trip_id}"
+
+    def version(self, trip_id):
+        key = self._version_key(trip_id)
+        version = self.versions.get(key)
+        if version is None:
+            # A missing version (never set, expired or evicted) must not resurrect old entries.
+            self.versions.add(key, uuid.uuid4().hex, self.version_ttl)
+            version = self.versions.get(key)
+        return version
+
+    async def aversion(self, trip_id):
+        key = self._version_key(trip_id)
+        version = await self.versions.aget(key)
+        if version is None:
+            await self.versions.aadd(key, uuid.uuid4().hex, self.version_ttl)
+            version = await self.versions.aget(key)
+        return version
+
+    def _entry(self, payload):
+        body = json.dumps(payload, cls=JSONEncoder, sort_keys=True).encode()
+        return payload, f'"{hashlib.sha1(body).hexdigest()}"'
+
+    def _lookup(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            return entry
+
+    def _store(self, key, entry):
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return entry
+
+    def get(self, trip_id, build):
+        """
+        Return (payload, etag) for `trip_id`, calling `build()` to serialize
+        the trip on a miss.
+        """
+
+        version = self.version(trip_id)
+        if version is None:
+            # The version store is not keeping anything (e.g. DummyCache); never cache.
+            return self._entry(build())
+
+        key = (str(trip_id), version)
+        return self._lookup(key) or self._store(key, self._entry(build()))
+
+    async def aget(self, trip_id, build):
+        """get() for async views; `build` is a coroutine function."""
+
+        version = await self.aversion(trip_id)
+        if version is None:
+            return self._entry(await build())
+
+        key = (str(trip_id), version)
+        return self._lookup(key) or self._store(key, self._entry(await build()))
+
+    def record_not_modified(self):
+        with self._lock:
+            self.notModified += 1
+
+    def invalidate(self, trip_id):
+        """
+        Retire every cached copy of `trip_id` once the current transaction
+        commits (immediately outside one).
+        """
+
+        def bump():
+            self.versions.set(self._version_key(trip_id), uuid.uuid4().hex, self.version_ttl)
+            with self._lock:
+                self.invalidations += 1
+                for key in [key for key in self._entries if key[0] == str(trip_id)]:
+                    del self._entries[key]
+
+        transaction.on_commit(bump)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'notModified': self.notModified,
+                'invalidations': self.invalidations,
+                'hitRate': round(self.hits / lookups, 4) if lookups else 0,
+            }
+
+
+trip_cache = TripResponseCache()
+request_metrics.add_stats('eld_trip_cache', trip_cache.stats, STATS_METRICS)
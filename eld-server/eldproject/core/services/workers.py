@@ -0,0 +1,10 @@
+# core/services/workers.py
+#
+# Kept free of model imports: spawned pool workers import this module to run
+# the initializer before anything that needs the app registry.
+
+def setup_django():
+    """ProcessPoolExecutor initializer for spawned workers that use the ORM."""
+
+    import django
+    django.setup()
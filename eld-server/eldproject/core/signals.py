@@ -0,0 +1,37 @@
+# core/signals.py
+
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from core.models.driver import Driver
+from core.models.trip import Trip
+from core.models.logSheet import LogSheet
+from core.services.auth import driver_cache
+from core.services.metrics import request_metrics
+from core.services.tripcache import trip_cache
+
+
+@receiver(post_save, sender=Driver)
+@receiver(post_delete, sender=Driver)
+def invalidate_cached_driver(sender, instance, **kwargs):
+    driver_cache.invalidate(instance.uniqueId)
+
+
+# Bulk writes in the trip views skip these and invalidate explicitly. There is
+# deliberately no LogSheet post_delete receiver: it would stop trip deletes
+# from removing their log sheets in a single query.
+@receiver(post_save, sender=Trip)
+@receiver(post_delete, sender=Trip)
+def invalidate_cached_trip(sender, instance, **kwargs):
+    trip_cache.invalidate(instance.uniqueId)
+
+
+@receiver(post_save, sender=LogSheet)
+def invalidate_cached_log_sheet_trip(sender, instance, **kwargs):
+    trip_cache.invalidate(instance.tripId_id)
+
+
+# Every connection, in every thread, reports its queries to the request being recorded.
+@receiver(connection_created)
+def instrument_connection(sender, connection, **kwargs):
+    request_metrics.install(connection)
@@ -1,34 +1,115 @@
 import socketio
+from http.cookies import SimpleCookie
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ValidationError
+from core.models import Trip
+from core.serializers.driverSerializers import VerifyTokenSerializer
+from core.sockets.limits import message_limiter
+from core.sockets.rooms import room_registry
+
+
+def _verify_token(token):
+    serializer = VerifyTokenSerializer(data={"token": token})
+    if not serializer.is_valid():
+        return None
+    return serializer.validated_data["driver"]
+
+
+async def authenticate(environ):
+    """
+    Resolve the driver from the same JWT cookie the HTTP API uses, or None.
+    """
+
+    cookies = SimpleCookie()
+    cookies.load(environ.get("HTTP_COOKIE", ""))
+    token = cookies.get("token")
+    if token is None:
+        return None
+    try:
+        return await sync_to_async(_verify_token)(token.value)
+    except Exception:
+        return None
+
 
 def register_socket_events(sio: socketio.AsyncServer):
+    async def can_use(sid, room):
+        # A driver may use its own private room and the trip_<uniqueId> room
+        # of each of its trips, e.g. to follow one trip from several devices.
+        session = await sio.get_session(sid)
+        if room == session.get("room"):
+            return True
+        if not room.startswith("trip_"):
+            return False
+        try:
+            return await Trip.objects.filter(uniqueId=room[len("trip_"):], driverId__email=session.get("email")).aexists()
+        except ValidationError:
+            return False
+
     @sio.event
-    async def connect(sid, environ):
-        print(f"🔌 Client Connected: {sid}")
+    async def connect(sid, environ, auth=None):
+        driver = await authenticate(environ)
+        if driver is None:
+            raise socketio.exceptions.ConnectionRefusedError("Unauthorized")
+
+        print(f"🔌 Client Connected: {sid} ({driver.email})")
+
+        room = f"user_{driver.email}"
+        identity = (auth or {}).get("clientId") or str(driver.uniqueId)
+        await sio.save_session(sid, {"identity": identity, "email": driver.email, "room": room})
+        await sio.enter_room(sid, room)
+
+        # Put a reconnecting client back in the rooms it had joined, minus
+        # those it may no longer use (e.g. trips deleted since).
+        for joined in await room_registry.rooms(identity):
+            if joined == room:
+                continue
+            if await can_use(sid, joined):
+                await sio.enter_room(sid, joined)
+            else:
+                await room_registry.remove(identity, joined)
 
     @sio.event
     async def disconnect(sid):
+        message_limiter.forget(sid)
         print(f"⚡ Client Disconnected: {sid}")
 
     @sio.event
     async def join_room(sid, data):
-        room = data.get("room")
-        if room:
-            await sio.enter_room(sid, room)
-            print(f"🏠 {sid} joined room: {room}")
-            await sio.emit("room_message", {"message": f"Welcome to {room}!"}, room=room)
+        room = (data or {}).get("room")
+        if not room:
+            return
+        if not await can_use(sid, room):
+            await sio.emit("message_rejected", {"error": f"Not allowed to join {room}"}, to=sid)
+            return
+
+        await sio.enter_room(sid, room)
+        await room_registry.add((await sio.get_session(sid))["identity"], room)
+        print(f"🏠 {sid} joined room: {room}")
 
     @sio.event
     async def leave_room(sid, data):
-        room = data.get("room")
+        room = (data or {}).get("room")
         if room:
             await sio.leave_room(sid, room)
+            await room_registry.remove((await sio.get_session(sid))["identity"], room)
             print(f"🚪 {sid} left room: {room}")
-            await sio.emit("room_message", {"message": f"{sid} left the room."}, room=room)
 
     @sio.event
     async def send_message(sid, data):
+        if not isinstance(data, dict):
+            return
         room = data.get("room")
         message = data.get("message")
-        if room and message:
-            print(f"📩 Message in {room} from {sid}: {message}")
-            await sio.emit("room_message", {"message": message}, room=room)
+        if not (room and message):
+            return
+        if room not in sio.rooms(sid) or room == sid:
+            await sio.emit("message_rejected", {"error": f"Not a member of {room}"}, to=sid)
+            return
+
+        error = message_limiter.check(sid, data)
+        if error:
+            await sio.emit("message_rejected", {"error": error}, to=sid)
+            return
+
+        print(f"📩 Message in {room} from {sid}")
+        await sio.emit("room_message", {"message": message, "senderId": sid}, room=room)
@@ -0,0 +1,81 @@
+# core/sockets/limits.py
+
+import json
+import time
+from django.conf import settings
+from core.services.metrics import request_metrics
+
+# stats() keys served on metrics/ as eld_socket_messages_*.
+STATS_METRICS = {
+    'sids': ('connections', 'gauge', "Connections holding a message rate bucket."),
+    'allowed': ('allowed_total', 'counter', "Client messages let through."),
+    'rateLimited': ('rate_limited_total', 'counter', "Client messages refused by the rate limit."),
+    'tooLarge': ('too_large_total', 'counter', "Client messages refused for their size."),
+}
+
+
+class MessageLimiter:
+    """
+    Per-sid token bucket for client-sent messages. Each sid may send
+    SOCKETIO_MESSAGE_RATE messages per second on average, with bursts of up to
+    SOCKETIO_MESSAGE_BURST; payloads over SOCKETIO_MAX_MESSAGE_BYTES are
+    refused outright. Buckets live on the event loop, so no locking is needed.
+    """
+
+    def __init__(self):
+        self._buckets = {}
+        self.allowed = 0
+        self.rateLimited = 0
+        self.tooLarge = 0
+
+    @property
+    def rate(self):
+        return getattr(settings, 'SOCKETIO_MESSAGE_RATE', 5)
+
+    @property
+    def burst(self):
+        return getattr(settings, 'SOCKETIO_MESSAGE_BURST', 10)
+
+    @property
+    def max_bytes(self):
+        return getattr(settings, 'SOCKETIO_MAX_MESSAGE_BYTES', 4096)
+
+    def check(self, sid, data):
+        """
+        Return None when `sid` may send `data`, otherwise the reason it may not.
+        """
+
+        try:
+            size = len(json.dumps(data, separators=(',', ':')).encode())
+        except (TypeError, ValueError):
+            size = None
+        if size is None or size > self.max_bytes:
+            self.tooLarge += 1
+            return f"Message exceeds {self.max_bytes} bytes"
+
+        now = time.monotonic()
+        tokens, updated = self._buckets.get(sid, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - updated) * self.rate)
+        if tokens < 1:
+            self._buckets[sid] = (tokens, now)
+            self.rateLimited += 1
+            return "Rate limit exceeded"
+
+        self._buckets[sid] = (tokens - 1, now)
+        self.allowed += 1
+        return None
+
+    def forget(self, sid):
+        self._buckets.pop(sid, None)
+
+    def stats(self):
+        return {
+            'sids': len(self._buckets),
+            'allowed': self.allowed,
+            'rateLimited': self.rateLimited,
+            'tooLarge': self.tooLarge,
+        }
+
+
+message_limiter = MessageLimiter()
+request_metrics.add_stats('eld_socket_messages', message_limiter.stats, STATS_METRICS)
@@ -0,0 +1,160 @@
+# core/sockets/managers.py
+
+import asyncio
+import glob
+import json
+import logging
+import os
+import socket
+import struct
+import time
+import uuid
+import socketio
+from socketio.async_pubsub_manager import AsyncPubSubManager
+from django.conf import settings
+from core.sockets.rooms import room_registry
+
+logger = logging.getLogger(__name__)
+
+# Every datagram starts with the message id, the chunk index and the chunk count.
+CHUNK_HEADER = struct.Struct('!16sII')
+
+
+class UnixSocketManager(AsyncPubSubManager):
+    """
+    Fans Socket.IO events out between worker processes on one machine.
+
+    Every worker binds a datagram socket at <SOCKETIO_UNIX_BUS_DIR>/<channel>-<host_id>.sock
+    and publishes by sending each message to all the other sockets in the
+    directory, so no broker is needed. Sockets left behind by dead workers
+    are removed the first time a send to them is refused.
+
+    A datagram cannot be larger than the socket send buffer, so messages are
+    split into chunks of at most SOCKETIO_UNIX_BUS_CHUNK_BYTES and put back
+    together by the receiver. A peer whose receive queue is full is retried
+    for up to SOCKETIO_UNIX_BUS_SEND_TIMEOUT seconds before the message is
+    dropped for it, with a warning.
+    """
+
+    name = 'unixsocket'
+
+    def __init__(self, directory, channel='socketio', write_only=False, logger=None):
+        super().__init__(channel=channel, write_only=write_only, logger=logger)
+        self.directory = directory
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        self.path = os.path.join(directory, f"{channel}-{self.host_id}.sock")
+        self._sender = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._sender.setblocking(False)
+
+    def _peers(self):
+        return [
+            path for path in glob.glob(os.path.join(self.directory, f"{self.channel}-*.sock"))
+            if path != self.path
+        ]
+
+    @property
+    def chunk_bytes(self):
+        return getattr(settings, 'SOCKETIO_UNIX_BUS_CHUNK_BYTES', 65536)
+
+    def _chunks(self, message):
+        size = self.chunk_bytes - CHUNK_HEADER.size
+        count = max(1, -(-len(message) // size))
+        message_id = uuid.uuid4().bytes
+        return [
+            CHUNK_HEADER.pack(message_id, index, count) + message[index * size:(index + 1) * size]
+            for index in range(count)
+        ]
+
+    async def _send(self, chunk, path, deadline):
+        while True:
+            try:
+                self._sender.sendto(chunk, path)
+                return
+            except BlockingIOError:
+                # The peer's receive queue is full; give it a moment to drain.
+                if time.monotonic() >= deadline:
+                    raise
+                await asyncio.sleep(0.001)
+
+    async def _publish(self, data):
+        message = json.dumps(data).encode('utf-8')
+        chunks = self._chunks(message)
+        for path in self._peers():
+            deadline = time.monotonic() + getattr(settings, 'SOCKETIO_UNIX_BUS_SEND_TIMEOUT', 1.0)
+            try:
+                for chunk in chunks:
+                    await self._send(chunk, path, deadline)
+            except (ConnectionRefusedError, FileNotFoundError):
+                # The worker behind this socket is gone.
+                try:
+                    os.unlink(path)
+                except FileNotFoundError:
+                    pass
+            except OSError as e:
+                logger.warning("Socket.IO bus: could not deliver %d bytes to %s: %s", len(message), path, e)
+
+    async def _listen(self):
+        receiver = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        receiver.setblocking(False)
+        receiver.bind(self.path)
+        loop = asyncio.get_running_loop()
+        # Partly received messages by id: (first chunk time, chunk count, chunks so far).
+        partial = {}
+        try:
+            while True:
+                datagram = await loop.sock_recv(receiver, self.chunk_bytes)
+                message_id, index, count = CHUNK_HEADER.unpack_from(datagram)
+                body = datagram[CHUNK_HEADER.size:]
+                if count == 1:
+                    yield body
+                    continue
+
+                now = time.monotonic()
+                received_at, _, chunks = partial.setdefault(message_id, (now, count, {}))
+                chunks[index] = body
+                if len(chunks) == count:
+                    del partial[message_id]
+                    yield b''.join(chunks[i] for i in range(count))
+                # A sender that gave up midway leaves an incomplete message behind.
+                for stale in [key for key, (started, _, _) in partial.items() if now - started > 60]:
+                    logger.warning("Socket.IO bus: dropped an incomplete message of %d chunks", partial.pop(stale)[1])
+        finally:
+            receiver.close()
+            try:
+                os.unlink(self.path)
+            except FileNotFoundError:
+                pass
+
+
+def start_client_manager(sio):
+    """
+    Initialize `sio`'s client manager now (idempotent), as the server would on
+    its first Socket.IO connection, so a worker listens to the bus from its
+    first request on.
+    """
+
+    if not sio.manager_initialized:
+        sio.manager_initialized = True
+        sio.manager.initialize()
+
+
+def build_client_manager():
+    """
+    The client manager selected by settings.SOCKETIO_CLIENT_MANAGER:
+    "local" (single process), "unix" (processes on one machine) or
+    "redis" (processes on any number of machines).
+    """
+
+    kind = getattr(settings, 'SOCKETIO_CLIENT_MANAGER', 'local')
+    channel = getattr(settings, 'SOCKETIO_CHANNEL', 'eld-socketio')
+
+    if kind != 'local':
+        room_registry.check()
+
+    if kind == 'unix':
+        return UnixSocketManager(settings.SOCKETIO_UNIX_BUS_DIR, channel=channel)
+    if kind == 'redis':
+        return socketio.AsyncRedisManager(settings.SOCKETIO_REDIS_URL, channel=channel)
+    if kind == 'local':
+        return None
+    raise ValueError(f"Unknown SOCKETIO_CLIENT_MANAGER: {kind}")
@@ -0,0 +1,159 @@
+# core/sockets/outbox.py
+
+import asyncio
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+from django.conf import settings
+from django.db import transaction
+from rest_framework.utils.encoders import JSONEncoder
+
+logger = logging.getLogger(__name__)
+
+# stats() keys served on metrics/ as eld_socket_outbox_*.
+STATS_METRICS = {
+    'queued': ('queued', 'gauge', "Events waiting to be delivered."),
+    'enqueued': ('enqueued_total', 'counter', "Events queued for delivery."),
+    'delivered': ('delivered_total', 'counter', "Events delivered."),
+    'dropped': ('dropped_total', 'counter', "Events dropped because the outbox was full."),
+    'batches': ('batches_total', 'counter', "Emits, one per room and flush."),
+    'avgLagMs': ('lag_avg_milliseconds', 'gauge', "Average time from queueing an event to delivering it."),
+    'maxLagMs': ('lag_max_milliseconds', 'gauge', "Longest time from queueing an event to delivering it."),
+}
+
+
+class EventOutbox:
+    """
+    Decouples HTTP writes from Socket.IO delivery.
+
+    Views call publish() and return immediately; the event is queued once the
+    surrounding transaction commits. A background task on the Socket.IO event
+    loop drains the queue every SOCKET_OUTBOX_FLUSH_INTERVAL seconds and emits
+    per room: a single event as-is, several as one `event_batch` message.
+
+    The queue holds at most SOCKET_OUTBOX_MAX_SIZE events. A full queue makes
+    writers wait up to SOCKET_OUTBOX_PUT_TIMEOUT seconds, then the event is
+    dropped and counted.
+    """
+
+    def __init__(self, sio):
+        self.sio = sio
+        self._buffer = deque()
+        self._not_full = threading.Condition()
+        self._loop = None
+        self._wakeup = None
+        self._task = None
+
+        self.enqueued = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.batches = 0
+        self.totalLag = 0.0
+        self.maxLag = 0.0
+
+    @property
+    def max_size(self):
+        return getattr(settings, 'SOCKET_OUTBOX_MAX_SIZE', 10000)
+
+    def start(self):
+        """
+        Start the drain task on the running event loop (idempotent). Called
+        by the ASGI application on every request, so a worker that only
+        serves HTTP writes still delivers its events (to other workers'
+        clients, through the client manager).
+        """
+
+        loop = asyncio.get_running_loop()
+        if self._task is not None and not self._task.done() and self._loop is loop:
+            return
+        self._loop = loop
+        self._wakeup = asyncio.Event()
+        self._task = self._loop.create_task(self._drain_forever())
+        if self._buffer:
+            self._wakeup.set()
+
+    def publish(self, event, data, room):
+        """
+        Queue `event` for `room` once the current transaction commits.
+        """
+
+        # Serializer output may still hold UUIDs and Decimals.
+        data = json.loads(json.dumps(data, cls=JSONEncoder))
+        transaction.on_commit(lambda: self.enqueue(event, data, room))
+
+    async def apublish(self, event, data, room):
+        """
+        publish() for async views, which run outside transactions: queue the
+        event right away, dropping it rather than block the loop when full.
+        """
+
+        data = json.loads(json.dumps(data, cls=JSONEncoder))
+        self.enqueue(event, data, room, timeout=0)
+
+    def enqueue(self, event, data, room, timeout=None):
+        if timeout is None:
+            timeout = getattr(settings, 'SOCKET_OUTBOX_PUT_TIMEOUT', 0.1)
+        with self._not_full:
+            if len(self._buffer) >= self.max_size and timeout:
+                self._not_full.wait(timeout=timeout)
+            if len(self._buffer) >= self.max_size:
+                self.dropped += 1
+                logger.warning("Socket outbox full, dropped %s for %s", event, room)
+                return
+            self._buffer.append((time.monotonic(), event, data, room))
+            self.enqueued += 1
+
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    async def _drain_forever(self):
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            # Give writers a moment so bursts go out together.
+            await asyncio.sleep(getattr(settings, 'SOCKET_OUTBOX_FLUSH_INTERVAL', 0.05))
+            await self.flush()
+
+    async def flush(self):
+        with self._not_full:
+            items = list(self._buffer)
+            self._buffer.clear()
+            self._not_full.notify_all()
+        if not items:
+            return
+
+        rooms = OrderedDict()
+        for item in items:
+            rooms.setdefault(item[3], []).append(item)
+
+        for room, room_items in rooms.items():
+            try:
+                if len(room_items) == 1:
+                    _, event, data, _ = room_items[0]
+                    await self.sio.emit(event, data, room=room)
+                else:
+                    batch = [{'event': event, 'data': data} for _, event, data, _ in room_items]
+                    await self.sio.emit('event_batch', batch, room=room)
+            except Exception:
+                logger.exception("Failed to deliver %d events to %s", len(room_items), room)
+                continue
+
+            delivered_at = time.monotonic()
+            lags = [delivered_at - item[0] for item in room_items]
+            self.delivered += len(room_items)
+            self.batches += 1
+            self.totalLag += sum(lags)
+            self.maxLag = max(self.maxLag, *lags)
+
+    def stats(self):
+        return {
+            'queued': len(self._buffer),
+            'enqueued': self.enqueued,
+            'delivered': self.delivered,
+            'dropped': self.dropped,
+            'batches': self.batches,
+            'avgLagMs': round(self.totalLag / self.delivered * 1000, 2) if self.delivered else 0,
+            'maxLagMs': round(self.maxLag * 1000, 2),
+        }
@@ -0,0 +1,57 @@
+# core/sockets/rooms.py
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.exceptions import ImproperlyConfigured
+
+
+class RoomRegistry:
+    """
+    Remembers which rooms a client identity has joined, so a reconnecting
+    client (new sid, possibly on another worker) is put back in them. Stored
+    in the SOCKETIO_ROOM_REGISTRY_CACHE cache, which must be shared between
+    workers whenever SOCKETIO_CLIENT_MANAGER is not "local".
+    """
+
+    def _cache(self):
+        return caches[getattr(settings, 'SOCKETIO_ROOM_REGISTRY_CACHE', 'default')]
+
+    def check(self):
+        """
+        Raise ImproperlyConfigured when several workers would each keep their
+        own registry: a client reconnecting to another worker would silently
+        lose its rooms.
+        """
+
+        if getattr(settings, 'SOCKETIO_CLIENT_MANAGER', 'local') == 'local':
+            return
+        alias = getattr(settings, 'SOCKETIO_ROOM_REGISTRY_CACHE', 'default')
+        if isinstance(caches[alias], (LocMemCache, DummyCache)):
+            raise ImproperlyConfigured(
+                f"SOCKETIO_ROOM_REGISTRY_CACHE ({alias!r}) is a per-process cache; point it at a cache "
+                f"shared by all workers (Redis, Memcached, database) or set SOCKETIO_CLIENT_MANAGER to 'local'."
+            )
+
+    def _key(self, identity):
+        return f"socket-rooms:{identity}"
+
+    def _ttl(self):
+        return getattr(settings, 'SOCKETIO_ROOM_REGISTRY_TTL', 86400)
+
+    async def rooms(self, identity):
+        return await self._cache().aget(self._key(identity), [])
+
+    async def add(self, identity, room):
+        rooms = await self.rooms(identity)
+        if room not in rooms:
+            rooms.append(room)
+        await self._cache().aset(self._key(identity), rooms, self._ttl())
+
+    async def remove(self, identity, room):
+        rooms = [joined for joined in await self.rooms(identity) if joined != room]
+        await self._cache().aset(self._key(identity), rooms, self._ttl())
+
+
+room_registry = RoomRegistry()
@@ -1,3 +1,958 @@
-from django.test import TestCase
+import asyncio
+import csv
+import io
+import json
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from unittest import mock
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.signals import setting_changed
+from django.db import connection
+from django.dispatch import receiver
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings, skipUnlessDBFeature
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+from rest_framework.utils.encoders import JSONEncoder
+from core.models import Driver, Trip, LogSheet, Sequence, DriverDailyHours, RouteCache, GeocodeCache
+from core.serializers.fastSerializers import driver_trips_values, serialize_driver_trips, serialize_trip_data
+from core.serializers.tripSerializers import GetDriverTripsSerializer, GetTripDataSerializer, attach_route_legs
+from core.services import geocoding, routing
+from core.services.hos import attach_duty_totals, compute_duty_totals, compute_duty_grid, hos_status, DRIVING, ON_DUTY
+from core.services.passwords import password_hasher, PasswordHashingBusy
 
-# Create your tests here.
+
+# Tests that write trips or log sheets resolve locations and legs offline.
+local_providers = override_settings(
+    GEOCODING_PROVIDER='core.services.geocoding.LocalGeocodingProvider',
+    GEOCODING_LOCAL_COORDINATES={'Chicago, IL': (41.8781, -87.6298), 'Denver, CO': (39.7392, -104.9903)},
+    ROUTING_PROVIDER='core.services.routing.LocalRoutingProvider',
+)
+
+
+@receiver(setting_changed)
+def reset_providers(setting, **kwargs):
+    if setting in ('GEOCODING_PROVIDER', 'GEOCODING_LOCAL_COORDINATES'):
+        geocoding.get_provider.cache_clear()
+    elif setting == 'ROUTING_PROVIDER':
+        routing.get_provider.cache_clear()
+
+
+def create_driver(name='driver', password='secret-password'):
+    return Driver.objects.create(
+        fullName=name.title(), username=name, email=f"{name}@example.com", password=password,
+    )
+
+
+@override_settings(BCRYPT_ROUNDS=4)
+class DriverAuthTests(TestCase):
+    def test_register_and_login(self):
+        response = self.client.post('/api/register/', {
+            'fullName': 'New Driver', 'username': 'new', 'email': 'new@example.com', 'password': 'secret-password',
+        }, content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(Driver.objects.get(username='new').password.startswith('$2b$04$'))
+
+        response = self.client.post('/api/login/', {'email': 'new@example.com', 'password': 'secret-password'},
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('token', response.cookies)
+
+    def test_login_rejects_a_wrong_password(self):
+        create_driver()
+        response = self.client.post('/api/login/', {'email': 'driver@example.com', 'password': 'wrong'},
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {'error': ['Invalid password']})
+
+    def test_busy_hashing_pool_is_a_503(self):
+        create_driver()
+        with mock.patch.object(password_hasher, 'acheck', side_effect=PasswordHashingBusy("busy")):
+            response = self.client.post('/api/login/', {'email': 'driver@example.com', 'password': 'secret-password'},
+                                        content_type='application/json')
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response['Retry-After'], str(password_hasher.retry_after))
+
+
+@override_settings(BCRYPT_ROUNDS=4, DRIVER_CACHE_BACKEND=None)
+class DriverCacheTests(TestCase):
+    def setUp(self):
+        from core.services.auth import driver_cache
+        driver_cache.clear()
+        self.driver = create_driver()
+        self.client.post('/api/login/', {'email': 'driver@example.com', 'password': 'secret-password'},
+                         content_type='application/json')
+
+    def verify(self):
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.post('/api/verify-token/')
+        self.assertEqual(response.status_code, 200)
+        return [query['sql'] for query in captured if 'FROM "core_driver"' in query['sql']]
+
+    def test_a_verified_token_is_not_looked_up_again(self):
+        self.assertEqual(len(self.verify()), 1)
+        self.assertEqual(self.verify(), [])
+
+    def test_saving_or_deleting_the_driver_drops_the_entry(self):
+        self.verify()
+        self.driver.fullName = 'Renamed'
+        self.driver.save()
+        self.assertEqual(len(self.verify()), 1)
+        self.assertEqual(self.client.post('/api/verify-token/').json()['driver']['fullName'], 'Renamed')
+
+        self.driver.delete()
+        self.assertEqual(self.client.post('/api/verify-token/').status_code, 401)
+
+
+def asgi_http_scope(path):
+    return {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET', 'scheme': 'http',
+        'path': path, 'raw_path': path.encode(), 'query_string': b'', 'headers': [(b'host', b'testserver')],
+        'server': ('testserver', 80), 'client': ('127.0.0.1', 0),
+    }
+
+
+class EventOutboxTests(TestCase):
+    def test_worker_without_socket_clients_drains_its_outbox(self):
+        from eldproject.asgi import application, outbox
+        emitted = []
+
+        async def emit(event, data, room=None):
+            emitted.append((event, room))
+
+        async def serve_one_request_then_publish():
+            requests = [{'type': 'http.request', 'body': b''}]
+
+            async def receive():
+                return requests.pop() if requests else {'type': 'http.disconnect'}
+
+            async def send(message):
+                pass
+
+            await application(asgi_http_scope('/socket.io/'), receive, send)
+            outbox.enqueue('trip_created', {'uniqueId': 'trip'}, room='user_outbox@example.com')
+            await asyncio.sleep(getattr(settings, 'SOCKET_OUTBOX_FLUSH_INTERVAL', 0.05) * 4)
+
+        with mock.patch.object(outbox.sio, 'emit', emit):
+            asyncio.run(serve_one_request_then_publish())
+        # Other tests may have left events of their own in the queue.
+        self.assertIn(('trip_created', 'user_outbox@example.com'), emitted)
+
+
+@override_settings(BCRYPT_ROUNDS=4)
+@local_providers
+class SocketEventTests(TestCase):
+    def setUp(self):
+        import socketio
+        from core.sockets.handlers import register_socket_events
+        self.sio = socketio.AsyncServer(async_mode='asgi')
+        self.sessions = {}
+
+        async def save_session(sid, session):
+            self.sessions[sid] = session
+
+        async def get_session(sid):
+            return self.sessions[sid]
+
+        self.sio.save_session = save_session
+        self.sio.get_session = get_session
+        self.sio.enter_room = mock.AsyncMock()
+        self.sio.emit = mock.AsyncMock()
+        register_socket_events(self.sio)
+
+    def call(self, event, *args):
+        return async_to_sync(self.sio.handlers['/'][event])(*args)
+
+    def token(self, email):
+        response = self.client.post('/api/login/', {'email': email, 'password': 'secret-password'},
+                                    content_type='application/json')
+        return response.cookies['token'].value
+
+    def test_connections_without_a_valid_token_are_refused(self):
+        from socketio.exceptions import ConnectionRefusedError
+        for cookie in ('', 'token=not-a-jwt'):
+            with self.subTest(cookie=cookie), self.assertRaises(ConnectionRefusedError):
+                self.call('connect', 'sid', {'HTTP_COOKIE': cookie})
+        self.sio.enter_room.assert_not_called()
+
+    def test_only_the_drivers_own_trip_rooms_can_be_joined(self):
+        create_driver()
+        create_driver('other')
+        own_trip_id = create_trip(self.client)
+        other_trip_id = create_trip(self.client, email='other@example.com')
+        self.call('connect', 'sid', {'HTTP_COOKIE': f"token={self.token('driver@example.com')}"})
+        self.sio.enter_room.assert_awaited_once_with('sid', 'user_driver@example.com')
+
+        for room in (f"trip_{other_trip_id}", 'trip_not-a-uuid', 'user_other@example.com'):
+            self.sio.enter_room.reset_mock()
+            self.call('join_room', 'sid', {'room': room})
+            self.sio.enter_room.assert_not_called()
+            self.sio.emit.assert_awaited_with('message_rejected', {'error': f"Not allowed to join {room}"}, to='sid')
+
+        self.call('join_room', 'sid', {'room': f"trip_{own_trip_id}"})
+        self.sio.enter_room.assert_awaited_once_with('sid', f"trip_{own_trip_id}")
+
+
+@override_settings(SOCKETIO_MESSAGE_RATE=2, SOCKETIO_MESSAGE_BURST=3, SOCKETIO_MAX_MESSAGE_BYTES=64)
+class MessageLimiterTests(SimpleTestCase):
+    def setUp(self):
+        from core.sockets import limits
+        self.limiter = limits.MessageLimiter()
+        self.clock = mock.Mock(monotonic=mock.Mock(return_value=100.0))
+        patcher = mock.patch.object(limits, 'time', self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def send(self, count, data=None):
+        return [self.limiter.check('sid', data or {'message': 'hi'}) for _ in range(count)]
+
+    def test_bursts_then_refills_at_the_rate(self):
+        self.assertEqual(self.send(4), [None, None, None, "Rate limit exceeded"])
+        self.clock.monotonic.return_value += 0.5
+        self.assertEqual(self.send(2), [None, "Rate limit exceeded"])
+        self.clock.monotonic.return_value += 10
+        self.assertEqual(self.send(4), [None, None, None, "Rate limit exceeded"])
+        self.assertEqual((self.limiter.allowed, self.limiter.rateLimited), (7, 3))
+
+    def test_buckets_are_per_connection(self):
+        self.send(4)
+        self.assertIsNone(self.limiter.check('other', {'message': 'hi'}))
+
+    def test_large_messages_are_refused(self):
+        self.assertEqual(self.send(1, {'message': 'x' * 64}), ["Message exceeds 64 bytes"])
+        self.assertEqual(self.limiter.tooLarge, 1)
+        self.assertEqual(self.send(3), [None, None, None])
+
+
+class SocketBusTests(TestCase):
+    def test_unix_bus_delivers_messages_larger_than_a_datagram(self):
+        from core.sockets.managers import UnixSocketManager
+        data = {'method': 'emit', 'event': 'trip_updated', 'data': 'x' * 500000}
+
+        async def publish_and_receive(directory):
+            sender = UnixSocketManager(directory, channel='test')
+            receiver = UnixSocketManager(directory, channel='test')
+            messages = receiver._listen()
+            first = asyncio.ensure_future(messages.__anext__())
+            await asyncio.sleep(0.01)
+            await sender._publish(data)
+            received = await asyncio.wait_for(first, 5)
+            await messages.aclose()
+            return received
+
+        with tempfile.TemporaryDirectory() as directory, override_settings(SOCKETIO_UNIX_BUS_CHUNK_BYTES=16384):
+            self.assertEqual(json.loads(asyncio.run(publish_and_receive(directory))), data)
+
+    @override_settings(SOCKETIO_CLIENT_MANAGER='unix', SOCKETIO_ROOM_REGISTRY_CACHE='default')
+    def test_room_registry_needs_a_shared_cache_across_workers(self):
+        from core.sockets.managers import build_client_manager
+        with self.assertRaises(ImproperlyConfigured):
+            build_client_manager()
+
+
+@skipUnlessDBFeature('has_select_for_update')
+@override_settings(SEQUENCE_BLOCK_SIZES={'accountNumber': 1, 'tripNumber': 3, 'logNumber': 4})
+@local_providers
+class SequenceConcurrencyTests(TransactionTestCase):
+    def setUp(self):
+        Sequence.objects.forget_blocks()
+        create_driver()
+
+    def tearDown(self):
+        Sequence.objects.forget_blocks()
+
+    def create_trips(self, count):
+        try:
+            for index in range(count):
+                response = self.client_class().post('/api/create-trip/', {
+                    'email': 'driver@example.com', 'tripTitle': f"Trip {index}", 'pickup': 'Chicago, IL',
+                    'dropoff': 'Denver, CO', 'cycleUsed': '5',
+                    'logSheets': [{'currentLocation': 'Chicago, IL', 'pickup': 'Chicago, IL', 'dropoff': 'Denver, CO',
+                                   'currentCycleUsed': '5'}] * 2,
+                }, content_type='application/json')
+                self.assertEqual(response.status_code, 201, response.content)
+        finally:
+            connection.close()
+
+    def test_concurrent_trip_creation_numbers_are_unique_and_gap_free(self):
+        threads, trips_per_thread = 6, 5
+        with ThreadPoolExecutor(threads) as executor:
+            for future in [executor.submit(self.create_trips, trips_per_thread) for _ in range(threads)]:
+                future.result()
+
+        trip_count = threads * trips_per_thread
+        self.assertEqual(sorted(Trip.objects.values_list('tripNumber', flat=True)), list(range(1, trip_count + 1)))
+        self.assertEqual(sorted(LogSheet.objects.values_list('logNumber', flat=True)), list(range(1, 2 * trip_count + 1)))
+
+
+class FakeConnection:
+    def __init__(self, number):
+        self.number = number
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class ConnectionPoolTests(SimpleTestCase):
+    def pool(self, healthy=lambda connection: True, **kwargs):
+        from core.db.pool import ConnectionPool
+        opened = []
+
+        def connect():
+            opened.append(FakeConnection(len(opened) + 1))
+            return opened[-1]
+
+        pool = ConnectionPool(connect, healthy, lambda connection: not connection.closed, **kwargs)
+        return pool, opened
+
+    def test_checkouts_past_max_size_wait_then_time_out(self):
+        from core.db.pool import PoolTimeout
+        pool, opened = self.pool(max_size=2, timeout=0.05)
+        first, second = pool.acquire(), pool.acquire()
+        with self.assertRaises(PoolTimeout):
+            pool.acquire()
+        self.assertEqual((len(opened), pool.stats()['timeouts'], pool.stats()['inUse']), (2, 1, 2))
+
+        timer = threading.Timer(0.02, pool.release, [first])
+        timer.start()
+        pool.timeout = 5
+        self.assertIs(pool.acquire(), first)
+        timer.join()
+        stats = pool.stats()
+        self.assertEqual((stats['waits'], stats['checkouts'], stats['open']), (1, 3, 2))
+        self.assertGreater(stats['maxWaitMs'], 0)
+
+    def test_idle_connections_that_fail_their_health_check_are_replaced(self):
+        pool, opened = self.pool(healthy=lambda connection: connection.number > 1, health_check_interval=0)
+        pool.release(pool.acquire())
+        connection = pool.acquire()
+        self.assertEqual(connection.number, 2)
+        self.assertTrue(opened[0].closed)
+        stats = pool.stats()
+        self.assertEqual((stats['healthCheckFailures'], stats['discarded'], stats['checkouts'], stats['open']), (1, 1, 2, 1))
+
+    def test_connections_past_their_lifetime_are_replaced(self):
+        pool, opened = self.pool(max_lifetime=60)
+        connection = pool.acquire()
+        pool.release(connection)
+        pool._opened_at[id(connection)] -= 61
+        self.assertEqual(pool.acquire().number, 2)
+        self.assertTrue(connection.closed)
+        self.assertEqual((pool.stats()['checkouts'], pool.stats()['open']), (2, 1))
+
+    def test_a_failed_connect_does_not_hold_a_slot(self):
+        from core.db.pool import ConnectionPool
+        pool = ConnectionPool(mock.Mock(side_effect=OSError("refused")), None, None, max_size=1, timeout=0.01)
+        with self.assertRaises(OSError):
+            pool.acquire()
+        self.assertEqual((pool.stats()['open'], pool.stats()['checkouts']), (0, 0))
+        self.assertIsInstance(pool.acquire(lambda: FakeConnection(1)), FakeConnection)
+
+
+class CycleHoursFieldTests(SimpleTestCase):
+    def parse(self, value):
+        from core.serializers.fields import CycleHoursField
+        return CycleHoursField().run_validation(value)
+
+    def test_free_text_is_rounded_half_up_to_two_places(self):
+        self.assertEqual(self.parse('5 hrs'), Decimal('5'))
+        self.assertEqual(self.parse('5.555'), Decimal('5.56'))
+        self.assertEqual(self.parse('5.565 hours'), Decimal('5.57'))
+        self.assertIsNone(self.parse(''))
+
+    def test_migration_0013_parses_the_same_way(self):
+        from importlib import import_module
+        migration = import_module('core.migrations.0013_parse_cycle_hours')
+        for value in ('5 hrs', '5.555', '5.565 hours', '-5', '12345'):
+            with self.subTest(value=value):
+                try:
+                    parsed = self.parse(value)
+                except ValidationError:
+                    parsed = None
+                self.assertEqual(migration.parse_hours(value), parsed)
+
+    def test_negative_unparseable_and_oversized_hours_are_refused(self):
+        for value in ('-5', 'none yet', '12345', '9999.999'):
+            with self.subTest(value=value), self.assertRaises(ValidationError):
+                self.parse(value)
+
+
+def leg(distance, duration):
+    return {'distance': distance, 'duration': duration}
+
+
+class DutyTotalsTests(SimpleTestCase):
+    def test_driving_and_distance_add_up_over_the_legs(self):
+        totals = compute_duty_totals([leg(300, 4), leg(150.25, 2.5)], True)
+        self.assertEqual((totals['drivingHours'], totals['totalDistance']), (6.5, 150.25 + 300))
+
+    def test_pickup_always_and_dropoff_when_there_is_one(self):
+        self.assertEqual(compute_duty_totals([leg(100, 2)], False)['onDutyHours'], 0.5)
+        self.assertEqual(compute_duty_totals([leg(100, 2), leg(100, 2)], True)['onDutyHours'], 1)
+
+    def test_one_rest_break_once_a_leg_needs_more_than_ten_hours(self):
+        self.assertEqual(compute_duty_totals([leg(900, 10)], False)['restBreaks'], 0)
+        self.assertEqual(compute_duty_totals([leg(900, 10.5)], False)['restBreaks'], 1)
+
+    def test_at_most_one_rest_break_per_sheet(self):
+        totals = compute_duty_totals([leg(900, 11), leg(2000, 25)], True)
+        self.assertEqual(totals['restBreaks'], 1)
+        # Pickup, dropoff, the one break and one fueling stop (at 2900 km).
+        self.assertEqual(totals['onDutyHours'], 4 * 0.5)
+
+    def test_fueling_after_a_leg_that_reaches_the_next_thousand_km(self):
+        self.assertEqual(compute_duty_totals([leg(600, 6), leg(300, 3)], False)['fuelingStops'], 0)
+        self.assertEqual(compute_duty_totals([leg(600, 6), leg(400, 4)], False)['fuelingStops'], 1)
+        self.assertEqual(compute_duty_totals([leg(600, 6), leg(500, 5)], False)['fuelingStops'], 1)
+
+    def test_fueling_counts_the_distance_driven_on_earlier_sheets(self):
+        self.assertEqual(compute_duty_totals([leg(300, 3)], False)['fuelingStops'], 0)
+        self.assertEqual(compute_duty_totals([leg(300, 3)], False, distance_before=800)['fuelingStops'], 1)
+
+    def test_at_most_one_fueling_stop_per_leg(self):
+        self.assertEqual(compute_duty_totals([leg(2500, 26)], False)['fuelingStops'], 1)
+
+    def test_off_duty_fills_the_day_and_the_window_warning(self):
+        totals = compute_duty_totals([leg(1200, 13.5)], True)
+        self.assertEqual(totals['cycleHours'], 13.5 + 0.5 + 0.5 + 0.5 + 0.5)
+        self.assertEqual(totals['offDutyHours'], 24 - totals['cycleHours'])
+        self.assertEqual(len(totals['warnings']), 1)
+        self.assertEqual(compute_duty_totals([leg(2500, 26)], True)['offDutyHours'], 0)
+
+    def test_grid_matches_the_totals(self):
+        legs = [leg(900, 10.5), leg(200, 2)]
+        totals = compute_duty_totals(legs, True)
+        grid = compute_duty_grid(legs, True)
+        slots = {DRIVING: 0, ON_DUTY: 0}
+        for status, count in zip(grid[::2], grid[1::2]):
+            if status in slots:
+                slots[status] += count
+        self.assertEqual(sum(grid[1::2]), 96)
+        self.assertEqual(slots[DRIVING] / 4, totals['drivingHours'])
+        self.assertEqual(slots[ON_DUTY] / 4, totals['onDutyHours'])
+
+
+class HosStatusTests(TestCase):
+    def test_hours_are_rounded(self):
+        driver = create_driver()
+        today = date(2026, 1, 10)
+        DriverDailyHours.objects.create(driverId=driver, date=today, cycleHours=0.1 + 0.2, drivingHours=1.1 + 2.2)
+        status = hos_status(driver, today)
+        self.assertEqual(status['cycleHours'], 0.3)
+        self.assertEqual((status['days'][0]['cycleHours'], status['days'][0]['drivingHours']), (0.3, 3.3))
+
+
+class HosScanTests(TestCase):
+    def setUp(self):
+        self.driver = create_driver()
+        self.trip = Trip.objects.create(driverId=self.driver, tripTitle='Trip', pickup='Chicago, IL', dropoff='Denver, CO')
+
+    def add_sheet(self, day, cycle_hours):
+        created_date = timezone.make_aware(datetime(2026, 1, day, 12))
+        LogSheet.objects.create(tripId=self.trip, currentLocation='Chicago, IL', createdDate=created_date,
+                                dutyTotals={'cycleHours': cycle_hours})
+        return created_date
+
+    def scan(self, full=False):
+        from core.services.hosscan import scan_fleet, stale_drivers
+        return list(scan_fleet(stale_drivers(full)))
+
+    def violations(self):
+        return [(violation['date'][-2:], violation['rule']) for violation in self.driver.hosReport.violations]
+
+    def scan_history(self):
+        # Window violations on days 1 to 4, the 8-day total peaking at 80 hours on day 4.
+        for day in (1, 2, 3, 4):
+            self.add_sheet(day, 20)
+        last_sheet = self.add_sheet(12, 1)
+        self.assertEqual(len(self.scan(full=True)), 1)
+        self.driver.refresh_from_db()
+        return last_sheet
+
+    def test_first_full_scan(self):
+        last_sheet = self.scan_history()
+        report = self.driver.hosReport
+        self.assertEqual(self.violations(), [('01', 'window'), ('02', 'window'), ('03', 'window'), ('04', 'window'), ('04', 'cycle')])
+        self.assertEqual((report.violationCount, report.maxCycleHours, report.scannedThrough), (5, 80, last_sheet))
+
+    def test_rerun_without_new_sheets_scans_no_drivers(self):
+        from core.services.hosscan import stale_drivers
+        self.scan_history()
+        self.assertEqual(stale_drivers(), [])
+        self.assertEqual(self.scan(), [])
+
+    def test_rerun_after_a_new_sheet_keeps_earlier_violations(self):
+        from core.services.hosscan import stale_drivers
+        self.scan_history()
+        scanned_through = self.driver.hosReport.scannedThrough
+        last_sheet = self.add_sheet(13, 15)
+        self.assertEqual(stale_drivers(), [(self.driver.uniqueId, scanned_through)])
+
+        self.assertEqual(len(self.scan()), 1)
+        self.driver.refresh_from_db()
+        report = self.driver.hosReport
+        # Days before the last scanned one are kept; the window from then on is recomputed (peaking at
+        # 16 hours), and the earlier 80-hour peak stays the report's maximum.
+        self.assertEqual(self.violations(), [('01', 'window'), ('02', 'window'), ('03', 'window'), ('04', 'window'),
+                                             ('04', 'cycle'), ('13', 'window')])
+        self.assertEqual((report.violationCount, report.maxCycleHours, report.scannedThrough), (6, 80, last_sheet))
+
+
+def create_trip(client, email='driver@example.com', sheets=1):
+    response = client.post('/api/create-trip/', {
+        'email': email, 'tripTitle': 'Trip', 'pickup': 'Chicago, IL', 'dropoff': 'Denver, CO', 'cycleUsed': '5',
+        'logSheets': [{'currentLocation': 'Chicago, IL', 'pickup': 'Chicago, IL', 'dropoff': 'Denver, CO',
+                       'currentCycleUsed': '5'}] * sheets,
+    }, content_type='application/json')
+    return response.json()['tripId']
+
+
+@local_providers
+class TripCacheTests(TestCase):
+    def test_update_log_sheets_changes_the_etag_and_body(self):
+        create_driver()
+        trip_id = create_trip(self.client)
+        url = f"/api/get-trip-byid/?tripId={trip_id}"
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        old_etag = response['ETag']
+        log_sheet = response.json()['trip']['logSheets'][0]
+        self.assertEqual(log_sheet['currentCycleUsed'], '5.00')
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=old_etag).status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch('/api/update-log-sheets/', {
+                'tripId': trip_id, 'logSheets': [{'uniqueId': log_sheet['uniqueId'], 'currentCycleUsed': '7.5'}],
+            }, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=old_etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], old_etag)
+        self.assertEqual(response.json()['trip']['logSheets'][0]['currentCycleUsed'], '7.50')
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+
+
+    @override_settings(SOCKETIO_CLIENT_MANAGER='unix', TRIP_CACHE_BACKEND='default')
+    def test_versions_need_a_shared_cache_across_workers(self):
+        from core.services.tripcache import trip_cache
+        with self.assertRaises(ImproperlyConfigured):
+            trip_cache.check()
+        with override_settings(SOCKETIO_CLIENT_MANAGER='local'):
+            trip_cache.check()
+
+
+def as_json(data):
+    return json.loads(json.dumps(data, cls=JSONEncoder))
+
+
+@local_providers
+class FastSerializerParityTests(TestCase):
+    def setUp(self):
+        self.driver = create_driver()
+        self.trip_ids = [create_trip(self.client, sheets=3), create_trip(self.client, sheets=0)]
+        Trip.objects.filter(uniqueId=self.trip_ids[1]).update(cycleUsed=None, instructions=None)
+
+    def test_driver_trips_match_the_drf_serializer(self):
+        queryset = Trip.objects.filter(driverId=self.driver).order_by('-createdDate', '-tripNumber')
+        for fields in (None, ['uniqueId', 'tripTitle', 'cycleUsed']):
+            with self.subTest(fields=fields):
+                self.assertEqual(
+                    as_json(serialize_driver_trips(driver_trips_values(queryset, fields), fields)),
+                    as_json(GetDriverTripsSerializer(queryset, many=True, fields=fields).data),
+                )
+
+    def test_trip_data_matches_the_drf_serializer(self):
+        for trip_id in self.trip_ids:
+            with self.subTest(trip_id=trip_id):
+                trip = Trip.objects.prefetch_related('logSheets').get(uniqueId=trip_id)
+                self.assertEqual(as_json(serialize_trip_data(trip_id)), as_json(GetTripDataSerializer(trip).data))
+
+
+@local_providers
+class AsyncLogSheetViewsTests(TestCase):
+    def test_async_add_and_update_log_sheets(self):
+        create_driver()
+        trip_id = create_trip(self.client)
+
+        response = self.client.post('/api/async/add-log-sheets/', {
+            'tripId': trip_id, 'logSheets': [{'currentLocation': 'Chicago, IL', 'currentCycleUsed': '2'}],
+        }, content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        added = response.json()['logSheets'][0]
+        self.assertEqual(added['currentCycleUsed'], '2.00')
+
+        response = self.client.patch('/api/async/update-log-sheets/', {
+            'tripId': trip_id, 'logSheets': [{'uniqueId': added['uniqueId'], 'currentCycleUsed': '3'}, {'uniqueId': 'missing'}],
+        }, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['logSheets'][0]['currentCycleUsed'], '3.00')
+        self.assertEqual(response.json()['errors'], [{'index': 1, 'uniqueId': 'missing', 'error': 'Log sheet not found'}])
+        self.assertEqual(LogSheet.objects.get(uniqueId=added['uniqueId']).currentCycleUsed, Decimal('3.00'))
+
+
+@local_providers
+class AddLogSheetsTests(TestCase):
+    def setUp(self):
+        Sequence.objects.forget_blocks()
+        create_driver()
+        self.trip = Trip.objects.get(uniqueId=create_trip(self.client, sheets=0))
+
+    def tearDown(self):
+        Sequence.objects.forget_blocks()
+
+    def sheets(self, count):
+        return [{'currentLocation': 'Chicago, IL', 'pickup': 'Chicago, IL', 'dropoff': 'Denver, CO',
+                 'currentCycleUsed': str(index % 10)} for index in range(count)]
+
+    def test_one_invalid_sheet_writes_nothing(self):
+        log_sheets = self.sheets(3)
+        log_sheets[1]['currentCycleUsed'] = '-5'
+        response = self.client.post('/api/add-log-sheets/', {'tripId': str(self.trip.uniqueId), 'logSheets': log_sheets},
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(list(response.json()[1]), ['currentCycleUsed'])
+        self.assertFalse(LogSheet.objects.filter(tripId=self.trip).exists())
+        self.assertFalse(Sequence.objects.filter(name='logNumber', lastValue__gt=0).exists())
+
+    @override_settings(LOG_SHEET_BATCH_SIZE=10)
+    def test_queries_do_not_grow_with_the_batch(self):
+        from core.views.tripViews import add_log_sheets
+        # Route the legs and open the day's hours row first.
+        add_log_sheets(self.trip, self.sheets(1))
+        counts = {}
+        for count in (5, 25):
+            with CaptureQueriesContext(connection) as captured:
+                _, errors = add_log_sheets(self.trip, self.sheets(count))
+            self.assertIsNone(errors)
+            queries = [query['sql'] for query in captured]
+            inserts = [sql for sql in queries if sql.startswith('INSERT INTO "core_logsheet"')]
+            self.assertEqual(len(inserts), -(-count // 10))
+            # One block of numbers per batch, however many sheets it has.
+            self.assertEqual(len([sql for sql in queries if 'UPDATE "core_sequence"' in sql]), 1)
+            counts[count] = len(queries) - len(inserts)
+        self.assertEqual(counts[5], counts[25])
+        self.assertEqual(sorted(LogSheet.objects.filter(tripId=self.trip).values_list('logNumber', flat=True)), list(range(1, 32)))
+
+
+@local_providers
+class UpdateLogSheetsTests(TestCase):
+    def test_fields_a_request_does_not_change_are_not_written_back(self):
+        from core.views import tripViews
+        create_driver()
+        trip_id = create_trip(self.client, sheets=2)
+        moved, other = LogSheet.objects.filter(tripId=trip_id).order_by('logNumber')
+        resolve_coordinates = tripViews.resolve_coordinates
+
+        def edit_concurrently(*args):
+            # Another request changes the moved sheet after this one has read it.
+            LogSheet.objects.filter(pk=moved.pk).update(currentCycleUsed=9)
+            return resolve_coordinates(*args)
+
+        with mock.patch.object(tripViews, 'resolve_coordinates', side_effect=edit_concurrently):
+            response = self.client.patch('/api/update-log-sheets/', {'tripId': trip_id, 'logSheets': [
+                {'uniqueId': str(moved.uniqueId), 'pickup': 'Denver, CO'},
+                {'uniqueId': str(other.uniqueId), 'currentCycleUsed': '7'},
+            ]}, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+
+        moved.refresh_from_db()
+        other.refresh_from_db()
+        self.assertEqual((moved.pickup, moved.currentCycleUsed), ('Denver, CO', Decimal('9')))
+        self.assertEqual(other.currentCycleUsed, Decimal('7'))
+
+
+class RoutingTests(TestCase):
+    origin, destination = {'lat': 41.0, 'lon': -87.0}, {'lat': 39.0, 'lon': -104.0}
+
+    def setUp(self):
+        cache.clear()
+
+    def provider(self, **kwargs):
+        return mock.patch.object(routing, 'get_provider', return_value=mock.Mock(route=mock.Mock(**kwargs)))
+
+    def test_failures_are_not_retried_within_the_ttl(self):
+        with self.provider(side_effect=OSError("timed out")) as get_provider:
+            self.assertEqual(routing.route_many([(self.origin, self.destination)]), {})
+            self.assertEqual(routing.route_many([(self.origin, self.destination)]), {})
+        self.assertEqual(get_provider.return_value.route.call_count, 1)
+
+    def test_no_route_is_cached_as_null(self):
+        with self.provider(return_value={'distance': None, 'duration': None, 'polyline': ''}):
+            routing.route_many([(self.origin, self.destination)])
+        entry = RouteCache.objects.get(key=routing.route_key(self.origin, self.destination))
+        self.assertEqual((entry.distance, entry.duration), (None, None))
+
+        sheet = {'coordinates': {'currentLocation': self.origin, 'pickup': self.destination}, 'dropoff': ''}
+        attach_duty_totals([sheet])
+        self.assertEqual(sheet['dutyTotals']['totalDistance'], 0)
+
+        attach_route_legs([sheet])
+        self.assertEqual(sheet['segmentDistances'], [None])
+
+    def osrm_error(self, status_code, body):
+        import urllib.error
+        return mock.patch('urllib.request.urlopen', side_effect=urllib.error.HTTPError(
+            'http://osrm/route', status_code, 'Bad Request', {}, io.BytesIO(body),
+        ))
+
+    def test_osrm_no_route_is_an_answer(self):
+        with self.osrm_error(400, b'{"code": "NoRoute", "message": "Impossible route between points"}'):
+            route = routing.OSRMRoutingProvider().route(self.origin, self.destination)
+        self.assertEqual(route, {'distance': None, 'duration': None, 'polyline': ''})
+
+    def test_other_osrm_errors_are_failures(self):
+        import urllib.error
+        for status_code, body in ((400, b'{"code": "InvalidQuery"}'), (502, b'<html>Bad Gateway</html>')):
+            with self.subTest(status_code=status_code), self.osrm_error(status_code, body):
+                with self.assertRaises(urllib.error.HTTPError):
+                    routing.OSRMRoutingProvider().route(self.origin, self.destination)
+
+    def test_reads_never_route_upstream(self):
+        sheet = {'coordinates': {'currentLocation': self.origin, 'pickup': self.destination}}
+        with self.provider() as get_provider:
+            attach_route_legs([sheet])
+        get_provider.return_value.route.assert_not_called()
+        self.assertEqual((sheet['segmentDistances'], sheet['routePolylines']), ([None], [None]))
+
+
+@override_settings(BCRYPT_ROUNDS=4, LOG_RENDER_WORKERS=0)
+@local_providers
+class PrintLogSheetsTests(TestCase):
+    def test_trip_sheets_are_read_from_the_trip_creation_date_on(self):
+        create_driver()
+        trip_id = create_trip(self.client, sheets=2)
+        self.client.post('/api/login/', {'email': 'driver@example.com', 'password': 'secret-password'},
+                         content_type='application/json')
+
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get('/api/print-log-sheets/', {'tripId': trip_id, 'renderFormat': 'svg'})
+        self.assertEqual(response.status_code, 200)
+        sheet_queries = [query['sql'] for query in captured if 'FROM "core_logsheet"' in query['sql']]
+        self.assertTrue(sheet_queries)
+        self.assertTrue(all('"core_logsheet"."createdDate" >=' in sql for sql in sheet_queries))
+
+        create_driver('other')
+        other_trip_id = create_trip(self.client, email='other@example.com')
+        response = self.client.get('/api/print-log-sheets/', {'tripId': other_trip_id, 'renderFormat': 'svg'})
+        self.assertEqual(response.status_code, 404)
+
+    @override_settings(PRINT_LOG_SHEETS_MAX_DAYS=31, PRINT_LOG_SHEETS_MAX_SHEETS=2)
+    def test_documents_are_bounded(self):
+        create_driver()
+        trip_id = create_trip(self.client, sheets=3)
+        self.client.post('/api/login/', {'email': 'driver@example.com', 'password': 'secret-password'},
+                         content_type='application/json')
+        today = timezone.localdate()
+
+        def status_code(**params):
+            return self.client.get('/api/print-log-sheets/', {'renderFormat': 'svg', **params}).status_code
+
+        self.assertEqual(status_code(**{'from': (today - timedelta(days=31)).isoformat(), 'to': today.isoformat()}), 400)
+        self.assertEqual(status_code(**{'from': today.isoformat(), 'to': (today - timedelta(days=1)).isoformat()}), 400)
+        self.assertEqual(status_code(tripId=trip_id), 400)
+        LogSheet.objects.filter(pk=LogSheet.objects.filter(tripId=trip_id).first().pk).delete()
+        self.assertEqual(status_code(**{'from': (today - timedelta(days=30)).isoformat(), 'to': today.isoformat()}), 200)
+
+
+@override_settings(BCRYPT_ROUNDS=4)
+@local_providers
+class ExportLogHistoryTests(TestCase):
+    def setUp(self):
+        self.driver = create_driver()
+        self.trip_ids = [create_trip(self.client, sheets=2), create_trip(self.client, sheets=0)]
+        create_driver('other')
+        self.other_trip_id = create_trip(self.client, email='other@example.com')
+        self.client.post('/api/login/', {'email': 'driver@example.com', 'password': 'secret-password'},
+                         content_type='application/json')
+
+    def export(self, **params):
+        response = self.client.get('/api/export-log-history/', params)
+        self.assertEqual(response.status_code, 200)
+        return b''.join(response.streaming_content).decode()
+
+    def ndjson(self, **params):
+        return [json.loads(line) for line in self.export(exportFormat='ndjson', **params).splitlines()]
+
+    def test_ndjson_has_a_record_per_trip_and_log_sheet(self):
+        records = self.ndjson()
+        self.assertEqual([record['record'] for record in records], ['trip', 'logSheet', 'logSheet', 'trip'])
+        self.assertEqual([record['uniqueId'] for record in records if record['record'] == 'trip'], self.trip_ids)
+        self.assertEqual({record['driverEmail'] for record in records if record['record'] == 'trip'}, {'driver@example.com'})
+        self.assertEqual({record['tripId'] for record in records if record['record'] == 'logSheet'}, {self.trip_ids[0]})
+
+    def test_csv_has_a_row_per_log_sheet_and_per_trip_without_any(self):
+        rows = list(csv.DictReader(io.StringIO(self.export(exportFormat='csv'))))
+        self.assertEqual([row['trip.uniqueId'] for row in rows], [self.trip_ids[0], self.trip_ids[0], self.trip_ids[1]])
+        self.assertTrue(all(row['logSheet.uniqueId'] for row in rows[:2]))
+        self.assertEqual(rows[2]['logSheet.uniqueId'], '')
+        self.assertEqual(json.loads(rows[0]['logSheet.coordinates'])['pickup'], {'lat': 41.8781, 'lon': -87.6298})
+
+    def test_from_and_to_select_log_sheets_and_trips_by_creation_date(self):
+        earlier = timezone.now() - timedelta(days=10)
+        Trip.objects.filter(uniqueId=self.trip_ids[1]).update(createdDate=earlier)
+        first_sheet = LogSheet.objects.filter(tripId=self.trip_ids[0]).order_by('logNumber').first()
+        LogSheet.objects.filter(pk=first_sheet.pk).update(createdDate=earlier)
+        day = earlier.date().isoformat()
+
+        records = self.ndjson(**{'from': day, 'to': day})
+        # Trips come in creation order.
+        self.assertEqual([(record['record'], record['uniqueId']) for record in records], [
+            ('trip', self.trip_ids[1]), ('trip', self.trip_ids[0]), ('logSheet', str(first_sheet.uniqueId)),
+        ])
+        records = self.ndjson(**{'from': (earlier + timedelta(days=1)).date().isoformat()})
+        self.assertEqual([record['record'] for record in records], ['trip', 'logSheet'])
+        self.assertEqual(self.client.get('/api/export-log-history/', {'from': 'yesterday'}).status_code, 400)
+
+    def test_fleet_exports_need_a_staff_driver(self):
+        response = self.client.get('/api/export-log-history/', {'fleet': 'true'})
+        self.assertEqual(response.status_code, 403)
+
+        Driver.objects.filter(pk=self.driver.pk).update(isStaff=True)
+        from core.services.auth import driver_cache
+        driver_cache.invalidate(self.driver.pk)
+        trips = [record['uniqueId'] for record in self.ndjson(fleet='true') if record['record'] == 'trip']
+        self.assertEqual(sorted(trips), sorted(self.trip_ids + [self.other_trip_id]))
+
+
+class MetricsViewTests(TestCase):
+    @override_settings(METRICS_AUTH_TOKEN=None)
+    def test_without_a_token_only_internal_clients_are_answered(self):
+        self.assertEqual(self.client.get('/api/metrics/', REMOTE_ADDR='127.0.0.1').status_code, 200)
+        self.assertEqual(self.client.get('/api/metrics/', REMOTE_ADDR='203.0.113.7').status_code, 403)
+
+    @override_settings(METRICS_AUTH_TOKEN='scrape')
+    def test_with_a_token_it_is_required(self):
+        self.assertEqual(self.client.get('/api/metrics/', REMOTE_ADDR='127.0.0.1').status_code, 401)
+        response = self.client.get('/api/metrics/', REMOTE_ADDR='203.0.113.7', HTTP_AUTHORIZATION='Bearer scrape')
+        self.assertEqual(response.status_code, 200)
+
+    def metrics(self):
+        with override_settings(METRICS_AUTH_TOKEN=None):
+            return self.client.get('/api/metrics/', REMOTE_ADDR='127.0.0.1').content.decode()
+
+    def test_socket_outbox_delivery(self):
+        from eldproject.asgi import outbox
+        body = self.metrics()
+        self.assertIn(f"eld_socket_outbox_delivered_total {outbox.delivered}\n", body)
+        for metric in ('enqueued_total', 'dropped_total', 'lag_avg_milliseconds', 'lag_max_milliseconds'):
+            self.assertIn(f"# TYPE eld_socket_outbox_{metric} ", body)
+
+    def test_trip_cache_hit_rate(self):
+        from core.services.tripcache import trip_cache
+        body = self.metrics()
+        self.assertIn(f"eld_trip_cache_hits_total {trip_cache.hits}\n", body)
+        self.assertIn("# TYPE eld_trip_cache_hit_rate gauge\n", body)
+
+    def test_driver_cache_hits(self):
+        from core.services.auth import driver_cache
+        body = self.metrics()
+        self.assertIn(f"eld_driver_cache_misses_total {driver_cache.misses}\n", body)
+        self.assertIn("# TYPE eld_driver_cache_hit_rate gauge\n", body)
+
+    def test_password_hashing_queue(self):
+        body = self.metrics()
+        self.assertIn(f"eld_password_hashing_pending {password_hasher.stats()['pending']}\n", body)
+        self.assertIn("# TYPE eld_password_hashing_rejected_total counter\n", body)
+
+    def test_socket_message_limits(self):
+        from core.sockets.limits import message_limiter
+        body = self.metrics()
+        self.assertIn(f"eld_socket_messages_rate_limited_total {message_limiter.rateLimited}\n", body)
+
+    def test_database_pool_per_alias(self):
+        from core.db.backends.postgresql import base
+        from core.db.pool import ConnectionPool
+        pool = ConnectionPool(lambda: FakeConnection(1), None, lambda connection: True, max_size=3)
+        pool.release(pool.acquire())
+        with mock.patch.dict(base._pools, {'default': pool}, clear=True):
+            body = self.metrics()
+        self.assertIn('eld_db_pool_checkouts_total{alias="default"} 1\n', body)
+        self.assertIn('eld_db_pool_max_size{alias="default"} 3\n', body)
+        self.assertIn("# TYPE eld_db_pool_wait_max_milliseconds gauge\n", body)
+
+
+@local_providers
+class ArchiveTests(TestCase):
+    def test_archiving_retires_cached_trip_responses(self):
+        from core.services.archive import archive_trips
+        create_driver()
+        trip_id = create_trip(self.client)
+        url = f"/api/get-trip-byid/?tripId={trip_id}"
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+        Trip.allObjects.filter(uniqueId=trip_id).update(isDeleted=True, deletedDate=timezone.now() - timedelta(days=60))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(list(archive_trips(30)), [(1, 1)])
+
+        self.assertNotEqual(self.client.get(url).status_code, 200)
+
+
+class GeocodingTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def provider(self, rate_limited=False, **kwargs):
+        provider = mock.Mock(geocode=mock.Mock(**kwargs), rate_limited=rate_limited)
+        return mock.patch.object(geocoding, 'get_provider', return_value=provider)
+
+    def test_equivalent_spellings_share_one_entry(self):
+        self.assertEqual(geocoding.normalize_location('  Chicago,\tIL '), 'chicago, il')
+        self.assertEqual(geocoding.normalize_location('CHICAGO, IL'), 'chicago, il')
+        self.assertEqual(geocoding.normalize_location(None), '')
+        self.assertEqual(len(geocoding.normalize_location('x' * 300)), 255)
+
+    def test_no_match_is_cached_as_null(self):
+        with self.provider(return_value=None) as get_provider:
+            self.assertEqual(geocoding.geocode_many(['Nowhere']), {'nowhere': None})
+            self.assertEqual(geocoding.geocode_many(['nowhere ']), {'nowhere': None})
+        self.assertEqual(get_provider.return_value.geocode.call_count, 1)
+        entry = GeocodeCache.objects.get(query='nowhere')
+        self.assertEqual((entry.lat, entry.lon), (None, None))
+
+    def test_entries_older_than_the_ttl_are_resolved_again(self):
+        GeocodeCache.objects.create(query='chicago, il', lat=1, lon=2, resolvedDate=timezone.now() - timedelta(seconds=120))
+        with override_settings(GEOCODE_CACHE_TTL=300), self.provider(return_value=(3, 4)) as get_provider:
+            self.assertEqual(geocoding.geocode_many(['Chicago, IL']), {'chicago, il': {'lat': 1, 'lon': 2}})
+        get_provider.return_value.geocode.assert_not_called()
+
+        with override_settings(GEOCODE_CACHE_TTL=60), self.provider(return_value=(3, 4)):
+            self.assertEqual(geocoding.geocode_many(['Chicago, IL']), {'chicago, il': {'lat': 3, 'lon': 4}})
+        self.assertEqual(GeocodeCache.objects.get(query='chicago, il').lat, 3)
+
+    @override_settings(GEOCODE_CACHE_MAX_ENTRIES=2)
+    def test_least_recently_used_entries_are_evicted(self):
+        current_time = timezone.now()
+        for age, query in enumerate(['newest', 'middle', 'oldest']):
+            GeocodeCache.objects.create(query=query, lat=1, lon=2, lastUsedDate=current_time - timedelta(hours=age))
+        geocoding.evict_least_recently_used()
+        self.assertEqual(set(GeocodeCache.objects.values_list('query', flat=True)), {'newest', 'middle'})
+
+    def test_failures_are_not_cached_or_retried_within_the_ttl(self):
+        with self.provider(side_effect=OSError("timed out")) as get_provider:
+            self.assertEqual(geocoding.geocode_many(['a']), {})
+            self.assertEqual(geocoding.geocode_many(['a']), {})
+        self.assertEqual(get_provider.return_value.geocode.call_count, 1)
+        self.assertFalse(GeocodeCache.objects.exists())
+
+    def test_a_failure_skips_the_rest_of_the_batch(self):
+        with self.provider(side_effect=OSError("timed out")) as get_provider:
+            self.assertEqual(geocoding.geocode_many(['a', 'b', 'c']), {})
+        self.assertEqual(get_provider.return_value.geocode.call_count, 1)
+
+    @override_settings(GEOCODING_RATE_LIMIT=1, GEOCODING_RATE_LIMIT_WAIT=0)
+    def test_upstream_lookups_are_rate_limited(self):
+        clock = mock.Mock(time=mock.Mock(return_value=1000.5))
+        with mock.patch.object(geocoding, 'time', clock), self.provider(rate_limited=True, return_value=(1, 2)) as get_provider:
+            self.assertEqual(len(geocoding.geocode_many(['a', 'b', 'c'])), 1)
+            clock.time.return_value = 1001.5
+            self.assertEqual(len(geocoding.geocode_many(['a', 'b', 'c'])), 2)
+        self.assertEqual(get_provider.return_value.geocode.call_count, 2)
@@ -3,7 +3,12 @@
 from django.urls import path
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 from core.views.authViews import ProtectedView
-from core.views.driverViews import RegisterDriverAPIView, LoginAPIView, VerifyTokenDriverAPIView, LogoutAPIView
+from core.views.driverViews import AsyncRegisterDriverView, AsyncLoginView, VerifyTokenDriverAPIView, LogoutAPIView
+from core.views.hosViews import GetDriverHOSStatusAPIView, GetDriverCycleHoursAPIView
+from core.views.exportViews import ExportLogHistoryAPIView
+from core.views.logSheetViews import PrintLogSheetsAPIView
+from core.views.metricsViews import MetricsAPIView
+from core.views.asyncTripViews import AsyncCreateTripView, AsyncGetDriverTripsView, AsyncGetTripByIdView, AsyncAddLogSheetsView, AsyncUpdateLogSheetsView, AsyncDeleteTripView
 from core.views.tripViews import CreateTripAPIView, GetDriverTripsAPIView, GetTripByIdAPIView, AddLogSheetsAPIView, UpdateLogSheetsAPIView, DeleteTripAPIView
 
 
@@ -11,8 +16,8 @@ urlpatterns = [
 
     path('verify-token/', VerifyTokenDriverAPIView.as_view(), name="verify-token"),
     path('protected/', ProtectedView.as_view(), name="protected"),
-    path('register/', RegisterDriverAPIView.as_view(), name="register-driver"),
-    path('login/', LoginAPIView.as_view(), name="login-driver"),
+    path('register/', AsyncRegisterDriverView.as_view(), name="register-driver"),
+    path('login/', AsyncLoginView.as_view(), name="login-driver"),
     path('logout/', LogoutAPIView.as_view(), name="logout-driver"),
 
     path('create-trip/', CreateTripAPIView.as_view(), name='create-trip'),
@@ -23,5 +28,21 @@ urlpatterns = [
     path('update-log-sheets/', UpdateLogSheetsAPIView.as_view(), name='update-log-sheets'),
     path('delete-trip/', DeleteTripAPIView.as_view(), name='delete-trip'),
 
+    path('get-hos-status/', GetDriverHOSStatusAPIView.as_view(), name='get-hos-status'),
+    path('get-cycle-hours/', GetDriverCycleHoursAPIView.as_view(), name='get-cycle-hours'),
+
+    path('export-log-history/', ExportLogHistoryAPIView.as_view(), name='export-log-history'),
+    path('print-log-sheets/', PrintLogSheetsAPIView.as_view(), name='print-log-sheets'),
+
+    path('metrics/', MetricsAPIView.as_view(), name='metrics'),
+
+    # Async (event-loop) versions of the trip endpoints, same request and response shapes.
+    path('async/create-trip/', AsyncCreateTripView.as_view(), name='async-create-trip'),
+    path('async/get-driver-trips/', AsyncGetDriverTripsView.as_view(), name='async-get-driver-trips'),
+    path('async/get-trip-byid/', AsyncGetTripByIdView.as_view(), name='async-get-trip-by-id'),
+    path('async/add-log-sheets/', AsyncAddLogSheetsView.as_view(), name='async-add-log-sheets'),
+    path('async/update-log-sheets/', AsyncUpdateLogSheetsView.as_view(), name='async-update-log-sheets'),
+    path('async/delete-trip/', AsyncDeleteTripView.as_view(), name='async-delete-trip'),
+
 ]
 
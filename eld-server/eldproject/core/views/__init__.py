@@ -1,3 +1,8 @@
-from core.views.driverViews import RegisterDriverAPIView, LoginAPIView, VerifyTokenDriverAPIView, LogoutAPIView
+from core.views.driverViews import AsyncRegisterDriverView, AsyncLoginView, VerifyTokenDriverAPIView, LogoutAPIView
 from core.views.tripViews import CreateTripAPIView, GetDriverTripsAPIView, GetTripByIdAPIView, AddLogSheetsAPIView, UpdateLogSheetsAPIView, DeleteTripAPIView
+from core.views.hosViews import GetDriverHOSStatusAPIView, GetDriverCycleHoursAPIView
 
+from core.views.exportViews import ExportLogHistoryAPIView
+from core.views.logSheetViews import PrintLogSheetsAPIView
+from core.views.metricsViews import MetricsAPIView
+from core.views.asyncTripViews import AsyncCreateTripView, AsyncGetDriverTripsView, AsyncGetTripByIdView, AsyncAddLogSheetsView, AsyncUpdateLogSheetsView, AsyncDeleteTripView
@@ -0,0 +1,239 @@
+# core/views/asyncTripViews.py
+#
+# Async counterparts of the trip endpoints in tripViews, served natively by
+# Daphne without a thread per request. DRF's APIView is sync-only, so these
+# are plain Django views returning the same JSON. Django 4.2's async ORM has
+# no transactions, so the atomic parts of writes still run through
+# sync_to_async; everything else stays on the event loop.
+
+import json
+import uuid
+from asgiref.sync import sync_to_async
+from django.db import transaction
+from django.http import HttpResponse, Http404
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import status
+from rest_framework.request import Request
+from core.models.trip import Trip
+from core.models.driver import Driver
+from core.serializers.tripSerializers import TripSerializer, GetDriverTripsSerializer
+from core.serializers.fastSerializers import driver_trips_values, serialize_driver_trips, aserialize_trip_data
+from eldproject.asgi import outbox
+from core.middleware.referer_middleware import referer_check
+from core.pagination import DriverTripsPagination
+from core.services.hos import record_duty_changes
+from core.services.metrics import serializer_timer
+from core.services.tripcache import trip_cache
+from core.views.responses import json_response
+from core.views.tripViews import add_log_sheets, update_log_sheets
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class AsyncCreateTripView(View):
+    async def post(self, request):
+        try:
+            data = json.loads(request.body or b'{}')
+            email = data.get("email")
+            if not email:
+                return json_response({"error": "Email is required"}, status=status.HTTP_400_BAD_REQUEST)
+
+            serializer = TripSerializer(data=data, context={"email": email})
+
+            # Validation and the write geocode and open a transaction: both sync.
+            def create():
+                if not serializer.is_valid():
+                    return None
+                trip = serializer.save()
+                with serializer_timer():
+                    return trip, dict(GetDriverTripsSerializer(trip).data)
+
+            created = await sync_to_async(create)()
+            if created is None:
+                return json_response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+            trip, trip_data = created
+            await outbox.apublish("trip_created", trip_data, room=f"user_{email}")
+
+            return json_response(
+                {
+                    "message": "Trip created successfully",
+                    "tripId": str(trip.uniqueId),
+                    "tripTitle": trip.tripTitle,
+                },
+                status=status.HTTP_201_CREATED,
+            )
+
+        except Exception as e:
+            return json_response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+
+class AsyncGetDriverTripsView(View):
+    @referer_check
+    async def get(self, request):
+        try:
+            email = request.GET.get('email')
+            if not email:
+                return json_response({'error': 'Email is required'}, status=status.HTTP_400_BAD_REQUEST)
+
+            try:
+                driver = await Driver.objects.aget(email=email)
+            except Driver.DoesNotExist:
+                raise Http404("No Driver matches the given query.")
+            trips = Trip.objects.filter(driverId=driver)
+
+            fields = [field for field in request.GET.get('fields', '').split(',') if field]
+            unknown_fields = set(fields) - set(GetDriverTripsSerializer.Meta.fields)
+            if unknown_fields:
+                return json_response({'error': f"Unknown fields: {', '.join(sorted(unknown_fields))}"}, status=status.HTTP_400_BAD_REQUEST)
+
+            trips = driver_trips_values(trips, fields)
+
+            # Old clients ask for the full, unpaginated list.
+            if request.GET.get('all') in ('true', '1'):
+                rows = [row async for row in trips.order_by('-createdDate', '-tripNumber')]
+                return json_response({'trips': serialize_driver_trips(rows, fields)})
+
+            # CursorPagination evaluates the page itself, synchronously.
+            paginator = DriverTripsPagination()
+            page = await sync_to_async(paginator.paginate_queryset)(trips, Request(request), view=self)
+            return json_response({
+                'trips': serialize_driver_trips(page, fields),
+                'next': paginator.get_next_link(),
+                'previous': paginator.get_previous_link(),
+            })
+
+        except Exception as e:
+            return json_response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+
+class AsyncGetTripByIdView(View):
+    async def get(self, request):
+        try:
+            trip_id = request.GET.get('tripId')
+            if not trip_id:
+                return json_response({'error': 'Trip ID is required'}, status=status.HTTP_400_BAD_REQUEST)
+
+            trip_id = str(uuid.UUID(trip_id))
+            trip_data, etag = await trip_cache.aget(trip_id, lambda: aserialize_trip_data(trip_id))
+            headers = {'ETag': etag, 'Cache-Control': 'private, no-cache'}
+
+            if_none_match = request.headers.get('If-None-Match', '')
+            if etag in [tag.strip().removeprefix('W/') for tag in if_none_match.split(',')] or if_none_match.strip() == '*':
+                trip_cache.record_not_modified()
+                return HttpResponse(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+            return json_response({'trip': trip_data}, headers=headers)
+
+        except Exception as e:
+            return json_response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+
+async def get_trip(trip_id):
+    try:
+        return await Trip.objects.select_related('driverId').aget(uniqueId=trip_id)
+    except Trip.DoesNotExist:
+        raise Http404("No Trip matches the given query.")
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class AsyncAddLogSheetsView(View):
+    async def post(self, request):
+        try:
+            data = json.loads(request.body or b'{}')
+            trip_id = data.get('tripId')
+            log_sheets_data = data.get('logSheets', [])
+
+            if not trip_id:
+                return json_response({'error': 'Trip ID is required'}, status=status.HTTP_400_BAD_REQUEST)
+            if not log_sheets_data:
+                return json_response({'error': 'Log sheets data is required'}, status=status.HTTP_400_BAD_REQUEST)
+
+            trip = await get_trip(trip_id)
+
+            # Geocoding, routing and the batch insert are sync.
+            created_log_sheets, errors = await sync_to_async(add_log_sheets)(trip, log_sheets_data)
+            if errors is not None:
+                return json_response(errors, status=status.HTTP_400_BAD_REQUEST)
+
+            await outbox.apublish(
+                "log_sheets_added",
+                {'tripId': str(trip.uniqueId), 'logSheets': created_log_sheets},
+                room=f"user_{trip.driverId.email}",
+            )
+            return json_response({
+                'message': 'Log sheets added successfully',
+                'logSheets': created_log_sheets,
+            }, status=status.HTTP_201_CREATED)
+
+        except Exception as e:
+            return json_response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class AsyncUpdateLogSheetsView(View):
+    async def patch(self, request):
+        try:
+            data = json.loads(request.body or b'{}')
+            trip_id = data.get('tripId')
+            log_sheets_data = data.get('logSheets', [])
+
+            if not trip_id:
+                return json_response({'error': 'Trip ID is required'}, status=status.HTTP_400_BAD_REQUEST)
+            if not log_sheets_data:
+                return json_response({'error': 'Log sheets data is required'}, status=status.HTTP_400_BAD_REQUEST)
+
+            trip = await get_trip(trip_id)
+
+            updated_data, errors = await sync_to_async(update_log_sheets)(trip, log_sheets_data)
+            if errors and not updated_data:
+                return json_response({'error': 'No log sheets were updated', 'errors': errors}, status=status.HTTP_400_BAD_REQUEST)
+
+            await outbox.apublish(
+                "log_sheets_updated",
+                {'tripId': str(trip.uniqueId), 'logSheets': updated_data},
+                room=f"user_{trip.driverId.email}",
+            )
+            return json_response({
+                'message': 'Log sheets updated successfully',
+                'logSheets': updated_data,
+                'errors': errors,
+            })
+
+        except Exception as e:
+            return json_response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class AsyncDeleteTripView(View):
+    async def delete(self, request):
+        try:
+            trip_id = request.GET.get('tripId')
+            if not trip_id:
+                return json_response({'error': 'Trip ID is required'}, status=status.HTTP_400_BAD_REQUEST)
+
+            trip = await get_trip(trip_id)
+
+            @transaction.atomic
+            def delete():
+                log_sheets = list(trip.log_sheets().values_list('uniqueId', 'createdDate', 'dutyTotals'))
+                record_duty_changes(
+                    trip.driverId_id,
+                    [(created_date, totals, None) for _, created_date, totals in log_sheets],
+                )
+                trip.soft_delete()
+                trip_cache.invalidate(trip.uniqueId)
+                return [str(log_sheet_id) for log_sheet_id, _, _ in log_sheets]
+
+            log_sheet_ids = await sync_to_async(delete)()
+            # Committed by now, so the event can go straight out.
+            await outbox.apublish(
+                "trip_deleted",
+                {'uniqueId': str(trip.uniqueId), 'logSheetIds': log_sheet_ids},
+                room=f"user_{trip.driverId.email}",
+            )
+            return json_response({'message': 'Trip deleted successfully'}, status=status.HTTP_204_NO_CONTENT)
+
+        except Exception as e:
+            return json_response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
@@ -1,13 +1,21 @@
+import json
+from asgiref.sync import sync_to_async
 from django.contrib.auth import authenticate
 from django.conf import settings
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
+from rest_framework.serializers import ValidationError, as_serializer_error
 import jwt
 from datetime import datetime, timedelta
 from django.utils import timezone
 from core.models import Driver
 from core.serializers.driverSerializers import VerifyTokenSerializer, DriverSerializer, LoginSerializer
+from core.services.passwords import password_hasher, PasswordHashingBusy
+from core.views.responses import json_response
 
 
 
@@ -34,46 +42,65 @@ class VerifyTokenDriverAPIView(APIView):
 
 
 
-class RegisterDriverAPIView(APIView):
-    def post(self, request):
-        try:
-            required_fields = ["fullName", "username", "email", "password"]
-            if not all(field in request.data for field in required_fields):
-                return Response({"error": "Missing required fields"}, status=status.HTTP_400_BAD_REQUEST)
+# Registration and login hash or check a bcrypt password. They are async so
+# the work waits on the hashing pool: a sync view would hold the
+# thread-sensitive executor that every sync view shares under ASGI.
 
-            if Driver.objects.filter(email=request.data["email"]).exists():
-                return Response({"error": "Email is already in use"}, status=status.HTTP_400_BAD_REQUEST)
-            if Driver.objects.filter(username=request.data["username"]).exists():
-                return Response({"error": "Username is already taken"}, status=status.HTTP_400_BAD_REQUEST)
+def password_busy_response(e):
+    return json_response(
+        {"error": str(e)}, status=status.HTTP_503_SERVICE_UNAVAILABLE,
+        headers={"Retry-After": str(password_hasher.retry_after)},
+    )
 
-            serializer = DriverSerializer(data=request.data)
-            if serializer.is_valid():
-                driver = serializer.save()
-
-                return Response({
-                    "message": "Driver registered successfully",
-                    "username": driver.username,
-                    "uniqueId": str(driver.uniqueId),
-                    "accountNumber": driver.accountNumber,
-                }, status=status.HTTP_201_CREATED)
-
-            else:
-                return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+@method_decorator(csrf_exempt, name='dispatch')
+class AsyncRegisterDriverView(View):
+    async def post(self, request):
+        try:
+            data = json.loads(request.body or b'{}')
+            required_fields = ["fullName", "username", "email", "password"]
+            if not all(field in data for field in required_fields):
+                return json_response({"error": "Missing required fields"}, status=status.HTTP_400_BAD_REQUEST)
+
+            if await Driver.objects.filter(email=data["email"]).aexists():
+                return json_response({"error": "Email is already in use"}, status=status.HTTP_400_BAD_REQUEST)
+            if await Driver.objects.filter(username=data["username"]).aexists():
+                return json_response({"error": "Username is already taken"}, status=status.HTTP_400_BAD_REQUEST)
+
+            serializer = DriverSerializer(data=data)
+            # The unique validators query the database.
+            if not await sync_to_async(serializer.is_valid)():
+                return json_response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+            # Hashed here, so Driver.save stores it as is.
+            serializer.validated_data["password"] = await password_hasher.ahash(serializer.validated_data["password"])
+            driver = await sync_to_async(serializer.save)()
+
+            return json_response({
+                "message": "Driver registered successfully",
+                "username": driver.username,
+                "uniqueId": str(driver.uniqueId),
+                "accountNumber": driver.accountNumber,
+            }, status=status.HTTP_201_CREATED)
+
+        except PasswordHashingBusy as e:
+            return password_busy_response(e)
         except Exception as e:
-            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
-
-
+            return json_response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
 
-class LoginAPIView(APIView):
-    def post(self, request):
+@method_decorator(csrf_exempt, name='dispatch')
+class AsyncLoginView(View):
+    async def post(self, request):
         try:
-            serializer = LoginSerializer(data=request.data)
+            serializer = LoginSerializer(data=json.loads(request.body or b'{}'))
             if not serializer.is_valid():
-                return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+                return json_response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-            driver = serializer.validated_data["driver"]
+            try:
+                driver = await serializer.aauthenticate()
+            except ValidationError as e:
+                return json_response(as_serializer_error(e), status=status.HTTP_400_BAD_REQUEST)
 
             driver_serializer = DriverSerializer(driver)
             driver_data = driver_serializer.data
@@ -86,7 +113,7 @@ class LoginAPIView(APIView):
             }
             token = jwt.encode(token_payload, secret_key, algorithm="HS256")
 
-            response = Response({
+            response = json_response({
                 "message": "Login successful",
                 "driver": driver_data,
             }, status=status.HTTP_200_OK)
@@ -102,8 +129,10 @@ class LoginAPIView(APIView):
 
             return response
 
+        except PasswordHashingBusy as e:
+            return password_busy_response(e)
         except Exception as e:
-            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+            return json_response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
 
 class LogoutAPIView(APIView):
@@ -0,0 +1,83 @@
+# core/views/exportViews.py
+
+import itertools
+import logging
+from datetime import datetime, time, timedelta
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import status
+from core.serializers.driverSerializers import VerifyTokenSerializer
+from core.services.exports import export_lines, EXPORT_FORMATS, CONTENT_TYPES
+
+logger = logging.getLogger(__name__)
+
+
+def parse_day(value):
+    if not value:
+        return None
+    day = parse_date(value)
+    if day is None:
+        raise ValueError(value)
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+async def stream_chunks(lines, lines_per_chunk):
+    # Under ASGI, Django would buffer a sync iterator completely. Drain it on the
+    # sync thread instead (same connection and server-side cursor), a chunk at a time.
+    def next_chunk():
+        return ''.join(itertools.islice(lines, lines_per_chunk))
+
+    while True:
+        chunk = await sync_to_async(next_chunk)()
+        if not chunk:
+            break
+        yield chunk
+
+
+class ExportLogHistoryAPIView(APIView):
+    def get(self, request):
+        try:
+            export_format = request.query_params.get('exportFormat', 'ndjson')
+            if export_format not in EXPORT_FORMATS:
+                return Response({'error': f"exportFormat must be one of: {', '.join(EXPORT_FORMATS)}"}, status=status.HTTP_400_BAD_REQUEST)
+
+            try:
+                start = parse_day(request.query_params.get('from'))
+                end = parse_day(request.query_params.get('to'))
+            except ValueError:
+                return Response({'error': 'from and to must be YYYY-MM-DD dates'}, status=status.HTTP_400_BAD_REQUEST)
+            if end:
+                # `to` is inclusive.
+                end += timedelta(days=1)
+
+            serializer = VerifyTokenSerializer(data={"token": request.COOKIES.get("token")})
+            if not serializer.is_valid():
+                return Response(serializer.errors, status=status.HTTP_401_UNAUTHORIZED)
+            driver = serializer.validated_data["driver"]
+
+            if request.query_params.get('fleet') in ('true', '1'):
+                if not driver.isStaff:
+                    return Response({'error': 'Fleet exports require a staff account'}, status=status.HTTP_403_FORBIDDEN)
+                drivers = None
+                name = 'fleet'
+            else:
+                drivers = [driver.uniqueId]
+                name = driver.username
+
+            lines = export_lines(export_format, drivers, start, end)
+            if isinstance(request._request, ASGIRequest):
+                lines = stream_chunks(lines, getattr(settings, 'EXPORT_CHUNK_SIZE', 2000))
+
+            logger.info("Exporting log history (%s) for %s", export_format, name)
+            response = StreamingHttpResponse(lines, content_type=CONTENT_TYPES[export_format])
+            response['Content-Disposition'] = f'attachment; filename="log-history-{name}.{export_format}"'
+            return response
+
+        except Exception as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,73 @@
+# core/views/hosViews.py
+
+from datetime import timedelta
+from django.db.models import Sum, Window
+from django.db.models.functions import TruncDate
+from django.utils.timezone import now
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import status
+from core.models.driver import Driver
+from core.models.logSheet import LogSheet
+from core.services.hos import hos_status, CYCLE_WINDOW_DAYS
+from django.shortcuts import get_object_or_404
+
+
+class GetDriverHOSStatusAPIView(APIView):
+    def get(self, request):
+        try:
+            email = request.query_params.get('email')
+            if not email:
+                return Response({'error': 'Email is required'}, status=status.HTTP_400_BAD_REQUEST)
+
+            driver = get_object_or_404(Driver, email=email)
+            return Response({'hos': hos_status(driver)}, status=status.HTTP_200_OK)
+
+        except Exception as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+
+class GetDriverCycleHoursAPIView(APIView):
+    def get(self, request):
+        try:
+            email = request.query_params.get('email')
+            if not email:
+                return Response({'error': 'Email is required'}, status=status.HTTP_400_BAD_REQUEST)
+
+            try:
+                days = int(request.query_params.get('days', CYCLE_WINDOW_DAYS))
+            except ValueError:
+                return Response({'error': 'days must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+            if days < 1:
+                return Response({'error': 'days must be positive'}, status=status.HTTP_400_BAD_REQUEST)
+
+            driver = get_object_or_404(Driver, email=email)
+            log_sheets = LogSheet.objects.filter(
+                tripId__driverId=driver,
+                createdDate__gte=now() - timedelta(days=days),
+            )
+
+            # Per-day sums and the running total over the period, both as SQL
+            # window functions; peers on the same date share one output row.
+            date = TruncDate('createdDate')
+            daily = (
+                log_sheets
+                .annotate(
+                    date=date,
+                    cycleHours=Window(Sum('currentCycleUsed'), partition_by=[date]),
+                    runningCycleHours=Window(Sum('currentCycleUsed'), order_by=date.asc()),
+                )
+                .values('date', 'cycleHours', 'runningCycleHours')
+                .order_by('date')
+                .distinct()
+            )
+            total = log_sheets.aggregate(cycleHours=Sum('currentCycleUsed'))['cycleHours']
+
+            return Response({
+                'days': days,
+                'cycleHours': total or 0,
+                'daily': list(daily),
+            }, status=status.HTTP_200_OK)
+
+        except Exception as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,77 @@
+# core/views/logSheetViews.py
+
+import logging
+from datetime import timedelta
+from django.conf import settings
+from django.http import HttpResponse
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import status
+from core.models.logSheet import LogSheet
+from core.models.trip import Trip
+from core.serializers.driverSerializers import VerifyTokenSerializer
+from core.services.logrender import log_renderer, render_inputs, RENDER_FORMATS, CONTENT_TYPES
+from core.views.exportViews import parse_day
+
+logger = logging.getLogger(__name__)
+
+
+class PrintLogSheetsAPIView(APIView):
+    def get(self, request):
+        try:
+            render_format = request.query_params.get('renderFormat', 'pdf')
+            if render_format not in RENDER_FORMATS:
+                return Response({'error': f"renderFormat must be one of: {', '.join(RENDER_FORMATS)}"}, status=status.HTTP_400_BAD_REQUEST)
+
+            serializer = VerifyTokenSerializer(data={"token": request.COOKIES.get("token")})
+            if not serializer.is_valid():
+                return Response(serializer.errors, status=status.HTTP_401_UNAUTHORIZED)
+            driver = serializer.validated_data["driver"]
+
+            trip_id = request.query_params.get('tripId')
+            if trip_id:
+                trip = Trip.objects.filter(uniqueId=trip_id, driverId=driver).only('uniqueId', 'createdDate').first()
+                if trip is None:
+                    return Response({'error': 'Trip not found'}, status=status.HTTP_404_NOT_FOUND)
+                # Bounded by the trip's createdDate, so only partitions from its month on are read.
+                log_sheets = trip.log_sheets()
+                name = f"trip-{trip_id}"
+            else:
+                log_sheets = LogSheet.objects.filter(tripId__driverId=driver)
+                try:
+                    start = parse_day(request.query_params.get('from'))
+                    end = parse_day(request.query_params.get('to'))
+                except ValueError:
+                    return Response({'error': 'from and to must be YYYY-MM-DD dates'}, status=status.HTTP_400_BAD_REQUEST)
+                if not start or not end:
+                    return Response({'error': 'tripId, or from and to, are required'}, status=status.HTTP_400_BAD_REQUEST)
+                max_days = getattr(settings, 'PRINT_LOG_SHEETS_MAX_DAYS', 31)
+                if not start <= end < start + timedelta(days=max_days):
+                    return Response({'error': f"from and to must span 1 to {max_days} days"}, status=status.HTTP_400_BAD_REQUEST)
+                # `to` is inclusive.
+                log_sheets = log_sheets.filter(createdDate__gte=start, createdDate__lt=end + timedelta(days=1))
+                name = f"{start.date()}-{end.date()}"
+
+            # Rendering is synchronous: refuse documents too long to render within a request.
+            max_sheets = getattr(settings, 'PRINT_LOG_SHEETS_MAX_SHEETS', 100)
+            sheets = render_inputs(log_sheets, limit=max_sheets + 1)
+            if not sheets:
+                return Response({'error': 'No log sheets to print'}, status=status.HTTP_404_NOT_FOUND)
+            if len(sheets) > max_sheets:
+                return Response({'error': f"At most {max_sheets} log sheets can be printed at once; print a shorter range"},
+                                status=status.HTTP_400_BAD_REQUEST)
+
+            # Same inputs, same document: answer revalidations without rendering anything.
+            etag = log_renderer.document_etag(sheets, render_format)
+            headers = {'ETag': etag, 'Cache-Control': 'private, no-cache'}
+            if etag in [tag.strip().removeprefix('W/') for tag in request.headers.get('If-None-Match', '').split(',')]:
+                return HttpResponse(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+            logger.info("Printing %d log sheet(s) (%s) for %s", len(sheets), render_format, driver.username)
+            document = log_renderer.render(sheets, render_format, title=f"Daily logs - {driver.fullName}")
+            response = HttpResponse(document, content_type=CONTENT_TYPES[render_format], headers=headers)
+            response['Content-Disposition'] = f'inline; filename="log-sheets-{name}.{render_format}"'
+            return response
+
+        except Exception as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,36 @@
+# core/views/metricsViews.py
+
+import hmac
+import ipaddress
+from django.conf import settings
+from django.http import HttpResponse
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import status
+from core.services.metrics import request_metrics
+
+
+def is_internal(address):
+    try:
+        address = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(address in ipaddress.ip_network(network)
+               for network in getattr(settings, 'METRICS_ALLOWED_NETWORKS', ['127.0.0.0/8', '::1/128']))
+
+
+class MetricsAPIView(APIView):
+    # The scraper's bearer token is not a JWT; keep JWTAuthentication from rejecting it.
+    authentication_classes = []
+    permission_classes = []
+
+    def get(self, request):
+        # Deny by default: the bearer token when one is configured, otherwise internal addresses only.
+        token = getattr(settings, 'METRICS_AUTH_TOKEN', None)
+        if token:
+            if not hmac.compare_digest(request.headers.get('Authorization', ''), f"Bearer {token}"):
+                return Response({'error': 'Unauthorized'}, status=status.HTTP_401_UNAUTHORIZED)
+        elif not is_internal(request.META.get('REMOTE_ADDR', '')):
+            return Response({'error': 'Forbidden'}, status=status.HTTP_403_FORBIDDEN)
+
+        return HttpResponse(request_metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,11 @@
+# core/views/responses.py
+#
+# Responses for the plain Django (async) views, which cannot use DRF's Response.
+
+from django.http import JsonResponse
+from rest_framework import status
+from rest_framework.utils.encoders import JSONEncoder
+
+
+def json_response(data, status=status.HTTP_200_OK, headers=None):
+    return JsonResponse(data, status=status, encoder=JSONEncoder, safe=False, headers=headers)
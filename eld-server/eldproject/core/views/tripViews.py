@@ -1,16 +1,25 @@
 # core/views/tripViews.py
 
+import uuid
+from collections import defaultdict
+from django.conf import settings
+from django.db import transaction
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from core.models.trip import Trip
 from core.models.driver import Driver
 from core.models.logSheet import LogSheet
-from core.serializers.tripSerializers import TripSerializer, GetDriverTripsSerializer, GetTripDataSerializer, LogSheetSerializer
+from core.serializers.tripSerializers import TripSerializer, GetDriverTripsSerializer, LogSheetSerializer
+from core.serializers.fastSerializers import driver_trips_values, serialize_driver_trips, serialize_trip_data
 from django.shortcuts import get_object_or_404
-from asgiref.sync import async_to_sync
-from eldproject.asgi import sio 
+from eldproject.asgi import outbox
 from core.middleware.referer_middleware import referer_check
+from core.pagination import DriverTripsPagination
+from core.services.geocoding import resolve_coordinates, LOG_SHEET_LOCATION_FIELDS
+from core.services.hos import refresh_duty_totals, record_duty_changes
+from core.services.metrics import serializer_timer
+from core.services.tripcache import trip_cache
 
 
 class CreateTripAPIView(APIView):
@@ -24,21 +33,10 @@ class CreateTripAPIView(APIView):
             if serializer.is_valid():
                 trip = serializer.save()
 
-                trip_data = {
-                    "uniqueId": str(trip.uniqueId),
-                    "tripTitle": trip.tripTitle,
-                    "pickup": trip.pickup,
-                    "dropoff": trip.dropoff or None, 
-                    "cycleUsed": trip.cycleUsed, 
-                    "instructions": trip.instructions or None, 
-                    "createdDate": trip.createdDate.isoformat(),
-                    "tripNumber": trip.tripNumber, 
-                }
-
-                room_name = f"user_{email}"
-
-                async_to_sync(sio.emit)("trip_created", trip_data, room=room_name)
-                print(f"📡 Emitted trip_created event to {room_name}: {trip_data}")
+                # Same shape as a get-driver-trips/ entry, so clients can prepend it.
+                with serializer_timer():
+                    trip_data = dict(GetDriverTripsSerializer(trip).data)
+                outbox.publish("trip_created", trip_data, room=f"user_{email}")
 
                 return Response(
                     {
@@ -65,9 +63,26 @@ class GetDriverTripsAPIView(APIView):
             
             driver = get_object_or_404(Driver, email=email)
             trips = Trip.objects.filter(driverId=driver)
-            
-            serializer = GetDriverTripsSerializer(trips, many=True)
-            return Response({'trips': serializer.data}, status=status.HTTP_200_OK)
+
+            fields = [field for field in request.query_params.get('fields', '').split(',') if field]
+            unknown_fields = set(fields) - set(GetDriverTripsSerializer.Meta.fields)
+            if unknown_fields:
+                return Response({'error': f"Unknown fields: {', '.join(sorted(unknown_fields))}"}, status=status.HTTP_400_BAD_REQUEST)
+            # Rendered straight from .values() rows; same shape as GetDriverTripsSerializer.
+            trips = driver_trips_values(trips, fields)
+
+            # Old clients ask for the full, unpaginated list.
+            if request.query_params.get('all') in ('true', '1'):
+                trips_data = serialize_driver_trips(trips.order_by('-createdDate', '-tripNumber'), fields)
+                return Response({'trips': trips_data}, status=status.HTTP_200_OK)
+
+            paginator = DriverTripsPagination()
+            page = paginator.paginate_queryset(trips, request, view=self)
+            return Response({
+                'trips': serialize_driver_trips(page, fields),
+                'next': paginator.get_next_link(),
+                'previous': paginator.get_previous_link(),
+            }, status=status.HTTP_200_OK)
         
         except Exception as e:
             return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
@@ -80,14 +95,117 @@ class GetTripByIdAPIView(APIView):
             if not trip_id:
                 return Response({'error': 'Trip ID is required'}, status=status.HTTP_400_BAD_REQUEST)
             
-            trip = get_object_or_404(Trip.objects.prefetch_related('logSheets'), uniqueId=trip_id)
-            serializer = GetTripDataSerializer(trip)
-            return Response({'trip': serializer.data}, status=status.HTTP_200_OK)
+            # Canonical form, so cache keys match the ones writes invalidate.
+            trip_id = str(uuid.UUID(trip_id))
+
+            trip_data, etag = trip_cache.get(trip_id, lambda: serialize_trip_data(trip_id))
+            headers = {'ETag': etag, 'Cache-Control': 'private, no-cache'}
+
+            if_none_match = request.headers.get('If-None-Match', '')
+            if etag in [tag.strip().removeprefix('W/') for tag in if_none_match.split(',')] or if_none_match.strip() == '*':
+                trip_cache.record_not_modified()
+                return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+            return Response({'trip': trip_data}, status=status.HTTP_200_OK, headers=headers)
         
         except Exception as e:
             return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
 
+def add_log_sheets(trip, log_sheets_data):
+    """
+    Validate the whole batch up front, then write it in one transaction.
+    Returns (serialized sheets, None), or (None, errors) when invalid.
+    """
+
+    serializer = LogSheetSerializer(data=log_sheets_data, many=True)
+    if not serializer.is_valid():
+        return None, serializer.errors
+
+    serializer.save(tripId=trip)
+    trip_cache.invalidate(trip.uniqueId)
+    with serializer_timer():
+        return serializer.data, None
+
+
+def update_log_sheets(trip, log_sheets_data):
+    """
+    Apply partial updates to some of a trip's sheets. Returns the serialized
+    updated sheets and the per-item errors.
+    """
+
+    # Fetch every targeted sheet in one query.
+    requested_ids = set()
+    for log_sheet_data in log_sheets_data:
+        try:
+            requested_ids.add(uuid.UUID(str(log_sheet_data.get('uniqueId'))))
+        except ValueError:
+            pass
+    log_sheets = trip.log_sheets().filter(uniqueId__in=requested_ids).in_bulk()
+
+    updated_log_sheets = []
+    errors = []
+
+    for index, log_sheet_data in enumerate(log_sheets_data):
+        log_sheet_id = log_sheet_data.get('uniqueId')
+        if not log_sheet_id:
+            errors.append({'index': index, 'error': 'Log sheet uniqueId is required'})
+            continue
+
+        try:
+            log_sheet = log_sheets.get(uuid.UUID(str(log_sheet_id)))
+        except ValueError:
+            log_sheet = None
+        if log_sheet is None:
+            errors.append({'index': index, 'uniqueId': log_sheet_id, 'error': 'Log sheet not found'})
+            continue
+
+        serializer = LogSheetSerializer(log_sheet, data=log_sheet_data, partial=True)
+        if not serializer.is_valid():
+            errors.append({'index': index, 'uniqueId': log_sheet_id, 'error': serializer.errors})
+            continue
+
+        for field, value in serializer.validated_data.items():
+            setattr(log_sheet, field, value)
+        updated_log_sheets.append(serializer)
+
+    # Re-geocode only the sheets whose locations changed.
+    relocated = [
+        serializer.instance for serializer in updated_log_sheets
+        if set(serializer.validated_data) & set(LOG_SHEET_LOCATION_FIELDS)
+    ]
+    if relocated:
+        locations = [{field: getattr(log_sheet, field) for field in LOG_SHEET_LOCATION_FIELDS} for log_sheet in relocated]
+        for log_sheet, coordinates in zip(relocated, resolve_coordinates(locations, LOG_SHEET_LOCATION_FIELDS)):
+            log_sheet.coordinates = coordinates
+        followers, duty_changes = refresh_duty_totals(trip, relocated)
+
+    # Write each sheet's own changes only, one bulk_update per set of changed
+    # fields, so fields a request did not touch are never written back with
+    # the values read above and a concurrent edit to them is kept.
+    by_fields = defaultdict(list)
+    for serializer in updated_log_sheets:
+        fields = set(serializer.validated_data)
+        if fields & set(LOG_SHEET_LOCATION_FIELDS):
+            fields.update(['coordinates', 'dutyTotals', 'dutyGrid'])
+        if fields:
+            by_fields[frozenset(fields)].append(serializer.instance)
+
+    if by_fields:
+        with transaction.atomic():
+            for fields, changed in by_fields.items():
+                LogSheet.objects.bulk_update(
+                    changed, sorted(fields), batch_size=getattr(settings, 'LOG_SHEET_BATCH_SIZE', 500),
+                )
+            if relocated:
+                LogSheet.objects.bulk_update(followers, ['dutyTotals', 'dutyGrid'])
+                record_duty_changes(trip.driverId_id, duty_changes)
+            trip_cache.invalidate(trip.uniqueId)
+
+    with serializer_timer():
+        return [serializer.data for serializer in updated_log_sheets], errors
+
+
 class AddLogSheetsAPIView(APIView):
     def post(self, request):
         try:
@@ -99,16 +217,17 @@ class AddLogSheetsAPIView(APIView):
             if not log_sheets_data:
                 return Response({'error': 'Log sheets data is required'}, status=status.HTTP_400_BAD_REQUEST)
 
-            trip = get_object_or_404(Trip, uniqueId=trip_id)
-            
-            created_log_sheets = []
-            for log_sheet_data in log_sheets_data:
-                serializer = LogSheetSerializer(data=log_sheet_data)
-                if serializer.is_valid():
-                    log_sheet = serializer.save(tripId=trip)
-                    created_log_sheets.append(serializer.data)
-                else:
-                    return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+            trip = get_object_or_404(Trip.objects.select_related('driverId'), uniqueId=trip_id)
+
+            created_log_sheets, errors = add_log_sheets(trip, log_sheets_data)
+            if errors is not None:
+                return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+
+            outbox.publish(
+                "log_sheets_added",
+                {'tripId': str(trip.uniqueId), 'logSheets': created_log_sheets},
+                room=f"user_{trip.driverId.email}",
+            )
 
             return Response({
                 'message': 'Log sheets added successfully',
@@ -130,25 +249,22 @@ class UpdateLogSheetsAPIView(APIView):
             if not log_sheets_data:
                 return Response({'error': 'Log sheets data is required'}, status=status.HTTP_400_BAD_REQUEST)
 
-            trip = get_object_or_404(Trip, uniqueId=trip_id)
-            updated_log_sheets = []
-
-            for log_sheet_data in log_sheets_data:
-                log_sheet_id = log_sheet_data.get('uniqueId')
-                if not log_sheet_id:
-                    return Response({'error': 'Log sheet uniqueId is required'}, status=status.HTTP_400_BAD_REQUEST)
-                
-                log_sheet = get_object_or_404(LogSheet, uniqueId=log_sheet_id, tripId=trip)
-                serializer = LogSheetSerializer(log_sheet, data=log_sheet_data, partial=True)
-                if serializer.is_valid():
-                    serializer.save()
-                    updated_log_sheets.append(serializer.data)
-                else:
-                    return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+            trip = get_object_or_404(Trip.objects.select_related('driverId'), uniqueId=trip_id)
+
+            updated_data, errors = update_log_sheets(trip, log_sheets_data)
+            if errors and not updated_data:
+                return Response({'error': 'No log sheets were updated', 'errors': errors}, status=status.HTTP_400_BAD_REQUEST)
+
+            outbox.publish(
+                "log_sheets_updated",
+                {'tripId': str(trip.uniqueId), 'logSheets': updated_data},
+                room=f"user_{trip.driverId.email}",
+            )
 
             return Response({
                 'message': 'Log sheets updated successfully',
-                'logSheets': updated_log_sheets
+                'logSheets': updated_data,
+                'errors': errors,
             }, status=status.HTTP_200_OK)
         
         except Exception as e:
@@ -162,8 +278,21 @@ class DeleteTripAPIView(APIView):
             if not trip_id:
                 return Response({'error': 'Trip ID is required'}, status=status.HTTP_400_BAD_REQUEST)
 
-            trip = get_object_or_404(Trip, uniqueId=trip_id)
-            trip.delete() 
+            trip = get_object_or_404(Trip.objects.select_related('driverId'), uniqueId=trip_id)
+            with transaction.atomic():
+                log_sheets = list(trip.log_sheets().values_list('uniqueId', 'createdDate', 'dutyTotals'))
+                record_duty_changes(
+                    trip.driverId_id,
+                    [(created_date, totals, None) for _, created_date, totals in log_sheets],
+                )
+                # Deleting a trip removes its log sheets too; say so in the same event.
+                outbox.publish(
+                    "trip_deleted",
+                    {'uniqueId': str(trip.uniqueId), 'logSheetIds': [str(log_sheet_id) for log_sheet_id, _, _ in log_sheets]},
+                    room=f"user_{trip.driverId.email}",
+                )
+                trip.soft_delete()
+                trip_cache.invalidate(trip.uniqueId)
             return Response({'message': 'Trip deleted successfully'}, status=status.HTTP_204_NO_CONTENT)
         
         except Exception as e:
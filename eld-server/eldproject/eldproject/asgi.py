@@ -16,11 +16,34 @@ import socketio
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'eldproject.settings')
 django.setup()
 
-sio = socketio.AsyncServer(async_mode="asgi", cors_allowed_origins="http://localhost:3000")
+from core.services.tripcache import trip_cache
+trip_cache.check()
+
+from core.sockets.managers import build_client_manager, start_client_manager
+sio = socketio.AsyncServer(
+    async_mode="asgi",
+    cors_allowed_origins="http://localhost:3000",
+    client_manager=build_client_manager(),
+)
+
+from core.services.metrics import request_metrics
+from core.sockets.outbox import EventOutbox, STATS_METRICS as OUTBOX_METRICS
+outbox = EventOutbox(sio)
+request_metrics.add_stats('eld_socket_outbox', outbox.stats, OUTBOX_METRICS)
 
 django_asgi_app = get_asgi_application()
 
-application = socketio.ASGIApp(sio, django_asgi_app)
+socketio_app = socketio.ASGIApp(sio, django_asgi_app)
+
+
+async def application(scope, receive, send):
+    # Drain the outbox and listen to the other workers on the server's event
+    # loop from the first request or connection on, whether or not this
+    # worker ever gets a Socket.IO client.
+    outbox.start()
+    start_client_manager(sio)
+    await socketio_app(scope, receive, send)
+
 
 from core.sockets.handlers import register_socket_events
 register_socket_events(sio)
@@ -54,6 +54,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.metrics_middleware.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -168,3 +169,198 @@ STATIC_URL = 'static/'
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+
+# Numbering
+# Numbers reserved per worker at a time for each sequence in core.models.Sequence.
+# Larger blocks lock the counter row less often; a restarted worker leaves the
+# rest of its blocks as gaps, and several workers interleave their blocks.
+
+SEQUENCE_BLOCK_SIZES = {
+    'accountNumber': int(os.getenv("ACCOUNT_NUMBER_BLOCK_SIZE", 1)),
+    'tripNumber': int(os.getenv("TRIP_NUMBER_BLOCK_SIZE", 50)),
+    'logNumber': int(os.getenv("LOG_NUMBER_BLOCK_SIZE", 500)),
+}
+
+
+# Log sheet ingest
+# ELD devices sync a full week of sheets in one request, so allow large
+# JSON bodies and write them in batches of LOG_SHEET_BATCH_SIZE rows.
+
+DATA_UPLOAD_MAX_MEMORY_SIZE = int(os.getenv("DATA_UPLOAD_MAX_MEMORY_SIZE", 20 * 1024 * 1024))
+LOG_SHEET_BATCH_SIZE = int(os.getenv("LOG_SHEET_BATCH_SIZE", 500))
+
+
+# Driver trips pagination
+
+DRIVER_TRIPS_PAGE_SIZE = int(os.getenv("DRIVER_TRIPS_PAGE_SIZE", 50))
+DRIVER_TRIPS_MAX_PAGE_SIZE = int(os.getenv("DRIVER_TRIPS_MAX_PAGE_SIZE", 200))
+
+
+# Geocoding
+# Locations are resolved server-side at write time and cached in core.GeocodeCache.
+# Point GEOCODING_PROVIDER at core.services.geocoding.LocalGeocodingProvider to
+# resolve from GEOCODING_LOCAL_COORDINATES without network access. Nominatim is
+# called at most GEOCODING_RATE_LIMIT times a second (a lookup waits up to
+# GEOCODING_RATE_LIMIT_WAIT seconds for its turn), and a failed lookup is not
+# retried for GEOCODING_FAILURE_TTL seconds. Both are tracked in
+# GEOCODING_FAILURE_CACHE_BACKEND, so they hold across workers when it is shared.
+
+GEOCODING_PROVIDER = os.getenv("GEOCODING_PROVIDER", "core.services.geocoding.NominatimGeocodingProvider")
+GEOCODING_USER_AGENT = os.getenv("GEOCODING_USER_AGENT", "eld-server")
+GEOCODING_TIMEOUT = float(os.getenv("GEOCODING_TIMEOUT", 5))
+GEOCODING_LOCAL_COORDINATES = {}
+GEOCODE_CACHE_TTL = int(os.getenv("GEOCODE_CACHE_TTL", 30 * 86400))
+GEOCODE_CACHE_MAX_ENTRIES = int(os.getenv("GEOCODE_CACHE_MAX_ENTRIES", 100000))
+GEOCODING_RATE_LIMIT = float(os.getenv("GEOCODING_RATE_LIMIT", 1))
+GEOCODING_RATE_LIMIT_WAIT = float(os.getenv("GEOCODING_RATE_LIMIT_WAIT", 2))
+GEOCODING_FAILURE_TTL = int(os.getenv("GEOCODING_FAILURE_TTL", 60))
+GEOCODING_FAILURE_CACHE_BACKEND = os.getenv("GEOCODING_FAILURE_CACHE_BACKEND", "default")
+
+
+# Routing
+# Legs are routed when log sheets are written and cached in core.RouteCache by
+# content hash of their endpoints; reads only use the cache. A failed leg is not
+# retried for ROUTING_FAILURE_TTL seconds (tracked in ROUTING_FAILURE_CACHE_BACKEND).
+# core.services.routing.LocalRoutingProvider gives straight-line routes offline.
+
+ROUTING_PROVIDER = os.getenv("ROUTING_PROVIDER", "core.services.routing.OSRMRoutingProvider")
+ROUTING_OSRM_URL = os.getenv("ROUTING_OSRM_URL", "https://router.project-osrm.org")
+ROUTING_TIMEOUT = float(os.getenv("ROUTING_TIMEOUT", 10))
+ROUTING_LOCAL_SPEED = float(os.getenv("ROUTING_LOCAL_SPEED", 80))
+ROUTING_FAILURE_TTL = int(os.getenv("ROUTING_FAILURE_TTL", 60))
+ROUTING_FAILURE_CACHE_BACKEND = os.getenv("ROUTING_FAILURE_CACHE_BACKEND", "default")
+
+
+# Authenticated driver cache
+# Set DRIVER_CACHE_BACKEND to a CACHES alias to share entries between workers.
+
+DRIVER_CACHE_TTL = int(os.getenv("DRIVER_CACHE_TTL", 60))
+DRIVER_CACHE_MAX_SIZE = int(os.getenv("DRIVER_CACHE_MAX_SIZE", 10000))
+DRIVER_CACHE_BACKEND = os.getenv("DRIVER_CACHE_BACKEND") or None
+
+
+# Password hashing
+# bcrypt runs on a bounded pool ("thread" or "process") sized to the cores.
+
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", 12))
+PASSWORD_HASHING_EXECUTOR = os.getenv("PASSWORD_HASHING_EXECUTOR", "thread")
+PASSWORD_HASHING_WORKERS = int(os.getenv("PASSWORD_HASHING_WORKERS", 0)) or None
+PASSWORD_HASHING_MAX_PENDING = int(os.getenv("PASSWORD_HASHING_MAX_PENDING", 64))
+PASSWORD_HASHING_QUEUE_TIMEOUT = float(os.getenv("PASSWORD_HASHING_QUEUE_TIMEOUT", 5))
+
+
+# Socket.IO event outbox
+
+SOCKET_OUTBOX_MAX_SIZE = int(os.getenv("SOCKET_OUTBOX_MAX_SIZE", 10000))
+SOCKET_OUTBOX_PUT_TIMEOUT = float(os.getenv("SOCKET_OUTBOX_PUT_TIMEOUT", 0.1))
+SOCKET_OUTBOX_FLUSH_INTERVAL = float(os.getenv("SOCKET_OUTBOX_FLUSH_INTERVAL", 0.05))
+
+
+# Socket.IO scaling
+# "local" keeps everything in one process; "unix" fans events out between
+# workers on this machine; "redis" between any number of machines. Anything
+# but "local" needs SOCKETIO_ROOM_REGISTRY_CACHE to be a cache all workers share.
+
+SOCKETIO_CLIENT_MANAGER = os.getenv("SOCKETIO_CLIENT_MANAGER", "local")
+SOCKETIO_CHANNEL = os.getenv("SOCKETIO_CHANNEL", "eld-socketio")
+SOCKETIO_UNIX_BUS_DIR = os.getenv("SOCKETIO_UNIX_BUS_DIR", "/tmp/eld-socketio")
+SOCKETIO_UNIX_BUS_CHUNK_BYTES = int(os.getenv("SOCKETIO_UNIX_BUS_CHUNK_BYTES", 65536))
+SOCKETIO_UNIX_BUS_SEND_TIMEOUT = float(os.getenv("SOCKETIO_UNIX_BUS_SEND_TIMEOUT", 1.0))
+SOCKETIO_REDIS_URL = os.getenv("SOCKETIO_REDIS_URL", "redis://localhost:6379/0")
+SOCKETIO_ROOM_REGISTRY_CACHE = os.getenv("SOCKETIO_ROOM_REGISTRY_CACHE", "default")
+SOCKETIO_ROOM_REGISTRY_TTL = int(os.getenv("SOCKETIO_ROOM_REGISTRY_TTL", 86400))
+
+
+# Socket.IO client messages
+# Per-connection token bucket and payload cap for send_message.
+
+SOCKETIO_MESSAGE_RATE = float(os.getenv("SOCKETIO_MESSAGE_RATE", 5))
+SOCKETIO_MESSAGE_BURST = int(os.getenv("SOCKETIO_MESSAGE_BURST", 10))
+SOCKETIO_MAX_MESSAGE_BYTES = int(os.getenv("SOCKETIO_MAX_MESSAGE_BYTES", 4096))
+
+
+# get-trip-byid/ response cache
+# Responses are cached per worker under a version kept in TRIP_CACHE_BACKEND.
+# When SOCKETIO_CLIENT_MANAGER is not "local" (several workers), that must be
+# a cache all workers share, or startup fails.
+
+TRIP_CACHE_MAX_SIZE = int(os.getenv("TRIP_CACHE_MAX_SIZE", 1000))
+TRIP_CACHE_BACKEND = os.getenv("TRIP_CACHE_BACKEND", "default")
+TRIP_CACHE_VERSION_TTL = int(os.getenv("TRIP_CACHE_VERSION_TTL", 86400))
+
+
+# Log history export
+# Rows fetched per server-side cursor round trip (and lines per streamed chunk).
+
+EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", 2000))
+
+
+# Database connection pool
+# With DB_POOL_MAX_SIZE > 0, Postgres connections come from a bounded
+# per-process pool and go back to it at the end of every request, instead of
+# one persistent connection per server thread.
+
+DB_POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", 0))
+DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", 10))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 10))
+DB_POOL_HEALTH_CHECK_INTERVAL = float(os.getenv("DB_POOL_HEALTH_CHECK_INTERVAL", 30))
+DB_POOL_MAX_LIFETIME = float(os.getenv("DB_POOL_MAX_LIFETIME", 3600))
+
+DATABASES['default']['CONN_HEALTH_CHECKS'] = True
+if DB_POOL_MAX_SIZE and DATABASES['default'].get('ENGINE') == 'django.db.backends.postgresql':
+    DATABASES['default']['ENGINE'] = 'core.db.backends.postgresql'
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+
+
+# Printable log sheets
+# Rendered pages are cached by a hash of their contents; misses are rendered
+# by LOG_RENDER_WORKERS processes (0 renders in the request thread). A request
+# prints at most PRINT_LOG_SHEETS_MAX_SHEETS sheets, from a range of at most
+# PRINT_LOG_SHEETS_MAX_DAYS days.
+
+LOG_RENDER_WORKERS = int(os.getenv("LOG_RENDER_WORKERS", 2))
+LOG_RENDER_CACHE_BACKEND = os.getenv("LOG_RENDER_CACHE_BACKEND", "default")
+LOG_RENDER_CACHE_TTL = int(os.getenv("LOG_RENDER_CACHE_TTL", 604800))
+PRINT_LOG_SHEETS_MAX_DAYS = int(os.getenv("PRINT_LOG_SHEETS_MAX_DAYS", 31))
+PRINT_LOG_SHEETS_MAX_SHEETS = int(os.getenv("PRINT_LOG_SHEETS_MAX_SHEETS", 100))
+
+
+# Fleet HOS violation sweep (scan_hos_violations)
+
+HOS_SCAN_WORKERS = int(os.getenv("HOS_SCAN_WORKERS", 4))
+HOS_SCAN_BATCH_SIZE = int(os.getenv("HOS_SCAN_BATCH_SIZE", 200))
+HOS_SCAN_CHUNK_SIZE = int(os.getenv("HOS_SCAN_CHUNK_SIZE", 2000))
+
+
+# Trip archival (archive_trips)
+# Deleted trips are only hidden until they are archived. Trips with no log
+# sheets for ARCHIVE_CLOSED_AFTER_DAYS are archived too, unless it is 0.
+
+ARCHIVE_DELETED_AFTER_DAYS = int(os.getenv("ARCHIVE_DELETED_AFTER_DAYS", 30))
+ARCHIVE_CLOSED_AFTER_DAYS = int(os.getenv("ARCHIVE_CLOSED_AFTER_DAYS", 0))
+ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", 500))
+
+
+# LogSheet partitions
+# On Postgres core_logsheet is partitioned by month; maintain_log_sheet_partitions
+# keeps this many months of partitions ready.
+
+LOG_SHEET_PARTITIONS_AHEAD = int(os.getenv("LOG_SHEET_PARTITIONS_AHEAD", 3))
+
+
+# Request metrics
+# A REQUEST_METRICS_SAMPLE_RATE share of requests record latency, query count,
+# DB time and serializer time per view, served on metrics/ in the Prometheus
+# text format, along with the counters of services that register with
+# request_metrics.add_stats (the Socket.IO outbox, caches, pools). Scrapers
+# send METRICS_AUTH_TOKEN as a bearer token; without one, only clients in
+# METRICS_ALLOWED_NETWORKS get an answer. Sampled requests slower than
+# REQUEST_METRICS_SLOW_SECONDS log the plans of their
+# REQUEST_METRICS_EXPLAIN_QUERIES slowest queries.
+
+REQUEST_METRICS_SAMPLE_RATE = float(os.getenv("REQUEST_METRICS_SAMPLE_RATE", 0.1))
+REQUEST_METRICS_SLOW_SECONDS = float(os.getenv("REQUEST_METRICS_SLOW_SECONDS", 1.0))
+REQUEST_METRICS_EXPLAIN_QUERIES = int(os.getenv("REQUEST_METRICS_EXPLAIN_QUERIES", 3))
+METRICS_AUTH_TOKEN = os.getenv("METRICS_AUTH_TOKEN") or None
+METRICS_ALLOWED_NETWORKS = os.getenv("METRICS_ALLOWED_NETWORKS", "127.0.0.0/8,::1/128").split(",")